@@ -0,0 +1,24 @@
+import gc
+import os
+from src.core.config import settings
+from src.utils.cpu_budget import CpuBudget
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = settings.api_workers
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# With API_PRELOAD_INFERENCE the app, including the Celery client used to
+# dispatch analyses, is imported once in the master and shared with the
+# forked workers copy-on-write.
+preload_app = settings.api_preload_inference
+
+
+def pre_fork(server, worker):
+    # Move everything the master loaded out of the collector's reach so that
+    # collections in the workers don't write to, and un-share, those pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    CpuBudget.for_api(settings, workers).apply("api")
@@ -0,0 +1,34 @@
+"""upd: analysis task_id unique
+
+Revision ID: e5b8d2f41a96
+Revises: 7a2e4c91d0f3
+Create Date: 2026-10-17 15:42:08.301562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8d2f41a96'
+down_revision: Union[str, None] = '7a2e4c91d0f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "DELETE FROM analysis_results a USING analysis_results b "
+        "WHERE a.task_id = b.task_id AND a.id > b.id"
+    )
+    op.drop_index(op.f('ix_analysis_results_task_id'), table_name='analysis_results')
+    op.create_index(op.f('ix_analysis_results_task_id'), 'analysis_results', ['task_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_analysis_results_task_id'), table_name='analysis_results')
+    op.create_index(op.f('ix_analysis_results_task_id'), 'analysis_results', ['task_id'], unique=False)
@@ -0,0 +1,13 @@
+from fastapi import HTTPException
+from src.schemas.user_schema import UserResponse
+from src.utils.storage_keys import user_key
+
+
+def user_file_name(user: UserResponse, file_name: str) -> str:
+    """
+    Storage key for a client-supplied file name, kept inside the user's prefix.
+    """
+    try:
+        return user_key(user.email, file_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
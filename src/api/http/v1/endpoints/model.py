@@ -1,14 +1,21 @@
 from authx import TokenPayload
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from src.schemas.model_schema import ModelResultSchema, ModelSchema
+from typing import List
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import StreamingResponse
+from src.schemas.model_schema import ModelResultSchema, ModelSchema, ModelBatchSchema, ModelQueueSchema
+from src.schemas.upload_schema import CompleteUploadRequest, PresignUploadRequest, PresignedUploadSchema
+from src.core.config import settings
 from src.schemas.responses.general_response import GeneralResponse
 from src.usecases.model_usecase import ModelUseCase, get_model_use_case
 from src.usecases.user_usecase import UserUseCase, get_user_use_case
 from src.api.http.dependencies import security
+from src.api.http.storage_keys import user_file_name
+from src.utils.storage_keys import is_user_key
 
 
 router = APIRouter(prefix="/model", tags=["model"])
 
+
 @router.post("/analyze", response_model=GeneralResponse[ModelSchema])
 async def analyze_video(
     file: UploadFile = File(...),
@@ -25,8 +32,102 @@ async def analyze_video(
     
     print(f"Received file: {file.filename}")
 
-    file_name = f"{user.email}/{file.filename}"
-    result = await model_use_case.analyze_video(user_id=user.id, file=file.file, file_name=file_name)
+    file_name = user_file_name(user, file.filename)
+    result = await model_use_case.analyze_video(user=user, file=file.file, file_name=file_name)
+
+    return GeneralResponse[ModelSchema](
+        status="success",
+        message="Video analysis started successfully",
+        data=result
+    )
+
+
+@router.post("/analyze/stream", response_model=GeneralResponse[ModelSchema])
+async def analyze_video_stream(
+    request: Request,
+    file_name: str,
+    model_use_case: ModelUseCase = Depends(get_model_use_case),
+    user_use_case: UserUseCase = Depends(get_user_use_case),
+    token_payload: TokenPayload = Depends(security.access_token_required),
+) -> GeneralResponse[ModelSchema]:
+    """
+    Analyze a video sent as the raw request body.
+
+    The body is piped to storage chunk by chunk while the client is still
+    sending, without spooling the whole file to disk first.
+    """
+    user = await user_use_case.get_user_by_fields(email=token_payload.sub)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    result = await model_use_case.analyze_video_stream(
+        user=user,
+        chunks=request.stream(),
+        file_name=user_file_name(user, file_name),
+    )
+
+    return GeneralResponse[ModelSchema](
+        status="success",
+        message="Video analysis started successfully",
+        data=result
+    )
+
+
+@router.post("/upload/presign", response_model=GeneralResponse[PresignedUploadSchema])
+async def presign_upload(
+    upload: PresignUploadRequest,
+    model_use_case: ModelUseCase = Depends(get_model_use_case),
+    user_use_case: UserUseCase = Depends(get_user_use_case),
+    token_payload: TokenPayload = Depends(security.access_token_required),
+) -> GeneralResponse[PresignedUploadSchema]:
+    """
+    Issue presigned URL(s) so the client can upload a video straight to S3.
+
+    Small files get a single PUT URL; larger ones get one URL per part of a
+    multipart upload. Call /upload/complete afterwards to start the analysis.
+    """
+    user = await user_use_case.get_user_by_fields(email=token_payload.sub)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    file_name = user_file_name(user, upload.file_name)
+
+    try:
+        result = await model_use_case.presign_upload(file_name, upload.size)
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    return GeneralResponse[PresignedUploadSchema](
+        status="success",
+        message="Upload URLs issued successfully",
+        data=result
+    )
+
+
+@router.post("/upload/complete", response_model=GeneralResponse[ModelSchema])
+async def complete_upload(
+    upload: CompleteUploadRequest,
+    model_use_case: ModelUseCase = Depends(get_model_use_case),
+    user_use_case: UserUseCase = Depends(get_user_use_case),
+    token_payload: TokenPayload = Depends(security.access_token_required),
+) -> GeneralResponse[ModelSchema]:
+    """
+    Finish a presigned upload, register the video and start its analysis.
+    """
+    user = await user_use_case.get_user_by_fields(email=token_payload.sub)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not is_user_key(user.email, upload.key):
+        raise HTTPException(status_code=403, detail="Upload does not belong to this user")
+    if upload.upload_id and not upload.parts:
+        raise HTTPException(status_code=400, detail="Multipart upload has no parts")
+
+    try:
+        result = await model_use_case.complete_upload(user, upload)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
 
     return GeneralResponse[ModelSchema](
         status="success",
@@ -44,12 +145,18 @@ async def analyze_video_url(
 ) -> GeneralResponse[ModelSchema]:
     """
     Analyze a video URL and return the result.
+
+    The URL must be one of the user's own stored videos or point to a host in
+    ANALYSIS_URL_ALLOWED_HOSTS.
     """
     user = await user_use_case.get_user_by_fields(email=token_payload.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    result = await model_use_case.analyze_video(user_id=user.id, file=video_url, file_name=video_url)
+    try:
+        result = await model_use_case.analyze_url(user=user, url=video_url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return GeneralResponse[ModelSchema](
         status="success",
@@ -57,6 +164,85 @@ async def analyze_video_url(
         data=result
     )
 
+@router.post("/analyze/batch", response_model=GeneralResponse[ModelBatchSchema])
+async def analyze_batch(
+    files: List[UploadFile] = File(default=[]),
+    urls: List[str] = Form(default=[]),
+    model_use_case: ModelUseCase = Depends(get_model_use_case),
+    user_use_case: UserUseCase = Depends(get_user_use_case),
+    token_payload: TokenPayload = Depends(security.access_token_required),
+) -> GeneralResponse[ModelBatchSchema]:
+    """
+    Analyze many video files and/or URLs in one request and return a batch ID.
+    """
+    if not files and not urls:
+        raise HTTPException(status_code=400, detail="No files or URLs provided")
+    if len(files) + len(urls) > settings.batch_max_items:
+        raise HTTPException(status_code=413, detail=f"A batch can contain at most {settings.batch_max_items} videos")
+
+    user = await user_use_case.get_user_by_fields(email=token_payload.sub)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    try:
+        result = await model_use_case.analyze_batch(
+            user=user,
+            files=[(file.file, user_file_name(user, file.filename)) for file in files],
+            urls=urls,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return GeneralResponse[ModelBatchSchema](
+        status="success",
+        message="Batch analysis started successfully",
+        data=result
+    )
+
+
+@router.get("/batch/{batch_id}", response_model=GeneralResponse[ModelBatchSchema])
+async def get_batch(
+    batch_id: str,
+    use_case: ModelUseCase = Depends(get_model_use_case),
+    user_use_case: UserUseCase = Depends(get_user_use_case),
+    token_payload: TokenPayload = Depends(security.access_token_required),
+) -> GeneralResponse[ModelBatchSchema]:
+    """
+    Retrieve the aggregate status of one of the user's batch analyses.
+    """
+    user = await user_use_case.get_user_by_fields(email=token_payload.sub)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    try:
+        result = await use_case.get_batch(user, batch_id)
+        return GeneralResponse[ModelBatchSchema](
+            status="success",
+            message="Batch retrieved successfully",
+            data=result
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/queues", dependencies=[Depends(security.access_token_required)], response_model=GeneralResponse[List[ModelQueueSchema]])
+async def get_queues(
+    use_case: ModelUseCase = Depends(get_model_use_case),
+) -> GeneralResponse[List[ModelQueueSchema]]:
+    """
+    Retrieve the depth and recent queue-wait latency of every scheduling class.
+    """
+    try:
+        queues = await use_case.get_queues()
+        return GeneralResponse[List[ModelQueueSchema]](
+            status="success",
+            message="Queues retrieved successfully",
+            data=queues
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/result/{task_id}", dependencies=[Depends(security.access_token_required)], response_model=GeneralResponse[ModelSchema])
 async def get_result(
     task_id: str,
@@ -76,4 +262,28 @@ async def get_result(
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
-    
+
+
+@router.get("/result/{task_id}/stream", dependencies=[Depends(security.access_token_required)])
+async def stream_result(
+    task_id: str,
+    use_case: ModelUseCase = Depends(get_model_use_case),
+) -> StreamingResponse:
+    """
+    Stream the analysis state for a given task ID as Server-Sent Events.
+
+    Sends the current state right away, then every change (processing, success,
+    failed) until the task finishes, with keep-alive comments in between.
+    """
+    async def events():
+        async for event in use_case.stream_result(task_id):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {event.status}\ndata: {event.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
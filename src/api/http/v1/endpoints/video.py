@@ -1,10 +1,12 @@
 from authx import TokenPayload
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 from src.schemas.video_schema import VideoCreate, VideoUpdate, VideoResponse
+from src.schemas.storage_schema import StorageMetricsSchema
 from src.schemas.responses.general_response import GeneralResponse
 from src.usecases.video_usecase import VideoUseCase, get_video_use_case
 from src.usecases.user_usecase import UserUseCase, get_user_use_case
 from src.api.http.dependencies import security
+from src.api.http.storage_keys import user_file_name
 from typing import List
 
 
@@ -149,7 +151,7 @@ async def upload_video_file(
         if not user_info:
             raise HTTPException(status_code=404, detail="User not found")
         
-        file_name = f"{user_info.email}/{file.filename}"
+        file_name = user_file_name(user_info, file.filename)
         video_url = await video_use_case.upload_video_file(user_info.id, file.file, file_name)
         
         return GeneralResponse[VideoResponse](
@@ -159,4 +161,47 @@ async def upload_video_file(
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
-    
\ No newline at end of file
+
+
+@router.post("/s3/upload/stream", response_model=GeneralResponse[VideoResponse])
+async def upload_video_stream(
+    request: Request,
+    file_name: str,
+    user: TokenPayload = Depends(security.access_token_required),
+    video_use_case: VideoUseCase = Depends(get_video_use_case),
+    user_use_case: UserUseCase = Depends(get_user_use_case),
+) -> VideoResponse:
+    """
+    Upload a video sent as the raw request body, streaming it to S3 as it arrives.
+    """
+    try:
+        user_info = await user_use_case.get_user_by_fields(email=user.sub)
+        if not user_info:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        video = await video_use_case.upload_video_stream(
+            user_info.id, request.stream(), user_file_name(user_info, file_name)
+        )
+
+        return GeneralResponse[VideoResponse](
+            status="success",
+            message="Video uploaded successfully",
+            data=video
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/s3/metrics", dependencies=[Depends(security.access_token_required)], response_model=GeneralResponse[StorageMetricsSchema])
+async def get_storage_metrics(
+    video_use_case: VideoUseCase = Depends(get_video_use_case),
+) -> StorageMetricsSchema:
+    """
+    Retrieve queue depth and throughput counters of the S3 upload executor.
+    """
+    metrics = await video_use_case.get_storage_metrics()
+    return GeneralResponse[StorageMetricsSchema](
+        status="success",
+        message="Storage metrics retrieved successfully",
+        data=metrics
+    )
@@ -0,0 +1,199 @@
+import asyncio
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Awaitable, AsyncIterator, Callable, List, Optional
+from redis.asyncio import Redis
+from src.core.cache.keys import in_flight_key
+from src.core.config import Settings, settings
+from src.core.connections.redis.redis_connection import redis
+from src.core.logger.logger import logger
+from src.inference.model_inference import get_model_inference
+from src.inference.scheduling import DEFAULT_CLASS, PRIORITY_CLASSES, is_paid, priority_queue
+from src.schemas.user_schema import UserResponse
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when an analysis is not admitted; the client should retry after retry_after seconds.
+    """
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionTooLarge(Exception):
+    """
+    Raised when a request asks for more analyses than the user may ever have in flight; retrying cannot help.
+    """
+
+    def __init__(self, reason: str, limit: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.limit = limit
+
+
+class Reservation:
+    """
+    Slots a request holds in its user's in-flight set while it uploads and dispatches.
+    """
+
+    def __init__(self, user_id: int, placeholders: List[str],
+                 swap: Optional[Callable[[int, List[str], List[str]], Awaitable[None]]] = None):
+        self.user_id = user_id
+        self.placeholders = placeholders
+        self.task_ids: List[str] = []
+        self.confirmed = False
+        self._swap = swap
+
+    async def claim(self, task_ids: List[str]) -> None:
+        """
+        Hand reserved slots over to the given task IDs.
+
+        Must run before the tasks are dispatched: the worker frees a slot by
+        task ID when the task finishes, which can happen before apply_async
+        even returns.
+        """
+        placeholders = self.placeholders[:len(task_ids)]
+        self.placeholders = self.placeholders[len(task_ids):]
+        if self._swap is not None:
+            await self._swap(self.user_id, placeholders, task_ids)
+        self.task_ids.extend(task_ids)
+
+    def confirm(self) -> None:
+        """
+        Mark the claimed tasks as dispatched; they stay in flight until the worker finishes them.
+        """
+        self.confirmed = True
+
+
+class AdmissionController(ABC):
+    @abstractmethod
+    def reserve(self, user: UserResponse, count: int = 1) -> AsyncIterator[Reservation]:
+        """
+        Admit count analyses for the user or raise AdmissionRejected.
+
+        Raises AdmissionTooLarge if count is above the user's in-flight limit.
+
+        Used as an async context manager around the upload and dispatch, so
+        rejected requests never upload anything and slots of failed requests
+        are given back.
+        """
+        pass
+
+
+def total_queue_depth() -> int:
+    queues = [priority_queue(name) for name in (*PRIORITY_CLASSES, DEFAULT_CLASS)]
+    return sum(get_model_inference().queue_depths(queues).values())
+
+
+class RedisAdmissionController(AdmissionController):
+    """
+    Admission control from the total analysis queue depth and per-user in-flight counts.
+
+    Past admission_overload_queue_depth queued analyses only paid users are
+    admitted, and past admission_max_queue_depth nobody is. The depth is read
+    at most every admission_depth_cache_ms; if reading it fails, the last
+    value is used until it is admission_depth_max_age_ms old, after which the
+    depth is unknown and nothing is shed on it.
+
+    Each user's in-flight analyses are a sorted set of task IDs scored by
+    admission time; the worker removes a task when it finishes and entries
+    older than admission_in_flight_ttl are dropped, so a lost task cannot
+    hold a slot forever.
+    """
+
+    def __init__(self, client: Redis, settings: Settings, queue_depth: Callable[[], int] = total_queue_depth):
+        self.client = client
+        self.settings = settings
+        self.queue_depth = queue_depth
+        self._depth: Optional[int] = None
+        self._depth_at = float("-inf")
+        self._depth_checked_at = float("-inf")
+        self._depth_lock = asyncio.Lock()
+
+
+    async def _current_depth(self) -> Optional[int]:
+        async with self._depth_lock:
+            now = time.monotonic()
+            if now - self._depth_checked_at >= self.settings.admission_depth_cache_ms / 1000:
+                self._depth_checked_at = now
+                try:
+                    self._depth = await asyncio.to_thread(self.queue_depth)
+                    self._depth_at = now
+                except Exception as e:
+                    # Don't turn a broker hiccup into rejections; dispatch reports real outages.
+                    logger.warning(f"Failed to read queue depth for admission: {e}")
+            if now - self._depth_at > self.settings.admission_depth_max_age_ms / 1000:
+                return None
+            return self._depth
+
+
+    async def _check_depth(self, paid: bool) -> None:
+        depth = await self._current_depth()
+        if depth is None:
+            return
+        if depth >= self.settings.admission_max_queue_depth:
+            raise AdmissionRejected("Analysis queue is full", self.settings.admission_retry_after)
+        if not paid and depth >= self.settings.admission_overload_queue_depth:
+            raise AdmissionRejected("Service is overloaded, free-tier analyses are paused", self.settings.admission_retry_after)
+
+
+    async def _acquire(self, user_id: int, count: int, limit: int) -> Reservation:
+        key = in_flight_key(user_id)
+        now = time.time()
+        placeholders = [f"pending:{uuid.uuid4()}" for _ in range(count)]
+        # Add first and count afterwards, so concurrent requests of one user can't all pass the check.
+        pipe = self.client.pipeline(transaction=True)
+        pipe.zremrangebyscore(key, "-inf", now - self.settings.admission_in_flight_ttl)
+        pipe.zadd(key, {member: now for member in placeholders})
+        pipe.zcard(key)
+        pipe.expire(key, self.settings.admission_in_flight_ttl)
+        _, _, in_flight, _ = await pipe.execute()
+        if in_flight > limit:
+            await self.client.zrem(key, *placeholders)
+            raise AdmissionRejected(
+                f"Too many analyses in progress (limit {limit})", self.settings.admission_retry_after
+            )
+        return Reservation(user_id, placeholders, self._swap)
+
+
+    async def _swap(self, user_id: int, placeholders: List[str], task_ids: List[str]) -> None:
+        key = in_flight_key(user_id)
+        pipe = self.client.pipeline(transaction=True)
+        if placeholders:
+            pipe.zrem(key, *placeholders)
+        pipe.zadd(key, {task_id: time.time() for task_id in task_ids})
+        pipe.expire(key, self.settings.admission_in_flight_ttl)
+        await pipe.execute()
+
+
+    async def _settle(self, reservation: Reservation) -> None:
+        # Unused slots are given back, and so are the claimed ones if dispatch failed.
+        members = reservation.placeholders + ([] if reservation.confirmed else reservation.task_ids)
+        if members:
+            await self.client.zrem(in_flight_key(reservation.user_id), *members)
+
+
+    @asynccontextmanager
+    async def reserve(self, user: UserResponse, count: int = 1) -> AsyncIterator[Reservation]:
+        if not self.settings.admission_control or count <= 0:
+            yield Reservation(user.id, [])
+            return
+
+        paid = is_paid(user.subscription_plan, user.subscription_expiry)
+        limit = self.settings.admission_max_in_flight_paid if paid else self.settings.admission_max_in_flight_free
+        if count > limit:
+            raise AdmissionTooLarge(f"At most {limit} analyses may be in progress at once, got {count}", limit)
+        await self._check_depth(paid)
+        reservation = await self._acquire(user.id, count, limit)
+        try:
+            yield reservation
+        finally:
+            await self._settle(reservation)
+
+
+admission_controller = RedisAdmissionController(redis.client, settings)
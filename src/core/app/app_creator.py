@@ -5,7 +5,8 @@ from .lifespan import lifespan
 from src.api.http.api_router import router as api_router
 from src.core.logger.logger import logger, Logger
 from authx.exceptions import MissingTokenError
-from .handlers import missing_token_handler
+from src.core.admission.admission_controller import AdmissionRejected, AdmissionTooLarge
+from .handlers import admission_rejected_handler, admission_too_large_handler, missing_token_handler
 
 class AppCreator:
     def __init__(self, lifespan: callable) -> None:
@@ -51,3 +52,11 @@ app_creator.add_exception_handler(
     MissingTokenError,
     missing_token_handler
 )
+app_creator.add_exception_handler(
+    AdmissionRejected,
+    admission_rejected_handler
+)
+app_creator.add_exception_handler(
+    AdmissionTooLarge,
+    admission_too_large_handler
+)
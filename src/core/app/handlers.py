@@ -1,6 +1,7 @@
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from authx.exceptions import MissingTokenError
+from src.core.admission.admission_controller import AdmissionRejected, AdmissionTooLarge
 
 async def missing_token_handler(request: Request, exc: MissingTokenError):
     return JSONResponse(
@@ -9,4 +10,16 @@ async def missing_token_handler(request: Request, exc: MissingTokenError):
     )
 
 
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": exc.reason},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 
+async def admission_too_large_handler(request: Request, exc: AdmissionTooLarge):
+    return JSONResponse(
+        status_code=413,
+        content={"detail": exc.reason},
+    )
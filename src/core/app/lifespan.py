@@ -1,6 +1,9 @@
 from contextlib import asynccontextmanager
 from ..connections.connection import Connection
 from ..connections.database.postgres_connection import postgres
+from ..connections.redis.redis_connection import redis
+from ..events.task_events import task_event_broker
+from ..storage.storage_factory import storage
 from ..logger.logger import logger
 
 
@@ -8,10 +11,15 @@ from ..logger.logger import logger
 async def lifespan(app):
     logger.info("Starting up the application...")
     await startup(postgres)
+    await startup(redis)
+    await startup(task_event_broker)
     logger.info("Application started up successfully.")
     yield
     logger.info("Shutting down the application...")
+    await shutdown(task_event_broker)
+    await shutdown(redis)
     await shutdown(postgres)
+    await storage.close()
     logger.info("Application shut down successfully.")
 
 
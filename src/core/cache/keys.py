@@ -0,0 +1,10 @@
+def result_cache_key(content_hash: str, model_version: str) -> str:
+    return f"analysis:cache:{model_version}:{content_hash}"
+
+
+def queue_wait_key(priority_class: str) -> str:
+    return f"analysis:queue_wait:{priority_class}"
+
+
+def in_flight_key(user_id: int) -> str:
+    return f"analysis:in_flight:{user_id}"
@@ -0,0 +1,69 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Optional
+from redis.asyncio import Redis
+from src.core.config import settings
+from src.core.cache.keys import result_cache_key
+from src.core.connections.redis.redis_connection import redis
+from src.repo.analysis_cache_repo import analysis_cache_repository
+from src.schemas.analysis_cache_schema import AnalysisCacheCreate
+from src.schemas.model_schema import ModelResultSchema
+from src.usecases.repository import Repository
+
+
+class ResultCache(ABC):
+    """
+    Abstract base class for analysis result caches keyed by video content.
+    """
+
+    @abstractmethod
+    async def get(self, content_hash: str, model_version: str) -> Optional[ModelResultSchema]:
+        """
+        Return the stored result for the content hash and model version, if any.
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, content_hash: str, model_version: str, result: ModelResultSchema) -> None:
+        """
+        Store a result for the content hash and model version.
+        """
+        pass
+
+
+class RedisPostgresResultCache(ResultCache):
+    """
+    Redis in front of the durable analysis_cache table.
+
+    Postgres hits are written back to Redis so the next lookup is a single key read.
+    """
+
+    def __init__(self, client: Redis, repository: Repository, ttl: int):
+        self.client = client
+        self.repository = repository
+        self.ttl = ttl
+
+    async def get(self, content_hash: str, model_version: str) -> Optional[ModelResultSchema]:
+        key = result_cache_key(content_hash, model_version)
+        cached = await self.client.get(key)
+        if cached:
+            return ModelResultSchema(**json.loads(cached))
+
+        entry = await self.repository.get_by_fields(content_hash=content_hash, model_version=model_version)
+        if not entry:
+            return None
+        result = ModelResultSchema(prediction=entry.prediction, confidence=entry.confidence)
+        await self.client.set(key, result.model_dump_json(), ex=self.ttl)
+        return result
+
+    async def set(self, content_hash: str, model_version: str, result: ModelResultSchema) -> None:
+        await self.repository.create(AnalysisCacheCreate(
+            content_hash=content_hash,
+            model_version=model_version,
+            prediction=result.prediction,
+            confidence=result.confidence,
+        ))
+        await self.client.set(result_cache_key(content_hash, model_version), result.model_dump_json(), ex=self.ttl)
+
+
+result_cache = RedisPostgresResultCache(redis.client, analysis_cache_repository, settings.result_cache_ttl)
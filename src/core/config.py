@@ -1,3 +1,4 @@
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from authx import AuthX, AuthXConfig, RequestToken
 
@@ -16,11 +17,117 @@ class Settings(BaseSettings):
     # JWT
     jwt_secret: str
 
+    # Processes
+    api_workers: int = 4
+    api_preload_inference: bool = False
+    worker_preload_parent: bool = False
+
+    # Celery worker
+    celery_concurrency: int = 0
+    celery_prefetch_multiplier: int = 1
+    celery_acks_late: bool = True
+    celery_reject_on_worker_lost: bool = True
+    celery_task_soft_time_limit: int = 540
+    celery_task_time_limit: int = 600
+    celery_max_tasks_per_child: int = 200
+    celery_max_memory_per_child: int = 2 * 1024 * 1024
+    celery_result_expires: int = 24 * 60 * 60
+    celery_visibility_timeout: int = 3600
+
+    # Scheduling
+    priority_scheduling: bool = True
+    priority_long_video_bytes: int = 100 * 1024 * 1024
+    priority_queue_weights: Dict[str, int] = {
+        "paid_short": 8,
+        "paid_long": 4,
+        "free_short": 2,
+        "free_long": 1,
+        "default": 2,
+    }
+    queue_wait_samples: int = 1000
+
+    # Admission control
+    admission_control: bool = True
+    admission_max_queue_depth: int = 2000
+    admission_overload_queue_depth: int = 1000
+    admission_max_in_flight_free: int = 5
+    admission_max_in_flight_paid: int = 50
+    admission_retry_after: int = 30
+    admission_depth_cache_ms: int = 1000
+    admission_depth_max_age_ms: int = 30000
+    admission_in_flight_ttl: int = 3600
+
+    # CPU budget
+    cpu_budget_cores: int = 0
+    cpu_pinning: bool = False
+    api_threads: int = 1
+    inference_interop_threads: int = 1
+    opencv_threads: int = 1
+
+    # Storage
+    storage_backend: str = "s3"
+    local_storage_dir: str = "storage"
+    local_storage_url: Optional[str] = None
+
     # S3
     s3_access_key: str
     s3_secret_key: str
     s3_bucket_name: str
     s3_region_name: str = "us-east-1"
+    s3_endpoint_url: Optional[str] = None
+    s3_part_size: int = 8 * 1024 * 1024
+    s3_upload_concurrency: int = 4
+    s3_presign_expires: int = 3600
+    s3_presign_multipart_threshold: int = 64 * 1024 * 1024
+    s3_executor_workers: int = 16
+    s3_max_pool_connections: int = 64
+
+    # Inference
+    model_path: str = "models/best_model.pt"
+    model_version: str = "1"
+    predict_batching: bool = False
+    predict_batch_size: int = 16
+    predict_batch_wait_ms: int = 20
+    feature_transport_dtype: str = "float32"
+    frame_sampling_strategy: str = "first"
+    frame_sample_count: int = 60
+    backbone_weights: str = "IMAGENET1K_V1"
+    backbone_imagenet_normalize: bool = False
+    backbone_chunk_size: int = 16
+    inference_backend: str = "torch"
+    exported_models_dir: str = "models/exported"
+    inference_threads: int = 0
+    inference_quantized: bool = False
+
+    # Result cache
+    result_cache_ttl: int = 7 * 24 * 60 * 60
+
+    # Analysis results
+    result_write_batch_size: int = 50
+    result_write_interval_ms: int = 500
+    result_write_retries: int = 3
+    result_write_retry_backoff_ms: int = 200
+
+    # Batch analysis; batches count against the in-flight limits, so keep this at most admission_max_in_flight_paid
+    batch_max_items: int = 50
+    batch_upload_concurrency: int = 8
+
+    # Video URLs outside our storage are only analyzed from these hosts
+    analysis_url_allowed_hosts: List[str] = []
+
+    # Result streaming
+    result_stream_heartbeat: int = 15
+    result_stream_timeout: int = 600
+
+    # Video reads
+    video_read_mode: str = "cache"
+    video_cache_dir: str = "video_cache"
+    video_cache_max_bytes: int = 10 * 1024 * 1024 * 1024
+
+    # Feature store
+    feature_store_enabled: bool = False
+    feature_store_dir: str = "feature_store"
+    feature_store_max_bytes: int = 20 * 1024 * 1024 * 1024
 
     class Config:
         env_file = ".env"
@@ -35,6 +142,22 @@ class Settings(BaseSettings):
     
     def redis_url(self, db: int = 0):
         return f"redis://{self.redis_host}:{self.redis_port}/{db}"
+
+    def sampling_id(self):
+        """Identifies which frames are sampled from a video."""
+        return f"{self.frame_sampling_strategy}{self.frame_sample_count}"
+
+    def backbone_id(self):
+        """Identifies the backbone weights, runtime and preprocessing that produce frame features."""
+        normalize = "norm" if self.backbone_imagenet_normalize else "raw"
+        # Quantization only applies to the torch backend.
+        precision = "int8" if self.inference_quantized and self.inference_backend == "torch" else "fp32"
+        return f"efficientnet_b4-{self.backbone_weights.lower()}:{self.inference_backend}:{normalize}:{precision}"
+
+    def analysis_version(self, model_version: str = None):
+        """Identifies everything that changes a prediction for the same video content."""
+        return (f"{model_version or self.model_version}:{self.sampling_id()}:{self.backbone_id()}"
+                f":{self.feature_transport_dtype}")
     
 
 
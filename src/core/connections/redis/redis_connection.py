@@ -0,0 +1,27 @@
+from redis.asyncio import Redis
+from src.core.logger.logger import logger
+from src.core.config import settings, Settings
+from ..connection import Connection
+
+
+class RedisConnection(Connection):
+    def __init__(self, settings: Settings, db: int = 1) -> None:
+        self.client = Redis.from_url(settings.redis_url(db))
+
+    async def connect(self):
+        try:
+            await self.client.ping()
+        except Exception as e:
+            logger.error(f"Failed to connect to Redis: {e}")
+            raise e
+
+    async def close(self):
+        try:
+            await self.client.aclose()
+            logger.info("Disconnected from Redis")
+        except Exception as e:
+            logger.error(f"Failed to disconnect from Redis: {e}")
+            raise e
+
+
+redis = RedisConnection(settings)
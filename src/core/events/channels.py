@@ -0,0 +1,10 @@
+TASK_EVENTS_PREFIX = "analysis:task:"
+TASK_EVENTS_PATTERN = f"{TASK_EVENTS_PREFIX}*"
+
+
+def task_events_channel(task_id: str) -> str:
+    return f"{TASK_EVENTS_PREFIX}{task_id}"
+
+
+def task_id_from_channel(channel: str) -> str:
+    return channel[len(TASK_EVENTS_PREFIX):]
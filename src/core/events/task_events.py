@@ -0,0 +1,87 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from src.core.connections.connection import Connection
+from src.core.connections.redis.redis_connection import redis
+from src.core.logger.logger import logger
+from src.schemas.model_schema import ModelSchema
+from .channels import TASK_EVENTS_PATTERN, task_id_from_channel
+
+
+class TaskEventBroker(Connection):
+    """
+    Fans task state events out to local subscribers.
+
+    Each API process holds a single Redis pattern subscription for all task
+    channels and routes every message to the asyncio queues of the clients
+    watching that task, so open result streams do not cost a Redis
+    connection each.
+    """
+
+    def __init__(self, client: Redis):
+        self.client = client
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._pubsub: Optional[PubSub] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def connect(self):
+        async with self._lock:
+            if self._listener is not None and not self._listener.done():
+                return
+            if self._pubsub is not None:
+                await self._pubsub.aclose()
+            self._pubsub = self.client.pubsub()
+            await self._pubsub.psubscribe(TASK_EVENTS_PATTERN)
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        logger.info("Task event broker stopped")
+
+    @asynccontextmanager
+    async def subscribe(self, task_id: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        Register a queue that receives ModelSchema events for the task.
+        """
+        await self.connect()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(task_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(task_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[task_id]
+
+    async def _listen(self):
+        try:
+            async for message in self._pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                subscribers = self._subscribers.get(task_id_from_channel(channel))
+                if not subscribers:
+                    continue
+                event = ModelSchema(**json.loads(message["data"]))
+                for queue in subscribers:
+                    queue.put_nowait(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Task event listener stopped: {e}")
+
+
+task_event_broker = TaskEventBroker(redis.client)
@@ -0,0 +1,31 @@
+from typing import Dict, Optional
+from redis.asyncio import Redis
+from src.core.cache.keys import queue_wait_key
+from src.core.connections.redis.redis_connection import redis
+
+
+def percentile(samples, fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+class QueueWaitStats:
+    """
+    Summarizes the latest queue-wait samples the worker records per scheduling class.
+    """
+
+    def __init__(self, client: Redis):
+        self.client = client
+
+    async def summary(self, priority_class: str) -> Dict[str, Optional[float]]:
+        samples = sorted(float(value) for value in await self.client.lrange(queue_wait_key(priority_class), 0, -1))
+        return {
+            "samples": len(samples),
+            "wait_p50": percentile(samples, 0.5),
+            "wait_p95": percentile(samples, 0.95),
+            "wait_max": samples[-1] if samples else None,
+        }
+
+
+queue_wait_stats = QueueWaitStats(redis.client)
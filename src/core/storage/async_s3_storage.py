@@ -0,0 +1,72 @@
+from .s3_storage import BaseS3Storage
+from io import BytesIO
+from typing import AsyncIterator
+import asyncio
+
+
+class AsyncS3Storage(BaseS3Storage):
+    """
+    S3 storage on the async-native aiobotocore client.
+
+    Transfers run on the event loop itself, so concurrent uploads and
+    downloads cost a connection each instead of a thread each.
+    """
+
+    def __init__(self, bucket_name: str, **kwargs):
+        super().__init__(bucket_name, **kwargs)
+        self._client = None
+        self._client_context = None
+        self._lock = asyncio.Lock()
+
+    async def _get_client(self):
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    try:
+                        from aiobotocore.config import AioConfig
+                        from aiobotocore.session import get_session
+                    except ImportError as e:
+                        raise RuntimeError("aiobotocore is required for the s3_async storage backend") from e
+
+                    self._client_context = get_session().create_client(
+                        's3',
+                        region_name=self.region_name,
+                        aws_access_key_id=self.access_key,
+                        aws_secret_access_key=self.secret_key,
+                        endpoint_url=self.endpoint_url,
+                        config=AioConfig(max_pool_connections=self.max_pool_connections),
+                    )
+                    self._client = await self._client_context.__aenter__()
+        return self._client
+
+    async def close(self):
+        if self._client_context is not None:
+            await self._client_context.__aexit__(None, None, None)
+            self._client = None
+            self._client_context = None
+
+    async def _call(self, operation: str, file_name: str, **kwargs) -> dict:
+        client = await self._get_client()
+        return await getattr(client, operation)(Bucket=self.bucket_name, Key=file_name, **kwargs)
+
+    async def _presign(self, operation: str, file_name: str, **kwargs) -> str:
+        client = await self._get_client()
+        return await client.generate_presigned_url(
+            operation,
+            Params={"Bucket": self.bucket_name, "Key": file_name, **kwargs},
+            ExpiresIn=self.presign_expires,
+        )
+
+    async def upload(self, file: BytesIO, file_name: str) -> str:
+        async def chunks():
+            # Spooled uploads may be on disk; read them off the event loop.
+            while chunk := await asyncio.to_thread(file.read, self.part_size):
+                yield chunk
+
+        return await self.upload_stream(chunks(), file_name)
+
+    async def download_stream(self, file_name: str, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+        response = await self._call("get_object", file_name)
+        async with response["Body"] as body:
+            while chunk := await body.read(chunk_size):
+                yield chunk
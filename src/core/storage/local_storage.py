@@ -0,0 +1,97 @@
+from .storage import Storage
+from io import BytesIO
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple
+import asyncio
+import os
+import shutil
+import uuid
+
+
+class LocalStorage(Storage):
+    """
+    Storage on the local filesystem, for development and tests.
+
+    Files live under root at their key. URLs are absolute paths, which the
+    worker can open directly when it shares the filesystem, or base_url + key
+    when the directory is served over HTTP.
+    """
+
+    def __init__(self, root: str, base_url: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url
+
+    def path(self, file_name: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, file_name))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"Invalid file name: {file_name}")
+        return path
+
+    def object_url(self, file_name: str) -> str:
+        if self.base_url:
+            return f"{self.base_url.rstrip('/')}/{file_name}"
+        return self.path(file_name)
+
+    def key_for(self, url: str) -> Optional[str]:
+        prefix = f"{self.base_url.rstrip('/')}/" if self.base_url else self.root + os.sep
+        if url.startswith(prefix) and len(url) > len(prefix):
+            return url[len(prefix):]
+        return None
+
+    def _open_temp(self, file_name: str) -> Tuple[BinaryIO, str]:
+        path = self.path(file_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        return open(tmp, "wb"), tmp
+
+    def _write_file(self, file: BytesIO, file_name: str):
+        out, tmp = self._open_temp(file_name)
+        try:
+            with out:
+                shutil.copyfileobj(file, out)
+            os.replace(tmp, self.path(file_name))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    async def upload(self, file: BytesIO, file_name: str) -> str:
+        await asyncio.to_thread(self._write_file, file, file_name)
+        return self.object_url(file_name)
+
+    async def upload_stream(self, chunks: AsyncIterator[bytes], file_name: str) -> str:
+        out, tmp = await asyncio.to_thread(self._open_temp, file_name)
+        try:
+            with out:
+                async for chunk in chunks:
+                    await asyncio.to_thread(out.write, chunk)
+            os.replace(tmp, self.path(file_name))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return self.object_url(file_name)
+
+    async def download_stream(self, file_name: str, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+        file = await asyncio.to_thread(open, self.path(file_name), "rb")
+        with file:
+            while chunk := await asyncio.to_thread(file.read, chunk_size):
+                yield chunk
+
+    async def delete(self, file_name: str) -> bool:
+        try:
+            await asyncio.to_thread(os.remove, self.path(file_name))
+            return True
+        except FileNotFoundError:
+            return False
+
+    async def exists(self, file_name: str) -> bool:
+        return os.path.isfile(self.path(file_name))
+
+    async def presign_upload(self, file_name: str, size: int) -> dict:
+        raise NotImplementedError("Direct uploads are not supported by local storage")
+
+    async def complete_upload(self, file_name: str, upload_id: Optional[str] = None,
+                              parts: Optional[List[Tuple[int, str]]] = None) -> str:
+        if upload_id:
+            raise NotImplementedError("Direct uploads are not supported by local storage")
+        if not await self.exists(file_name):
+            raise FileNotFoundError(f"{file_name} has not been uploaded")
+        return self.object_url(file_name)
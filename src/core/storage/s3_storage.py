@@ -1,40 +1,236 @@
-
 from .storage import Storage
+from abc import abstractmethod
 from io import BytesIO
-from src.core.config import settings
+from functools import partial
+from math import ceil
+from typing import AsyncIterator, List, Optional, Tuple
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from src.utils.instrumented_executor import InstrumentedExecutor
 import boto3
 import asyncio
 
 
-class S3Storage(Storage):
-    def __init__(self, bucket_name: str, region_name: str = 'us-east-1', access_key: str = None, secret_key: str = None):
+MAX_PARTS = 10000
+
+
+class BaseS3Storage(Storage):
+    """
+    S3 operations shared by the blocking and the async-native clients.
+
+    Subclasses only provide how a single S3 call is made (_call, _presign)
+    and how an object body is read (download_stream).
+    """
+
+    def __init__(self, bucket_name: str, region_name: str = 'us-east-1', access_key: str = None, secret_key: str = None,
+                 endpoint_url: Optional[str] = None, part_size: int = 8 * 1024 * 1024, upload_concurrency: int = 4,
+                 presign_expires: int = 3600, presign_multipart_threshold: int = 64 * 1024 * 1024,
+                 max_pool_connections: int = 64):
         self.bucket_name = bucket_name
         self.region_name = region_name
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.endpoint_url = endpoint_url
+        self.part_size = part_size
+        self.upload_concurrency = upload_concurrency
+        self.presign_expires = presign_expires
+        self.presign_multipart_threshold = presign_multipart_threshold
+        self.max_pool_connections = max_pool_connections
+
+    @abstractmethod
+    async def _call(self, operation: str, file_name: str, **kwargs) -> dict:
+        """Run an S3 client operation on file_name in this bucket."""
+        pass
+
+    @abstractmethod
+    async def _presign(self, operation: str, file_name: str, **kwargs) -> str:
+        """Presign an S3 client operation on file_name in this bucket."""
+        pass
+
+    def object_url(self, file_name: str) -> str:
+        if self.endpoint_url:
+            return f"{self.endpoint_url.rstrip('/')}/{self.bucket_name}/{file_name}"
+        return f"https://{self.bucket_name}.s3.{self.region_name}.amazonaws.com/{file_name}"
+
+    def key_for(self, url: str) -> Optional[str]:
+        prefix = self.object_url("")
+        if url.startswith(prefix) and len(url) > len(prefix):
+            return url[len(prefix):]
+        return None
+
+    async def upload_stream(self, chunks: AsyncIterator[bytes], file_name: str) -> str:
+        """
+        Pipe chunks into an S3 multipart upload while they are still arriving.
+
+        Parts of part_size bytes are sent as soon as they fill, with at most
+        upload_concurrency parts in flight; reading the stream pauses while all
+        slots are busy, so memory stays around part_size * (upload_concurrency + 1).
+        Streams shorter than one part are stored with a single PutObject.
+        """
+        slots = asyncio.Semaphore(self.upload_concurrency)
+        pending: List[asyncio.Task] = []
+        parts = []
+        upload_id = None
+
+        async def send(part_number: int, body: bytes):
+            try:
+                response = await self._call("upload_part", file_name, UploadId=upload_id, PartNumber=part_number, Body=body)
+                parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+            finally:
+                slots.release()
+
+        async def flush(body: bytes):
+            await slots.acquire()
+            pending.append(asyncio.create_task(send(len(pending) + 1, body)))
+
+        buffer = bytearray()
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                while len(buffer) >= self.part_size:
+                    if upload_id is None:
+                        upload_id = (await self._call("create_multipart_upload", file_name))["UploadId"]
+                    body = bytes(buffer[:self.part_size])
+                    del buffer[:self.part_size]
+                    await flush(body)
+
+            if upload_id is None:
+                await self._call("put_object", file_name, Body=bytes(buffer))
+                return self.object_url(file_name)
+
+            if buffer:
+                await flush(bytes(buffer))
+            await asyncio.gather(*pending)
+            parts.sort(key=lambda part: part["PartNumber"])
+            await self._call("complete_multipart_upload", file_name, UploadId=upload_id, MultipartUpload={"Parts": parts})
+            return self.object_url(file_name)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            if upload_id is not None:
+                await self._call("abort_multipart_upload", file_name, UploadId=upload_id)
+            raise
+
+    async def delete(self, file_name: str) -> bool:
+        await self._call("delete_object", file_name)
+        return True
+
+    async def exists(self, file_name: str) -> bool:
+        try:
+            await self._call("head_object", file_name)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    async def presign_upload(self, file_name: str, size: int) -> dict:
+        """
+        Presign a direct client upload of size bytes.
+
+        Small files get a single PUT URL; larger ones start a multipart upload
+        and get one URL per part. Parts must be uploaded with exactly part_size
+        bytes (the last one may be shorter) and their ETags sent back to
+        complete_upload.
+        """
+        if size <= self.presign_multipart_threshold:
+            url = await self._presign("put_object", file_name)
+            return {"key": file_name, "url": url, "expires_in": self.presign_expires}
+
+        part_size = max(self.part_size, ceil(size / MAX_PARTS))
+        upload_id = (await self._call("create_multipart_upload", file_name))["UploadId"]
+        parts = [
+            {
+                "part_number": number,
+                "url": await self._presign("upload_part", file_name, UploadId=upload_id, PartNumber=number),
+            }
+            for number in range(1, ceil(size / part_size) + 1)
+        ]
+        return {
+            "key": file_name,
+            "upload_id": upload_id,
+            "part_size": part_size,
+            "parts": parts,
+            "expires_in": self.presign_expires,
+        }
+
+    async def complete_upload(self, file_name: str, upload_id: Optional[str] = None,
+                              parts: Optional[List[Tuple[int, str]]] = None) -> str:
+        if upload_id:
+            await self._call(
+                "complete_multipart_upload",
+                file_name,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": [
+                    {"PartNumber": number, "ETag": etag} for number, etag in sorted(parts or [])
+                ]},
+            )
+        if not await self.exists(file_name):
+            raise FileNotFoundError(f"{file_name} has not been uploaded")
+        return self.object_url(file_name)
+
+
+class S3Storage(BaseS3Storage):
+    """
+    S3 storage on the blocking boto3 client, run on a dedicated thread pool.
+    """
+
+    def __init__(self, bucket_name: str, executor_workers: int = 16, **kwargs):
+        super().__init__(bucket_name, **kwargs)
+        self.executor = InstrumentedExecutor(max_workers=executor_workers, thread_name_prefix="s3")
+        self.transfer_config = TransferConfig(
+            multipart_threshold=self.part_size,
+            multipart_chunksize=self.part_size,
+            max_concurrency=self.upload_concurrency,
+        )
         self.s3_client = boto3.client(
             's3',
             region_name=self.region_name,
-            aws_access_key_id=access_key,
-            aws_secret_access_key=secret_key
+            aws_access_key_id=self.access_key,
+            aws_secret_access_key=self.secret_key,
+            endpoint_url=self.endpoint_url,
+            config=Config(max_pool_connections=self.max_pool_connections),
+        )
+
+    def metrics(self) -> dict:
+        return self.executor.metrics()
+
+    async def close(self):
+        self.executor.shutdown(wait=True)
+
+    async def _call(self, operation: str, file_name: str, **kwargs) -> dict:
+        func = getattr(self.s3_client, operation)
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, partial(func, Bucket=self.bucket_name, Key=file_name, **kwargs)
+        )
+
+    async def _presign(self, operation: str, file_name: str, **kwargs) -> str:
+        return self.s3_client.generate_presigned_url(
+            operation,
+            Params={"Bucket": self.bucket_name, "Key": file_name, **kwargs},
+            ExpiresIn=self.presign_expires,
         )
 
     async def upload(self, file: BytesIO, file_name: str) -> str:
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._upload_file, file, file_name)
-            return f"https://{self.bucket_name}.s3.{self.region_name}.amazonaws.com/{file_name}"
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, self._upload_file, file, file_name)
+            return self.object_url(file_name)
         except Exception as e:
             raise
 
     def _upload_file(self, file: BytesIO, file_name: str):
         try:
-            self.s3_client.upload_fileobj(file, self.bucket_name, file_name)
+            self.s3_client.upload_fileobj(file, self.bucket_name, file_name, Config=self.transfer_config)
         except Exception as e:
             raise
 
-
-s3_storage = S3Storage(
-    bucket_name=settings.s3_bucket_name,
-    region_name=settings.s3_region_name,
-    access_key=settings.s3_access_key,
-    secret_key=settings.s3_secret_key
-)
\ No newline at end of file
+    async def download_stream(self, file_name: str, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        body = (await self._call("get_object", file_name))["Body"]
+        try:
+            while chunk := await loop.run_in_executor(self.executor, body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from io import BytesIO
+from typing import AsyncIterator, List, Optional, Tuple
 
 
 class Storage(ABC):
@@ -8,4 +9,51 @@ class Storage(ABC):
         """Upload a file to the storage and return the URL."""
         pass
 
+    @abstractmethod
+    async def upload_stream(self, chunks: AsyncIterator[bytes], file_name: str) -> str:
+        """Upload a stream of chunks to the storage as they arrive and return the URL."""
+        pass
 
+    @abstractmethod
+    def object_url(self, file_name: str) -> str:
+        """Return the URL a file stored under file_name has."""
+        pass
+
+    @abstractmethod
+    def key_for(self, url: str) -> Optional[str]:
+        """Return the key of a file from a URL this storage returned, or None for other URLs."""
+        pass
+
+    @abstractmethod
+    def download_stream(self, file_name: str, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+        """Read a stored file as a stream of chunks."""
+        pass
+
+    @abstractmethod
+    async def delete(self, file_name: str) -> bool:
+        """Delete a stored file."""
+        pass
+
+    @abstractmethod
+    async def exists(self, file_name: str) -> bool:
+        """Check whether a file is stored."""
+        pass
+
+    @abstractmethod
+    async def presign_upload(self, file_name: str, size: int) -> dict:
+        """Return presigned URL(s) the client can upload the file to directly."""
+        pass
+
+    @abstractmethod
+    async def complete_upload(self, file_name: str, upload_id: Optional[str] = None,
+                              parts: Optional[List[Tuple[int, str]]] = None) -> str:
+        """Finish a direct upload, check the object exists and return its URL."""
+        pass
+
+    def metrics(self) -> dict:
+        """Return counters describing the storage's background work."""
+        return {}
+
+    async def close(self):
+        """Release resources held by the storage."""
+        pass
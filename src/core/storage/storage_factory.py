@@ -0,0 +1,34 @@
+from .storage import Storage
+from .s3_storage import S3Storage
+from .async_s3_storage import AsyncS3Storage
+from .local_storage import LocalStorage
+from src.core.config import settings, Settings
+
+
+STORAGE_BACKENDS = ("s3", "s3_async", "local")
+
+
+def create_storage(settings: Settings) -> Storage:
+    """Build the storage backend selected by settings.storage_backend."""
+    if settings.storage_backend == "local":
+        return LocalStorage(settings.local_storage_dir, settings.local_storage_url)
+
+    options = dict(
+        region_name=settings.s3_region_name,
+        access_key=settings.s3_access_key,
+        secret_key=settings.s3_secret_key,
+        endpoint_url=settings.s3_endpoint_url,
+        part_size=settings.s3_part_size,
+        upload_concurrency=settings.s3_upload_concurrency,
+        presign_expires=settings.s3_presign_expires,
+        presign_multipart_threshold=settings.s3_presign_multipart_threshold,
+        max_pool_connections=settings.s3_max_pool_connections,
+    )
+    if settings.storage_backend == "s3":
+        return S3Storage(settings.s3_bucket_name, executor_workers=settings.s3_executor_workers, **options)
+    if settings.storage_backend == "s3_async":
+        return AsyncS3Storage(settings.s3_bucket_name, **options)
+    raise ValueError(f"Unknown storage backend {settings.storage_backend!r}, expected one of {STORAGE_BACKENDS}")
+
+
+storage = create_storage(settings)
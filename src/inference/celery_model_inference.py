@@ -0,0 +1,140 @@
+from typing import Dict, List, Optional, Tuple
+import time
+import uuid
+from celery import group
+from celery.result import AsyncResult, GroupResult
+from kombu.exceptions import ChannelError
+from kombu.utils.encoding import bytes_to_str
+from worker.celery_app import app
+from src.core.config import settings
+from src.schemas.model_schema import ModelSchema, ModelResultSchema, ModelProgressSchema
+from .model_inference import ModelInference
+from .scheduling import DEFAULT_CLASS, priority_queue
+
+
+class ModelInferenceImpl(ModelInference):
+    """
+    Implementation of model inference.
+
+    Decoding, feature extraction and classification run in the Celery worker;
+    the API process only dispatches the pipeline task by name.
+    """
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+
+
+    def _signature(self, video_url: str, video_id: Optional[int], content_hash: Optional[str],
+                   priority_class: Optional[str] = None, user_id: Optional[int] = None, task_id: Optional[str] = None):
+        priority_class = priority_class if settings.priority_scheduling and priority_class else DEFAULT_CLASS
+        return app.signature(
+            'worker.celery_tasks.analyze_video',
+            args=[self.model_path, video_url],
+            kwargs={
+                'content_hash': content_hash,
+                'model_version': settings.analysis_version(),
+                'video_id': video_id,
+                'priority_class': priority_class,
+                'enqueued_at': time.time(),
+                'user_id': user_id,
+            },
+            queue=priority_queue(priority_class),
+            task_id=task_id,
+        )
+
+
+    def analyze_video(self, video_url: str, video_id: Optional[int] = None, content_hash: Optional[str] = None,
+                      priority_class: Optional[str] = None, user_id: Optional[int] = None,
+                      task_id: Optional[str] = None) -> ModelSchema:
+        task = self._signature(video_url, video_id, content_hash, priority_class, user_id, task_id).apply_async()
+        return ModelSchema(status="pending", task_id=str(task.id))
+
+
+    def analyze_videos(self, videos: List[Tuple[str, int, Optional[str], Optional[str], Optional[int], Optional[str]]]) -> List[ModelSchema]:
+        if not videos:
+            return []
+        result = group(self._signature(*video) for video in videos).apply_async()
+        return [ModelSchema(status="pending", task_id=str(task.id)) for task in result.results]
+
+
+    @staticmethod
+    def _batch_owner_key(batch_id: str) -> str:
+        return f"batch-owner-{batch_id}"
+
+
+    def save_batch(self, task_ids: List[str], owner_id: int) -> str:
+        batch = GroupResult(str(uuid.uuid4()), [AsyncResult(task_id, app=app) for task_id in task_ids], app=app)
+        batch.save(backend=app.backend)
+        # Stored next to the group, so it expires together with the results.
+        app.backend.set(self._batch_owner_key(batch.id), str(owner_id))
+        return batch.id
+
+
+    def get_batch_task_ids(self, batch_id: str, owner_id: int) -> Optional[List[str]]:
+        owner = app.backend.get(self._batch_owner_key(batch_id))
+        if owner is None or bytes_to_str(owner) != str(owner_id):
+            return None
+        batch = GroupResult.restore(batch_id, app=app)
+        if batch is None:
+            return None
+        return [result.id for result in batch.results]
+
+
+    def complete_from_cache(self, result: ModelResultSchema) -> ModelSchema:
+        task_id = str(uuid.uuid4())
+        app.backend.store_result(task_id, (result.prediction, result.confidence), 'SUCCESS')
+        return ModelSchema(status="success", result=result, task_id=task_id)
+
+
+    def queue_depths(self, queues: List[str]) -> Dict[str, int]:
+        depths = {}
+        with app.connection_for_read() as connection:
+            channel = connection.default_channel
+            for queue in queues:
+                try:
+                    depths[queue] = channel.queue_declare(queue, passive=True).message_count
+                except ChannelError:
+                    # Redis deletes a list once it's empty, so an idle queue is "not found".
+                    depths[queue] = 0
+        return depths
+
+
+    def get_result(self, task_id: str) -> ModelSchema:
+        result = AsyncResult(id=task_id, app=app)
+        return self._result_schema(task_id, result.state, result.info)
+
+
+    def get_results(self, task_ids: List[str]) -> List[ModelSchema]:
+        if not task_ids:
+            return []
+        backend = app.backend
+        values = backend.mget([backend.get_key_for_task(task_id) for task_id in task_ids])
+        results = []
+        for task_id, value in zip(task_ids, values):
+            if value is None:
+                results.append(ModelSchema(status="pending", task_id=task_id))
+            else:
+                meta = backend.decode_result(value)
+                results.append(self._result_schema(task_id, meta["status"], meta["result"]))
+        return results
+
+
+    @staticmethod
+    def _result_schema(task_id: str, state: str, info) -> ModelSchema:
+        if state == 'PENDING':
+            return ModelSchema(status="pending", task_id=task_id)
+        elif state == 'FAILURE':
+            return ModelSchema(status="failed", result=str(info), task_id=task_id)
+        elif state == 'STARTED':
+            return ModelSchema(status="processing", task_id=task_id)
+        elif state == 'PROGRESS':
+            return ModelSchema(status="processing", task_id=task_id, progress=ModelProgressSchema(**info))
+        elif state == 'SUCCESS':
+            label, prob = info
+            return ModelSchema(
+                status="success",
+                result=ModelResultSchema(prediction=label, confidence=prob),
+                task_id=task_id
+            )
+        else:
+            return ModelSchema(status="error", result=info, task_id=task_id)
@@ -1,12 +1,6 @@
 from abc import ABC, abstractmethod
-import cv2
-import torch
-from PIL import Image
-from torchvision.models import efficientnet_b4, EfficientNet_B4_Weights
-from torchvision import transforms
-from worker.celery_tasks import predict
-from celery.result import AsyncResult
-from worker.celery_app import app
+from typing import Dict, List, Optional, Tuple
+from src.core.config import settings
 from src.schemas.model_schema import ModelSchema, ModelResultSchema
 
 
@@ -16,97 +10,75 @@ class ModelInference(ABC):
     """
 
     @abstractmethod
-    def analyze_video(self, video_url: str) -> ModelSchema:
+    def analyze_video(self, video_url: str, video_id: Optional[int] = None, content_hash: Optional[str] = None,
+                      priority_class: Optional[str] = None, user_id: Optional[int] = None,
+                      task_id: Optional[str] = None) -> ModelSchema:
         """
         Analyze the given video and return the result.
+        The task gets task_id if given, so callers can track it before it is sent.
         """
         pass
 
     @abstractmethod
-    def get_result(self, task_id: str) -> ModelSchema:
+    def analyze_videos(self, videos: List[Tuple[str, int, Optional[str], Optional[str], Optional[int], Optional[str]]]) -> List[ModelSchema]:
         """
-        Get the analysis result for the given video ID.
+        Analyze several (video_url, video_id, content_hash, priority_class, user_id, task_id) entries as one Celery group.
         """
         pass
 
+    @abstractmethod
+    def save_batch(self, task_ids: List[str], owner_id: int) -> str:
+        """
+        Record the task IDs as a batch owned by the user and return the batch ID.
+        """
+        pass
 
+    @abstractmethod
+    def get_batch_task_ids(self, batch_id: str, owner_id: int) -> Optional[List[str]]:
+        """
+        Get the task IDs of a batch, or None if it is unknown or owned by another user.
+        """
+        pass
 
-class ModelInferenceImpl(ModelInference):
-    """
-    Implementation of model inference.
-    """
-
-    def __init__(self, model_path: str):
-        self.model_path = model_path
-        self.backbone = self.load_backbone()
-        self.transform = transforms.Compose([
-            transforms.Resize((224, 224)),
-            transforms.ToTensor(),
-        ])
-    
-
-    def load_backbone(self):
-        weights = EfficientNet_B4_Weights.IMAGENET1K_V1
-        model = efficientnet_b4(weights=weights)
-        model.classifier = torch.nn.Identity()
-        model.eval()
-        return model
-    
-
-    def extract_features_from_video(self, video_url: str, max_frames=60):
-        cap = cv2.VideoCapture(video_url)
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        interval = int(fps) if fps > 0 else 1
-        frames = []
-
-        idx = 0
-        while cap.isOpened() and len(frames) < max_frames:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            if idx % interval == 0:
-                img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-                img = self.transform(img)
-                frames.append(img)
-            idx += 1
-        cap.release()
-
-        if len(frames) == 0:
-            raise ValueError("⚠️ Не удалось извлечь кадры из видео")
-
-        batch = torch.stack(frames)
-        with torch.no_grad():
-            features = self.backbone(batch)
-        return features.numpy()
-
+    @abstractmethod
+    def complete_from_cache(self, result: ModelResultSchema) -> ModelSchema:
+        """
+        Register an already known result as a completed task.
+        """
+        pass
 
-    def analyze_video(self, video_url: str) -> ModelSchema:
-        features = self.extract_features_from_video(video_url)
-        features_list = features.tolist()
+    @abstractmethod
+    def queue_depths(self, queues: List[str]) -> Dict[str, int]:
+        """
+        Get the number of tasks waiting in each queue.
+        """
+        pass
 
-        task = predict.delay(self.model_path, features_list)
-        return ModelSchema(status="pending", task_id=str(task.id))
+    @abstractmethod
+    def get_result(self, task_id: str) -> ModelSchema:
+        """
+        Get the analysis result for the given video ID.
+        """
+        pass
 
+    @abstractmethod
+    def get_results(self, task_ids: List[str]) -> List[ModelSchema]:
+        """
+        Get the analysis results of many tasks with a single backend round trip.
+        """
+        pass
 
-    def get_result(self, task_id: str) -> ModelSchema:
-        result = AsyncResult(id=task_id, app=app)
 
-        if result.state == 'PENDING':
-            return ModelSchema(status="pending", task_id=task_id)
-        elif result.state == 'FAILURE':
-            return ModelSchema(status="failed", result=str(result.info), task_id=task_id)
-        elif result.state == 'STARTED':
-            return ModelSchema(status="processing", task_id=task_id)
-        elif result.state == 'SUCCESS':
-            label, prob = result.result
-            return ModelSchema(
-                status="success",
-                result=ModelResultSchema(prediction=label, confidence=prob),
-                task_id=task_id
-            )
-        else:
-            return ModelSchema(status="error", result=result.info, task_id=task_id)
 
+_model_inference = None
 
 
-model_inference = ModelInferenceImpl(model_path="models/best_model.pt")
+def get_model_inference() -> ModelInference:
+    """
+    Return the process-wide model inference, importing Celery and the worker app on first use.
+    """
+    global _model_inference
+    if _model_inference is None:
+        from .celery_model_inference import ModelInferenceImpl
+        _model_inference = ModelInferenceImpl(model_path=settings.model_path)
+    return _model_inference
@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from src.core.config import Settings
+
+
+DEFAULT_QUEUE = "video_analysis"
+DEFAULT_CLASS = "default"
+PRIORITY_CLASSES = ("paid_short", "paid_long", "free_short", "free_long")
+
+
+def is_paid(plan: Optional[str], expiry: Optional[datetime]) -> bool:
+    """
+    Whether a user's subscription currently counts as paid.
+    """
+    if not plan or plan == "free":
+        return False
+    if expiry is None:
+        return True
+    now = datetime.now(timezone.utc) if expiry.tzinfo else datetime.utcnow()
+    return expiry > now
+
+
+def priority_class(plan: Optional[str], expiry: Optional[datetime], size: Optional[int], settings: Settings) -> str:
+    """
+    Pick the scheduling class of an analysis from the user's plan and the video size.
+
+    The file size stands in for the video length, which the API does not
+    decode; videos of unknown size (URLs, direct uploads) count as long.
+    """
+    tier = "paid" if is_paid(plan, expiry) else "free"
+    length = "short" if size is not None and size <= settings.priority_long_video_bytes else "long"
+    return f"{tier}_{length}"
+
+
+def priority_queue(priority_class: str) -> str:
+    if priority_class == DEFAULT_CLASS:
+        return DEFAULT_QUEUE
+    return f"{DEFAULT_QUEUE}.{priority_class}"
+
+
+def queue_weights(settings: Settings) -> Dict[str, int]:
+    """
+    Map every analysis queue to its share of the workers' attention.
+    """
+    return {
+        priority_queue(name): max(1, settings.priority_queue_weights.get(name, 1))
+        for name in (*PRIORITY_CLASSES, DEFAULT_CLASS)
+    }
@@ -1,5 +1,9 @@
 from .core.app.app_creator import app_creator
+from .core.config import settings
+from .inference.model_inference import get_model_inference
 
 
 app = app_creator.create_app()
 
+if settings.api_preload_inference:
+    get_model_inference()
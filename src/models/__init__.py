@@ -4,6 +4,7 @@ from .payment_model import PaymentModel
 from .logs_model import LogsModel
 from .video_model import VideoModel
 from .analysis_result_model import AnalysisResultModel
+from .analysis_cache_model import AnalysisCacheModel
 
 
 __all__ = [
@@ -13,4 +14,5 @@ __all__ = [
     "LogsModel",
     "VideoModel",
     "AnalysisResultModel",
+    "AnalysisCacheModel",
 ]
\ No newline at end of file
@@ -0,0 +1,16 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Float, UniqueConstraint
+from .base_model import BaseModel
+from .annotations import IDPK, CreatedAt
+
+
+class AnalysisCacheModel(BaseModel):
+    __tablename__ = "analysis_cache"
+    __table_args__ = (UniqueConstraint("content_hash", "model_version"),)
+
+    id: Mapped[IDPK]
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    model_version: Mapped[str] = mapped_column(String(255), nullable=False)
+    prediction: Mapped[str] = mapped_column(String(255), nullable=False)
+    confidence: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[CreatedAt]
@@ -9,7 +9,7 @@ class AnalysisResultModel(BaseModel):
 
     id: Mapped[IDPK]
     video_id: Mapped[Integer] = mapped_column(ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
-    task_id: Mapped[String] = mapped_column(String(100), nullable=False)
+    task_id: Mapped[String] = mapped_column(String(100), nullable=False, index=True, unique=True)
     prediction: Mapped[String] = mapped_column(String(255), nullable=False)
     confidence: Mapped[Float] = mapped_column(Float,nullable=False)
     created_at: Mapped[CreatedAt]
\ No newline at end of file
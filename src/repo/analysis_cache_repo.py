@@ -0,0 +1,60 @@
+from contextlib import AbstractAsyncContextManager
+from typing import Callable, List, TypeVar, Type
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from src.schemas.analysis_cache_schema import AnalysisCacheCreate, AnalysisCacheResponse
+from src.utils.model_adapter import model_to_schema
+from src.models.analysis_cache_model import AnalysisCacheModel
+from src.models.base_model import BaseModel
+from src.usecases.repository import Repository
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.connections.database.postgres_connection import postgres
+
+
+T = TypeVar("T", bound=BaseModel)
+
+class AnalysisCacheRepository(Repository):
+    """Repository for cached analysis results."""
+
+    def __init__(self, connection_pool: Callable[..., AbstractAsyncContextManager[AsyncSession]], model: Type[T]) -> None:
+        self.connection_pool = connection_pool
+        self.model = model
+
+    async def create(self, obj: AnalysisCacheCreate) -> None:
+        """Store a cache entry; an existing entry for the same hash and version is kept."""
+        async with self.connection_pool() as session:
+            query = insert(self.model).values(**obj.dict()).on_conflict_do_nothing(
+                index_elements=["content_hash", "model_version"]
+            )
+            await session.execute(query)
+            await session.commit()
+
+    async def get(self, obj_id: int) -> AnalysisCacheResponse:
+        """Retrieve a cache entry by ID."""
+        async with self.connection_pool() as session:
+            entry = await session.get(self.model, obj_id)
+            if entry:
+                return model_to_schema(entry, AnalysisCacheResponse)
+            return None
+
+    async def get_by_fields(self, **kwargs) -> AnalysisCacheResponse:
+        """Retrieve a cache entry by specific fields."""
+        async with self.connection_pool() as session:
+            query = select(self.model).filter_by(**kwargs)
+            result = await session.execute(query)
+            entry = result.scalars().first()
+            if entry:
+                return model_to_schema(entry, AnalysisCacheResponse)
+            return None
+
+    async def get_all_by_fields(self, **kwargs) -> List[AnalysisCacheResponse]:
+        """Retrieve cache entries by specific fields."""
+        async with self.connection_pool() as session:
+            query = select(self.model).filter_by(**kwargs)
+            result = await session.execute(query)
+            entries = result.scalars().all()
+            return [model_to_schema(entry, AnalysisCacheResponse) for entry in entries]
+
+
+analysis_cache_repository = AnalysisCacheRepository(postgres.connection_pool_factory(), AnalysisCacheModel)
@@ -1,7 +1,7 @@
 from contextlib import AbstractAsyncContextManager
 from typing import Callable, List, TypeVar, Type
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from src.schemas.analysis_result_schema import AnalysisResultCreate, AnalysisResultUpdate, AnalysisResultResponse
 from src.utils.model_adapter import model_to_schema
 from src.models.analysis_result_model import AnalysisResultModel
@@ -29,6 +29,12 @@ class AnalysisResultRepository(Repository):
             await session.refresh(analysis_result)
             return model_to_schema(analysis_result, AnalysisResultResponse)
     
+    async def create_many(self, objs: List[AnalysisResultCreate]) -> None:
+        """Create several analysis results with a single INSERT."""
+        async with self.connection_pool() as session:
+            await session.execute(insert(self.model), [obj.dict() for obj in objs])
+            await session.commit()
+    
     async def get(self, obj_id: int) -> AnalysisResultResponse:
         """Retrieve an analysis result by ID."""
         async with self.connection_pool() as session:
@@ -84,6 +90,14 @@ class AnalysisResultRepository(Repository):
             result = await session.execute(query)
             analysis_results = result.scalars().all()
             return [model_to_schema(analysis_result, AnalysisResultResponse) for analysis_result in analysis_results]
+
+    async def get_all_by_task_ids(self, task_ids: List[str]) -> List[AnalysisResultResponse]:
+        """Retrieve the analysis results for the given task IDs."""
+        async with self.connection_pool() as session:
+            query = select(self.model).where(self.model.task_id.in_(task_ids))
+            result = await session.execute(query)
+            analysis_results = result.scalars().all()
+            return [model_to_schema(analysis_result, AnalysisResultResponse) for analysis_result in analysis_results]
         
 
 analysis_result_repository = AnalysisResultRepository(postgres.connection_pool_factory(), AnalysisResultModel)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from contextlib import AbstractAsyncContextManager
 from typing import Callable, List, TypeVar, Type
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from src.schemas.video_schema import VideoCreate, VideoUpdate, VideoResponse
 from src.utils.model_adapter import model_to_schema
 from src.models.video_model import VideoModel
@@ -29,6 +29,15 @@ class VideoRepository(Repository):
             await session.refresh(video)
             return model_to_schema(video, VideoResponse)
     
+    async def create_many(self, objs: List[VideoCreate]) -> List[VideoResponse]:
+        """Create several videos with a single INSERT."""
+        async with self.connection_pool() as session:
+            query = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+            result = await session.scalars(query, [obj.dict() for obj in objs])
+            videos = result.all()
+            await session.commit()
+            return [model_to_schema(video, VideoResponse) for video in videos]
+    
     async def get(self, obj_id: int) -> VideoResponse:
         """Retrieve a video by ID."""
         async with self.connection_pool() as session:
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from .mixins.id_mixin import IDMixin
+from .mixins.time_mixin import CreatedAtMixin
+
+
+class AnalysisCacheBase(BaseModel):
+    """
+    Base schema for a cached analysis result.
+    """
+    content_hash: str = Field(..., description="SHA-256 of the uploaded video content")
+    model_version: str = Field(..., description="Version of the inference pipeline that produced the result")
+    prediction: str = Field(..., description="Prediction result of the analysis")
+    confidence: float = Field(..., description="Confidence level of the prediction")
+
+    class Config:
+        from_attributes = True
+
+
+class AnalysisCacheCreate(AnalysisCacheBase):
+    """
+    Schema for creating a new cache entry.
+    """
+    pass
+
+
+class AnalysisCacheResponse(AnalysisCacheBase, IDMixin, CreatedAtMixin):
+    """
+    Schema for responding with cache entry details.
+    """
+    pass
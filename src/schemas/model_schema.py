@@ -1,16 +1,44 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Generic, TypeVar, Any
+from typing import Optional, List, Generic, TypeVar, Any, Dict
 
 
 T = TypeVar(name="Schemas", bound=Any)
 
+class ModelProgressSchema(BaseModel):
+    stage: Optional[str] = Field(None, description="Current pipeline stage (extracting, classifying)")
+    frames_decoded: int = Field(0, description="Number of sampled frames decoded so far")
+    features_extracted: int = Field(0, description="Number of frames passed through the backbone so far")
+    timings: Dict[str, float] = Field(default_factory=dict, description="Seconds spent in each finished stage")
+
+
 class ModelSchema(BaseModel, Generic[T]):
     status: str = Field(..., description="Status of the model")
     result: Optional[T] = Field(None, description="Result of the model analysis")
     task_id: Optional[str] = Field(None, description="Task ID for tracking the analysis")
+    progress: Optional[ModelProgressSchema] = Field(None, description="Progress of a running analysis")
 
 
 class ModelResultSchema(BaseModel):
     prediction: str = Field(..., description="Prediction result")
     confidence: float = Field(..., description="Confidence level of the prediction")
 
+
+
+class ModelBatchSchema(BaseModel):
+    batch_id: str = Field(..., description="Batch ID for tracking the analyses")
+    status: str = Field(..., description="Aggregate status of the batch")
+    total: int = Field(..., description="Number of videos in the batch")
+    completed: int = Field(0, description="Number of finished analyses")
+    failed: int = Field(0, description="Number of failed analyses")
+    items: List[ModelSchema] = Field(default_factory=list, description="Status of each analysis, in submission order")
+
+
+class ModelQueueSchema(BaseModel):
+    priority_class: str = Field(..., description="Scheduling class (plan and video length)")
+    queue: str = Field(..., description="Celery queue the class is routed to")
+    weight: int = Field(..., description="Relative share of worker capacity")
+    depth: int = Field(0, description="Number of analyses waiting in the queue")
+    samples: int = Field(0, description="Number of recent queue-wait samples")
+    wait_p50: Optional[float] = Field(None, description="Median seconds from dispatch to start")
+    wait_p95: Optional[float] = Field(None, description="95th percentile seconds from dispatch to start")
+    wait_max: Optional[float] = Field(None, description="Longest recent seconds from dispatch to start")
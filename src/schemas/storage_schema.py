@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+
+
+class StorageMetricsSchema(BaseModel):
+    """
+    Schema for the storage executor counters.
+    """
+    max_workers: int = Field(0, description="Threads available for storage calls")
+    queued: int = Field(0, description="Storage calls waiting for a free thread")
+    active: int = Field(0, description="Storage calls running right now")
+    completed: int = Field(0, description="Storage calls finished successfully")
+    failed: int = Field(0, description="Storage calls that raised")
+    peak_queued: int = Field(0, description="Largest queue depth seen since startup")
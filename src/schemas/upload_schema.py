@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class PresignUploadRequest(BaseModel):
+    """
+    Schema for requesting a direct upload to storage.
+    """
+    file_name: str = Field(..., description="Name of the video file")
+    size: int = Field(..., gt=0, description="Size of the video file in bytes")
+
+
+class PresignedPartSchema(BaseModel):
+    """
+    Schema for one presigned part of a multipart upload.
+    """
+    part_number: int = Field(..., description="Part number, starting at 1")
+    url: str = Field(..., description="Presigned URL to PUT the part to")
+
+
+class PresignedUploadSchema(BaseModel):
+    """
+    Schema for responding with presigned upload URL(s).
+    """
+    key: str = Field(..., description="Storage key the video is uploaded under")
+    url: Optional[str] = Field(None, description="Presigned URL to PUT the whole file to (single-part uploads)")
+    upload_id: Optional[str] = Field(None, description="Multipart upload ID (multipart uploads)")
+    part_size: Optional[int] = Field(None, description="Size of every part except the last (multipart uploads)")
+    parts: List[PresignedPartSchema] = Field(default_factory=list, description="Presigned URLs for each part (multipart uploads)")
+    expires_in: int = Field(..., description="Seconds until the URLs expire")
+
+
+class CompletedPartSchema(BaseModel):
+    """
+    Schema for an uploaded part of a multipart upload.
+    """
+    part_number: int = Field(..., description="Part number, starting at 1")
+    etag: str = Field(..., description="ETag header returned by storage for the part")
+
+
+class CompleteUploadRequest(BaseModel):
+    """
+    Schema for finishing a direct upload.
+    """
+    key: str = Field(..., description="Storage key returned by the presign request")
+    upload_id: Optional[str] = Field(None, description="Multipart upload ID, if the upload was multipart")
+    parts: List[CompletedPartSchema] = Field(default_factory=list, description="Uploaded parts, if the upload was multipart")
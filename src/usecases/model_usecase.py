@@ -1,16 +1,28 @@
 from abc import ABC, abstractmethod
 import asyncio
-from typing import AsyncGenerator
-from src.schemas.model_schema import ModelSchema
+import uuid
+from typing import AsyncGenerator, AsyncIterator, BinaryIO, List, Optional, Tuple
+from src.schemas.model_schema import ModelSchema, ModelResultSchema, ModelBatchSchema, ModelQueueSchema
+from src.schemas.user_schema import UserResponse
 from src.schemas.video_schema import VideoCreate
-from src.schemas.analysis_result_schema import AnalysisResultCreate, AnalysisResultResponse, AnalysisResultUpdate
+from src.schemas.upload_schema import CompleteUploadRequest, PresignedUploadSchema
+from src.schemas.analysis_result_schema import AnalysisResultCreate, AnalysisResultResponse
+from src.core.admission.admission_controller import AdmissionController, Reservation, admission_controller
 from src.core.storage.storage import Storage
-from src.core.storage.s3_storage import s3_storage
+from src.core.storage.storage_factory import storage
+from src.core.cache.result_cache import ResultCache, result_cache
+from src.core.config import settings
+from src.core.events.task_events import TaskEventBroker, task_event_broker
+from src.core.metrics.queue_wait import QueueWaitStats, queue_wait_stats
+from src.inference.scheduling import DEFAULT_CLASS, PRIORITY_CLASSES, priority_class, priority_queue, queue_weights
 from src.repo.video_repo import video_repository
 from src.repo.analysis_result_repo import analysis_result_repository
 from .repository import Repository
 from io import BytesIO
-from src.inference.model_inference import ModelInference, model_inference
+from src.inference.model_inference import ModelInference, get_model_inference
+from src.utils.hashing_stream import HashingStream, hash_file
+from src.utils.storage_keys import is_user_key
+from src.utils.video_url import is_allowed_video_url
 
 
 
@@ -20,9 +32,43 @@ class ModelUseCase(ABC):
     """
 
     @abstractmethod
-    async def analyze_video(self, user_id: int, file: BytesIO, file_name: str) -> ModelSchema:
+    async def analyze_video(self, user: UserResponse, file: BytesIO, file_name: str) -> ModelSchema:
         """
         Analyze the given data and return the result.
+        Raises AdmissionRejected, before uploading anything, when the analysis is not admitted.
+        """
+        pass
+
+
+    @abstractmethod
+    async def analyze_video_stream(self, user: UserResponse, chunks: AsyncIterator[bytes], file_name: str) -> ModelSchema:
+        """
+        Analyze a video whose bytes arrive as a stream, uploading them as they come in.
+        """
+        pass
+
+
+    @abstractmethod
+    async def analyze_url(self, user: UserResponse, url: str) -> ModelSchema:
+        """
+        Analyze a video the user already stored with us, or one on an allowed host.
+        Raises ValueError for any other URL.
+        """
+        pass
+
+
+    @abstractmethod
+    async def presign_upload(self, file_name: str, size: int) -> PresignedUploadSchema:
+        """
+        Issue presigned URL(s) for uploading a video straight to storage.
+        """
+        pass
+
+
+    @abstractmethod
+    async def complete_upload(self, user: UserResponse, upload: CompleteUploadRequest) -> ModelSchema:
+        """
+        Finish a direct upload, register the video and start its analysis.
         """
         pass
 
@@ -35,12 +81,79 @@ class ModelUseCase(ABC):
         pass
 
 
+    @abstractmethod
+    async def analyze_batch(self, user: UserResponse, files: List[Tuple[BinaryIO, str]], urls: List[str]) -> ModelBatchSchema:
+        """
+        Analyze many uploaded files and/or video URLs as one batch.
+        Raises ValueError, before uploading anything, if a URL is not allowed, and
+        AdmissionTooLarge if the videos to analyze exceed the user's in-flight limit.
+        """
+        pass
+
+
+    @abstractmethod
+    async def get_batch(self, user: UserResponse, batch_id: str) -> ModelBatchSchema:
+        """
+        Get the aggregate status of one of the user's batches.
+        """
+        pass
+
+
+    @abstractmethod
+    def stream_result(self, task_id: str) -> AsyncIterator[Optional[ModelSchema]]:
+        """
+        Yield the task's current state and every later change until it finishes.
+        None is yielded when nothing happened for a heartbeat interval.
+        """
+        pass
+
+
+    @abstractmethod
+    async def get_queues(self) -> List[ModelQueueSchema]:
+        """
+        Get the depth and recent queue-wait latency of every scheduling class.
+        """
+        pass
+
+
+TERMINAL_STATUSES = {"success", "failed", "error"}
+
+
+def stored_result(task_id: str, stored: AnalysisResultResponse) -> ModelSchema:
+    return ModelSchema(
+        status="success",
+        result=ModelResultSchema(prediction=stored.prediction, confidence=stored.confidence),
+        task_id=task_id,
+    )
+
+
+def batch_summary(batch_id: str, items: List[ModelSchema]) -> ModelBatchSchema:
+    completed = sum(item.status == "success" for item in items)
+    failed = sum(item.status in ("failed", "error") for item in items)
+    if completed == len(items):
+        status = "success"
+    elif completed + failed == len(items):
+        status = "failed" if completed == 0 else "partial"
+    elif all(item.status == "pending" for item in items):
+        status = "pending"
+    else:
+        status = "processing"
+    return ModelBatchSchema(
+        batch_id=batch_id,
+        status=status,
+        total=len(items),
+        completed=completed,
+        failed=failed,
+        items=items,
+    )
+
+
 class ModelUseCaseImpl(ModelUseCase):
     """
     Implementation of model use cases.
     """
 
-    def __init__(self, storage: Storage, video_repository: Repository, analysis_result_repository: Repository, model_inference: ModelInference):
+    def __init__(self, storage: Storage, video_repository: Repository, analysis_result_repository: Repository, model_inference: ModelInference, result_cache: ResultCache, task_events: TaskEventBroker, queue_wait_stats: QueueWaitStats, admission: AdmissionController):
         """
         Initialize the model use case with storage and repositories.
         """
@@ -48,23 +161,218 @@ class ModelUseCaseImpl(ModelUseCase):
         self.video_repository = video_repository
         self.analysis_result_repository = analysis_result_repository
         self.model_inference = model_inference
+        self.result_cache = result_cache
+        self.task_events = task_events
+        self.queue_wait_stats = queue_wait_stats
+        self.admission = admission
 
     
-    async def analyze_video(self, user_id: int, file: BytesIO, file_name: str) -> ModelSchema:
-        url = await self.storage.upload(file, file_name)
-        video = VideoCreate(user_id=user_id, file_url=url)
-        await self.video_repository.create(video)
-        return await asyncio.to_thread(self.model_inference.analyze_video, url)
+    async def analyze_video(self, user: UserResponse, file: BytesIO, file_name: str) -> ModelSchema:
+        content_hash, size = await asyncio.to_thread(hash_file, file)
+        cached = await self._from_cache(content_hash)
+        if cached:
+            await self._store_hits(user, [(self.storage.object_url(file_name), cached)])
+            return cached
+        async with self.admission.reserve(user) as reservation:
+            url = await self.storage.upload(file, file_name)
+            return await self._dispatch(user, url, content_hash, size, reservation)
+
+    async def analyze_video_stream(self, user: UserResponse, chunks: AsyncIterator[bytes], file_name: str) -> ModelSchema:
+        async with self.admission.reserve(user) as reservation:
+            # A streamed body can only be hashed while it is being uploaded.
+            stream = HashingStream(chunks)
+            url = await self.storage.upload_stream(stream, file_name)
+            video = await self.video_repository.create(VideoCreate(user_id=user.id, file_url=url))
+            cached = await self._from_cache(stream.hexdigest())
+            if cached:
+                await self.analysis_result_repository.create(AnalysisResultCreate(
+                    video_id=video.id,
+                    task_id=cached.task_id,
+                    prediction=cached.result.prediction,
+                    confidence=cached.result.confidence,
+                ))
+                return cached
+            return await self._dispatch(user, url, stream.hexdigest(), stream.size, reservation, video.id)
+
+    async def analyze_url(self, user: UserResponse, url: str) -> ModelSchema:
+        self._check_video_url(user, url)
+        async with self.admission.reserve(user) as reservation:
+            return await self._dispatch(user, url, None, None, reservation)
+
+    async def presign_upload(self, file_name: str, size: int) -> PresignedUploadSchema:
+        return PresignedUploadSchema(**await self.storage.presign_upload(file_name, size))
+
+    async def complete_upload(self, user: UserResponse, upload: CompleteUploadRequest) -> ModelSchema:
+        async with self.admission.reserve(user) as reservation:
+            parts = [(part.part_number, part.etag) for part in upload.parts]
+            url = await self.storage.complete_upload(upload.key, upload.upload_id, parts)
+            return await self._dispatch(user, url, None, None, reservation)
+
+    def _check_video_url(self, user: UserResponse, url: str) -> None:
+        """
+        Only the user's own stored videos and http(s) URLs of allowed hosts reach the worker.
+        """
+        key = self.storage.key_for(url)
+        if key is not None:
+            if not is_user_key(user.email, key):
+                raise ValueError("Video does not belong to this user")
+        elif not is_allowed_video_url(url, settings.analysis_url_allowed_hosts):
+            raise ValueError(f"Video URL is not allowed: {url}")
+
+    def _priority_class(self, user: UserResponse, size: Optional[int]) -> str:
+        return priority_class(user.subscription_plan, user.subscription_expiry, size, settings)
+
+    async def _from_cache(self, content_hash: Optional[str]) -> Optional[ModelSchema]:
+        """
+        Complete an analysis from the result cache if the same content was analyzed before.
+        """
+        if not content_hash:
+            return None
+        cached = await self.result_cache.get(content_hash, settings.analysis_version())
+        if not cached:
+            return None
+        return await asyncio.to_thread(self.model_inference.complete_from_cache, cached)
+
+    async def _store_hits(self, user: UserResponse, hits: List[Tuple[str, ModelSchema]]) -> None:
+        """
+        Record analyses answered from the cache in videos and analysis_results.
+
+        The video is not uploaded again, so its row points at the key it was
+        submitted under. The result row keeps the answer after the Celery
+        result backend has expired it, as it does for dispatched analyses.
+        """
+        if not hits:
+            return
+        videos = await self.video_repository.create_many(
+            [VideoCreate(user_id=user.id, file_url=url) for url, _ in hits]
+        )
+        await self.analysis_result_repository.create_many([
+            AnalysisResultCreate(
+                video_id=video.id,
+                task_id=result.task_id,
+                prediction=result.result.prediction,
+                confidence=result.result.confidence,
+            )
+            for video, (_, result) in zip(videos, hits)
+        ])
+
+    async def _dispatch(self, user: UserResponse, url: str, content_hash: Optional[str], size: Optional[int],
+                        reservation: Reservation, video_id: Optional[int] = None) -> ModelSchema:
+        if video_id is None:
+            video_id = (await self.video_repository.create(VideoCreate(user_id=user.id, file_url=url))).id
+        task_id = str(uuid.uuid4())
+        await reservation.claim([task_id])
+        result = await asyncio.to_thread(
+            self.model_inference.analyze_video, url, video_id, content_hash, self._priority_class(user, size), user.id, task_id
+        )
+        reservation.confirm()
+        return result
 
     async def get_result(self, task_id: str) -> ModelSchema:
+        stored = await self.analysis_result_repository.get_by_fields(task_id=task_id)
+        if stored:
+            return stored_result(task_id, stored)
+
         result = await asyncio.to_thread(self.model_inference.get_result, task_id)
         if not result:
             raise ValueError("Result not found")
         return result
-        
-        
-        
+
+    async def analyze_batch(self, user: UserResponse, files: List[Tuple[BinaryIO, str]], urls: List[str]) -> ModelBatchSchema:
+        for url in urls:
+            self._check_video_url(user, url)
+        semaphore = asyncio.Semaphore(settings.batch_upload_concurrency)
+
+        async def upload(file: BinaryIO, file_name: str) -> str:
+            async with semaphore:
+                return await self.storage.upload(file, file_name)
+
+        hashed = await asyncio.gather(*(asyncio.to_thread(hash_file, file) for file, _ in files))
+        cached = await asyncio.gather(*(self._from_cache(content_hash) for content_hash, _ in hashed))
+
+        # Files analyzed before are answered from the cache without being uploaded.
+        items: List[Optional[ModelSchema]] = list(cached) + [None] * len(urls)
+        misses = [index for index, hit in enumerate(cached) if hit is None]
+
+        async with self.admission.reserve(user, len(misses) + len(urls)) as reservation:
+            uploaded = await asyncio.gather(*(upload(*files[index]) for index in misses))
+            entries = [(url, *hashed[index]) for index, url in zip(misses, uploaded)]
+            entries += [(url, None, None) for url in urls]
+            misses += range(len(files), len(files) + len(urls))
+
+            videos = await self.video_repository.create_many(
+                [VideoCreate(user_id=user.id, file_url=url) for url, _, _ in entries]
+            ) if entries else []
+            task_ids = [str(uuid.uuid4()) for _ in entries]
+            await reservation.claim(task_ids)
+            dispatched = await asyncio.to_thread(self.model_inference.analyze_videos, [
+                (url, video.id, content_hash, self._priority_class(user, size), user.id, task_id)
+                for (url, content_hash, size), video, task_id in zip(entries, videos, task_ids)
+            ])
+            reservation.confirm()
+
+        for index, item in zip(misses, dispatched):
+            items[index] = item
+        await self._store_hits(user, [
+            (self.storage.object_url(files[index][1]), hit) for index, hit in enumerate(cached) if hit is not None
+        ])
+
+        batch_id = await asyncio.to_thread(self.model_inference.save_batch, [item.task_id for item in items], user.id)
+        return batch_summary(batch_id, items)
+
+    async def get_batch(self, user: UserResponse, batch_id: str) -> ModelBatchSchema:
+        task_ids = await asyncio.to_thread(self.model_inference.get_batch_task_ids, batch_id, user.id)
+        if task_ids is None:
+            raise ValueError("Batch not found")
+
+        stored = {
+            result.task_id: result
+            for result in await self.analysis_result_repository.get_all_by_task_ids(task_ids)
+        }
+        unfinished = [task_id for task_id in task_ids if task_id not in stored]
+        fetched = dict(zip(unfinished, await asyncio.to_thread(self.model_inference.get_results, unfinished)))
+        items = [
+            stored_result(task_id, stored[task_id]) if task_id in stored else fetched[task_id]
+            for task_id in task_ids
+        ]
+        return batch_summary(batch_id, items)
+
+    async def stream_result(self, task_id: str) -> AsyncIterator[Optional[ModelSchema]]:
+        async with self.task_events.subscribe(task_id) as events:
+            current = await self.get_result(task_id)
+            yield current
+            if current.status in TERMINAL_STATUSES:
+                return
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + settings.result_stream_timeout
+            while loop.time() < deadline:
+                try:
+                    event = await asyncio.wait_for(events.get(), timeout=settings.result_stream_heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield event
+                if event.status in TERMINAL_STATUSES:
+                    return
+
+    async def get_queues(self) -> List[ModelQueueSchema]:
+        classes = [*PRIORITY_CLASSES, DEFAULT_CLASS]
+        weights = queue_weights(settings)
+        depths = await asyncio.to_thread(self.model_inference.queue_depths, [priority_queue(name) for name in classes])
+        queues = []
+        for name in classes:
+            queue = priority_queue(name)
+            queues.append(ModelQueueSchema(
+                priority_class=name,
+                queue=queue,
+                weight=weights[queue],
+                depth=depths.get(queue, 0),
+                **await self.queue_wait_stats.summary(name),
+            ))
+        return queues
+
 
 async def get_model_use_case() -> AsyncGenerator[ModelUseCase, None]:
-    yield ModelUseCaseImpl(s3_storage, video_repository, analysis_result_repository, model_inference)
+    yield ModelUseCaseImpl(storage, video_repository, analysis_result_repository, get_model_inference(), result_cache, task_event_broker, queue_wait_stats, admission_controller)
 
@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator, List, Optional
+from typing import AsyncGenerator, AsyncIterator, List, Optional
 from src.core.storage.storage import Storage
-from src.core.storage.s3_storage import s3_storage
+from src.core.storage.storage_factory import storage
 from src.schemas.video_schema import VideoCreate, VideoUpdate, VideoResponse
+from src.schemas.storage_schema import StorageMetricsSchema
 from .repository import Repository
 from src.repo.video_repo import video_repository
 from io import BytesIO
@@ -50,6 +51,16 @@ class VideoUseCase(ABC):
         """Upload a video file to storage and return the URL."""
         pass
 
+    @abstractmethod
+    async def upload_video_stream(self, user_id: int, chunks: AsyncIterator[bytes], file_name: str) -> VideoResponse:
+        """Stream a video to storage as it arrives and register it."""
+        pass
+
+    @abstractmethod
+    async def get_storage_metrics(self) -> StorageMetricsSchema:
+        """Return queue depth and throughput counters of the storage executor."""
+        pass
+
 
 class VideoUseCaseImpl(VideoUseCase):
     """Implementation of video use cases."""
@@ -84,6 +95,14 @@ class VideoUseCaseImpl(VideoUseCase):
         video = VideoCreate(user_id=user_id, file_url=url)
         return await self.repository.create(video)
 
+    async def upload_video_stream(self, user_id: int, chunks: AsyncIterator[bytes], file_name: str) -> VideoResponse:
+        url = await self.storage.upload_stream(chunks, file_name)
+        video = VideoCreate(user_id=user_id, file_url=url)
+        return await self.repository.create(video)
+
+    async def get_storage_metrics(self) -> StorageMetricsSchema:
+        return StorageMetricsSchema(**self.storage.metrics())
+
 async def get_video_use_case() -> AsyncGenerator[VideoUseCase, None]:
     """Dependency injection for VideoUseCase."""
-    yield VideoUseCaseImpl(repository=video_repository, storage=s3_storage)
\ No newline at end of file
+    yield VideoUseCaseImpl(repository=video_repository, storage=storage)
\ No newline at end of file
@@ -0,0 +1,146 @@
+import os
+import sys
+from typing import List, Optional
+from src.core.config import Settings
+from src.core.logger.logger import logger
+
+
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+def available_cores() -> List[int]:
+    """
+    Return the cores this process may run on.
+    """
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+
+class CpuBudget:
+    """
+    Splits the cores of a box between the processes of one role.
+
+    Every process of the role gets intra_op_threads threads (by default an even
+    share of the cores), so gunicorn workers and Celery pool children running
+    side by side don't each start one thread per core. With pin, process
+    index i is also restricted to its own slice of the cores.
+    """
+
+    def __init__(self, cores: List[int], processes: int = 1, intra_op_threads: int = 0,
+                 interop_threads: int = 1, opencv_threads: int = 1, pin: bool = False):
+        self.cores = cores
+        self.processes = max(1, processes)
+        self._intra_op_threads = intra_op_threads
+        self.interop_threads = interop_threads
+        self.opencv_threads = opencv_threads
+        self.pin = pin
+
+
+    @classmethod
+    def for_worker(cls, settings: Settings, processes: int) -> "CpuBudget":
+        return cls(
+            budget_cores(settings),
+            processes,
+            intra_op_threads=settings.inference_threads,
+            interop_threads=settings.inference_interop_threads,
+            opencv_threads=settings.opencv_threads,
+            pin=settings.cpu_pinning,
+        )
+
+
+    @classmethod
+    def for_api(cls, settings: Settings, processes: int) -> "CpuBudget":
+        return cls(
+            budget_cores(settings),
+            processes,
+            intra_op_threads=settings.api_threads,
+            interop_threads=1,
+            opencv_threads=1,
+        )
+
+
+    def intra_op_threads(self) -> int:
+        return self._intra_op_threads or max(1, len(self.cores) // self.processes)
+
+
+    def cores_for(self, index: Optional[int]) -> List[int]:
+        if not self.pin or index is None:
+            return self.cores
+        count = min(self.intra_op_threads(), len(self.cores))
+        start = (index * count) % len(self.cores)
+        return [self.cores[(start + offset) % len(self.cores)] for offset in range(count)]
+
+
+    def apply(self, role: str, index: Optional[int] = None) -> dict:
+        """
+        Configure the current process and log the effective settings.
+
+        Thread pools of libraries imported later pick the limit up from the
+        environment; torch and OpenCV are configured directly when loaded.
+        """
+        threads = self.intra_op_threads()
+        for name in THREAD_ENV_VARS:
+            os.environ[name] = str(threads)
+
+        cores = self.cores_for(index)
+        if self.pin and index is not None and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cores)
+
+        config = {
+            "role": role,
+            "pid": os.getpid(),
+            "index": index,
+            "processes": self.processes,
+            "cores": len(cores),
+            "pinned": self.pin and index is not None,
+            "intra_op_threads": threads,
+        }
+
+        torch = sys.modules.get("torch")
+        if torch is not None:
+            torch.set_num_threads(threads)
+            try:
+                torch.set_num_interop_threads(self.interop_threads)
+            except RuntimeError:
+                # Only settable once, before any inter-op work has started.
+                pass
+            config["torch_threads"] = torch.get_num_threads()
+            config["torch_interop_threads"] = torch.get_num_interop_threads()
+
+        cv2 = sys.modules.get("cv2")
+        if cv2 is not None:
+            cv2.setNumThreads(self.opencv_threads)
+            config["opencv_threads"] = cv2.getNumThreads()
+
+        logger.info("CPU budget: " + ", ".join(f"{key}={value}" for key, value in config.items()))
+        return config
+
+
+def budget_cores(settings: Settings) -> List[int]:
+    cores = available_cores()
+    if settings.cpu_budget_cores:
+        cores = cores[:settings.cpu_budget_cores]
+    return cores
+
+
+_budget: Optional[CpuBudget] = None
+
+
+def set_cpu_budget(budget: CpuBudget) -> None:
+    global _budget
+    _budget = budget
+
+
+def get_cpu_budget() -> Optional[CpuBudget]:
+    return _budget
+
+
+def inference_threads(settings: Settings) -> int:
+    """
+    Threads an inference session in this process may use.
+    """
+    if _budget is not None:
+        return _budget.intra_op_threads()
+    return settings.inference_threads
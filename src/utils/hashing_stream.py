@@ -0,0 +1,38 @@
+import hashlib
+from typing import AsyncIterator, BinaryIO, Tuple
+
+
+def hash_file(file: BinaryIO, algorithm: str = "sha256", chunk_size: int = 1024 * 1024) -> Tuple[str, int]:
+    """
+    Hash a seekable file from its current position and rewind it.
+
+    Returns the hex digest and the number of bytes hashed.
+    """
+    start = file.tell()
+    digest = hashlib.new(algorithm)
+    size = 0
+    while chunk := file.read(chunk_size):
+        digest.update(chunk)
+        size += len(chunk)
+    file.seek(start)
+    return digest.hexdigest(), size
+
+
+class HashingStream:
+    """
+    Async iterator wrapper that hashes every chunk passed through it.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], algorithm: str = "sha256"):
+        self.chunks = chunks
+        self.size = 0
+        self._hash = hashlib.new(algorithm)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.chunks:
+            self._hash.update(chunk)
+            self.size += len(chunk)
+            yield chunk
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
@@ -0,0 +1,56 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class InstrumentedExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor that counts queued, running and finished jobs.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = ""):
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._peak_queued = 0
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        try:
+            return super().submit(self._run, fn, *args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            raise
+
+    def _run(self, fn, *args, **kwargs):
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        failed = True
+        try:
+            result = fn(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self._max_workers,
+                "queued": self._queued,
+                "active": self._active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "peak_queued": self._peak_queued,
+            }
@@ -0,0 +1,25 @@
+from pathlib import PurePosixPath
+
+
+def user_key(email: str, file_name: str) -> str:
+    """
+    Storage key for a client-supplied file name: its base name, directly under the user's prefix.
+    Raises ValueError if the name has no usable base name.
+    """
+    name = PurePosixPath(file_name or "").name
+    if name in ("", ".."):
+        raise ValueError("Invalid file name")
+    return f"{email}/{name}"
+
+
+def is_user_key(email: str, key: str) -> bool:
+    """
+    Whether a storage key is one user_key() gives for this user: a single safe base name under their prefix.
+    """
+    prefix = f"{email}/"
+    if not key.startswith(prefix):
+        return False
+    try:
+        return user_key(email, key[len(prefix):]) == key
+    except ValueError:
+        return False
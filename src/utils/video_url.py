@@ -0,0 +1,14 @@
+from typing import Iterable
+from urllib.parse import urlparse
+
+
+def is_allowed_video_url(url: str, allowed_hosts: Iterable[str]) -> bool:
+    """
+    Whether a video URL outside our storage may be opened: http(s) to one of the allowed hosts.
+    """
+    try:
+        parsed = urlparse(url)
+        host = parsed.hostname
+    except ValueError:
+        return False
+    return parsed.scheme in ("http", "https") and host is not None and host in {h.lower() for h in allowed_hosts}
@@ -0,0 +1,42 @@
+import os
+
+# Settings() is built at import time; give the required fields dummy values
+# so modules can be imported without a .env file or running services.
+for name, value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "JWT_SECRET": "test",
+    "S3_ACCESS_KEY": "test",
+    "S3_SECRET_KEY": "test",
+    "S3_BUCKET_NAME": "test-bucket",
+    "S3_REGION_NAME": "us-east-1",
+}.items():
+    os.environ.setdefault(name, value)
+
+import cv2
+import numpy as np
+import pytest
+
+
+def write_video(path: str, frames: int = 50, fps: int = 10, size=(64, 48)) -> str:
+    """
+    Write a small MJPG clip whose frame i is filled with grey level 5 * i.
+    """
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), 5 * i, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def frame_index(frame: np.ndarray) -> int:
+    return int(round(float(frame.mean()) / 5))
+
+
+@pytest.fixture
+def sample_video(tmp_path) -> str:
+    return write_video(str(tmp_path / "sample.avi"))
@@ -0,0 +1,91 @@
+import itertools
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+from src.schemas.model_schema import ModelResultSchema, ModelSchema
+
+
+def make_user(user_id: int = 1, plan: str = "free", email: Optional[str] = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=user_id,
+        email=email or f"user{user_id}@example.com",
+        subscription_plan=plan,
+        subscription_expiry=None,
+    )
+
+
+class FakeRepository:
+    """
+    In-memory stand-in for the async SQLAlchemy repositories.
+    """
+
+    def __init__(self):
+        self.rows: List[SimpleNamespace] = []
+        self._ids = itertools.count(1)
+
+    async def create(self, obj):
+        row = SimpleNamespace(id=next(self._ids), **obj.model_dump())
+        self.rows.append(row)
+        return row
+
+    async def create_many(self, objs):
+        return [await self.create(obj) for obj in objs]
+
+    async def get_by_fields(self, **fields):
+        return next((row for row in self.rows if all(getattr(row, k) == v for k, v in fields.items())), None)
+
+    async def get_all_by_task_ids(self, task_ids):
+        return [row for row in self.rows if row.task_id in task_ids]
+
+
+class FakeInference:
+    """
+    Records dispatched analyses instead of sending them to Celery.
+    """
+
+    def __init__(self):
+        self.dispatched: List[tuple] = []
+        self.batches: Dict[str, list] = {}
+        self.results: Dict[str, ModelSchema] = {}
+        self.result_lookups: List[List[str]] = []
+        self._ids = itertools.count(1)
+
+    def analyze_video(self, *video) -> ModelSchema:
+        return self.analyze_videos([video])[0]
+
+    def analyze_videos(self, videos) -> List[ModelSchema]:
+        results = []
+        for video in videos:
+            self.dispatched.append(tuple(video))
+            task_id = video[5] if len(video) > 5 and video[5] else f"task-{next(self._ids)}"
+            results.append(ModelSchema(status="pending", task_id=task_id))
+        return results
+
+    def complete_from_cache(self, result: ModelResultSchema) -> ModelSchema:
+        return ModelSchema(status="success", result=result, task_id=f"cached-{next(self._ids)}")
+
+    def save_batch(self, task_ids, owner_id: int) -> str:
+        batch_id = f"batch-{next(self._ids)}"
+        self.batches[batch_id] = (owner_id, list(task_ids))
+        return batch_id
+
+    def get_batch_task_ids(self, batch_id, owner_id: int):
+        owner, task_ids = self.batches.get(batch_id, (None, None))
+        return task_ids if owner == owner_id else None
+
+    def get_result(self, task_id: str) -> ModelSchema:
+        return self.results.get(task_id, ModelSchema(status="pending", task_id=task_id))
+
+    def get_results(self, task_ids) -> List[ModelSchema]:
+        self.result_lookups.append(list(task_ids))
+        return [self.get_result(task_id) for task_id in task_ids]
+
+
+class FakeResultCache:
+    def __init__(self, entries: Optional[Dict[str, ModelResultSchema]] = None):
+        self.entries = entries or {}
+
+    async def get(self, content_hash: str, model_version: str) -> Optional[ModelResultSchema]:
+        return self.entries.get(content_hash)
+
+    async def set(self, content_hash: str, model_version: str, result: ModelResultSchema) -> None:
+        self.entries[content_hash] = result
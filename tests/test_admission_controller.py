@@ -0,0 +1,194 @@
+import asyncio
+import json
+import fakeredis.aioredis
+import pytest
+from src.core.admission import admission_controller as admission_module
+from src.core.admission.admission_controller import AdmissionRejected, AdmissionTooLarge, RedisAdmissionController
+from src.core.app.handlers import admission_rejected_handler, admission_too_large_handler
+from src.core.cache.keys import in_flight_key
+from src.core.config import settings
+from tests.fakes import make_user
+
+
+LIMITS = settings.model_copy(update={
+    "admission_control": True,
+    "admission_max_in_flight_free": 2,
+    "admission_max_in_flight_paid": 4,
+    "admission_overload_queue_depth": 10,
+    "admission_max_queue_depth": 20,
+    "admission_retry_after": 7,
+    "admission_depth_cache_ms": 1000,
+    "admission_depth_max_age_ms": 5000,
+})
+
+FREE = make_user(1, plan="free")
+PAID = make_user(2, plan="pro")
+
+
+class StubDepth:
+    def __init__(self, depth: int = 0):
+        self.depth = depth
+        self.calls = 0
+
+    def __call__(self) -> int:
+        self.calls += 1
+        if isinstance(self.depth, Exception):
+            raise self.depth
+        return self.depth
+
+
+def make_controller(depth: StubDepth) -> RedisAdmissionController:
+    return RedisAdmissionController(fakeredis.aioredis.FakeRedis(decode_responses=True), LIMITS, depth)
+
+
+async def in_flight(controller: RedisAdmissionController, user) -> set:
+    return set(await controller.client.zrange(in_flight_key(user.id), 0, -1))
+
+
+def test_claimed_tasks_stay_in_flight_and_unused_slots_are_released():
+    async def scenario():
+        controller = make_controller(StubDepth())
+        async with controller.reserve(FREE, 2) as reservation:
+            assert len(await in_flight(controller, FREE)) == 2
+            await reservation.claim(["task-1"])
+            members = await in_flight(controller, FREE)
+            assert "task-1" in members and len(members) == 2
+            reservation.confirm()
+        return await in_flight(controller, FREE)
+
+    assert asyncio.run(scenario()) == {"task-1"}
+
+
+def test_task_finishing_before_dispatch_returns_keeps_its_slot_free():
+    async def scenario():
+        controller = make_controller(StubDepth())
+        async with controller.reserve(FREE) as reservation:
+            await reservation.claim(["task-1"])
+            # The worker's task_postrun handler runs before apply_async returns.
+            await controller.client.zrem(in_flight_key(FREE.id), "task-1")
+            reservation.confirm()
+        return await in_flight(controller, FREE)
+
+    assert asyncio.run(scenario()) == set()
+
+
+def test_failed_dispatch_gives_every_slot_back():
+    async def scenario():
+        controller = make_controller(StubDepth())
+        with pytest.raises(ConnectionError):
+            async with controller.reserve(FREE, 2) as reservation:
+                await reservation.claim(["task-1", "task-2"])
+                raise ConnectionError("broker down")
+        return await in_flight(controller, FREE)
+
+    assert asyncio.run(scenario()) == set()
+
+
+def test_in_flight_limit_per_plan():
+    async def scenario():
+        controller = make_controller(StubDepth())
+        async with controller.reserve(FREE, 2) as reservation:
+            await reservation.claim(["a", "b"])
+            reservation.confirm()
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.reserve(FREE):
+                pass
+        assert rejected.value.retry_after == 7
+        assert len(await in_flight(controller, FREE)) == 2
+
+        async with controller.reserve(PAID, 4):
+            pass
+
+    asyncio.run(scenario())
+
+
+def test_request_above_the_limit_is_not_retryable():
+    async def scenario():
+        # Even while the queue is full: waiting would not make it fit.
+        controller = make_controller(StubDepth(50))
+        with pytest.raises(AdmissionTooLarge) as too_large:
+            async with controller.reserve(PAID, 5):
+                pass
+        assert too_large.value.limit == 4
+        return await in_flight(controller, PAID)
+
+    assert asyncio.run(scenario()) == set()
+    response = asyncio.run(admission_too_large_handler(None, AdmissionTooLarge("too many", 4)))
+    assert response.status_code == 413
+    assert "Retry-After" not in response.headers
+
+
+@pytest.mark.parametrize("depth, free_admitted, paid_admitted", [
+    (9, True, True),
+    (10, False, True),
+    (19, False, True),
+    (20, False, False),
+])
+def test_free_tier_is_shed_first(depth, free_admitted, paid_admitted):
+    async def admitted(controller, user) -> bool:
+        try:
+            async with controller.reserve(user):
+                return True
+        except AdmissionRejected:
+            return False
+
+    async def scenario():
+        controller = make_controller(StubDepth(depth))
+        return await admitted(controller, FREE), await admitted(controller, PAID)
+
+    assert asyncio.run(scenario()) == (free_admitted, paid_admitted)
+
+
+def test_depth_is_cached_and_failures_expire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(admission_module.time, "monotonic", lambda: clock[0])
+    depth = StubDepth(15)
+
+    async def free_admitted(controller) -> bool:
+        try:
+            async with controller.reserve(FREE):
+                return True
+        except AdmissionRejected:
+            return False
+
+    async def scenario():
+        controller = make_controller(depth)
+        results = [await free_admitted(controller), await free_admitted(controller)]
+        assert depth.calls == 1
+
+        depth.depth = ConnectionError("broker down")
+        clock[0] += 2
+        results.append(await free_admitted(controller))
+        clock[0] += 4
+        results.append(await free_admitted(controller))
+        assert depth.calls == 3
+
+        depth.depth = 15
+        clock[0] += 2
+        results.append(await free_admitted(controller))
+        return results
+
+    # The last good depth is trusted for 5 seconds, then the depth is unknown and nothing is shed.
+    assert asyncio.run(scenario()) == [False, False, False, True, False]
+
+
+def test_rejections_become_429_with_retry_after():
+    rejected = AdmissionRejected("Service is overloaded, free-tier analyses are paused", 30)
+
+    response = asyncio.run(admission_rejected_handler(None, rejected))
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+    assert json.loads(response.body) == {"detail": "Service is overloaded, free-tier analyses are paused"}
+
+
+def test_worker_releases_the_slot_of_a_finished_task(monkeypatch):
+    from worker import admission as worker_admission
+    client = fakeredis.FakeRedis(decode_responses=True)
+    client.zadd(in_flight_key(FREE.id), {"task-1": 1, "task-2": 1})
+    monkeypatch.setattr(worker_admission, "get_redis", lambda: client)
+
+    worker_admission.release_in_flight(task_id="task-1", kwargs={"user_id": FREE.id})
+    worker_admission.release_in_flight(task_id="task-2", kwargs={})
+
+    assert client.zrange(in_flight_key(FREE.id), 0, -1) == ["task-2"]
@@ -0,0 +1,116 @@
+import asyncio
+import socket
+import threading
+import boto3
+import pytest
+from moto.server import ThreadedMotoServer
+from src.core.storage.async_s3_storage import AsyncS3Storage
+
+pytest.importorskip("aiobotocore")
+
+
+PART_SIZE = 5 * 1024 * 1024
+BUCKET = "test-bucket"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def endpoint_url():
+    # aiobotocore talks HTTP through aiohttp, which mock_aws cannot intercept.
+    port = free_port()
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port)
+    server.start()
+    yield f"http://127.0.0.1:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def s3(endpoint_url):
+    client = boto3.client(
+        "s3", region_name="us-east-1", endpoint_url=endpoint_url,
+        aws_access_key_id="test", aws_secret_access_key="test",
+    )
+    client.create_bucket(Bucket=BUCKET)
+    yield client
+    for entry in client.list_objects_v2(Bucket=BUCKET).get("Contents", []):
+        client.delete_object(Bucket=BUCKET, Key=entry["Key"])
+    for upload in client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []):
+        client.abort_multipart_upload(Bucket=BUCKET, Key=upload["Key"], UploadId=upload["UploadId"])
+    client.delete_bucket(Bucket=BUCKET)
+
+
+def make_storage(endpoint_url: str) -> AsyncS3Storage:
+    return AsyncS3Storage(
+        BUCKET, access_key="test", secret_key="test", endpoint_url=endpoint_url,
+        part_size=PART_SIZE, upload_concurrency=2,
+    )
+
+
+def payload(size: int) -> bytes:
+    return bytes(i % 251 for i in range(size))
+
+
+class Reader:
+    """
+    Blocking file-like object handing out at most size bytes per read, like a spooled upload.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.offset = 0
+        self.threads = set()
+
+    def read(self, size: int) -> bytes:
+        self.threads.add(threading.get_ident())
+        chunk = bytes(self.data[self.offset:self.offset + size])
+        self.offset += len(chunk)
+        return chunk
+
+
+def test_upload_download_and_exists(s3, endpoint_url):
+    data = payload(2 * PART_SIZE + 7)
+
+    reader = Reader(data)
+
+    async def run():
+        storage = make_storage(endpoint_url)
+        try:
+            url = await storage.upload(reader, "u@example.com/clip.mp4")
+            downloaded = b"".join([chunk async for chunk in storage.download_stream("u@example.com/clip.mp4")])
+            return url, downloaded, await storage.exists("u@example.com/clip.mp4"), await storage.exists("missing.mp4")
+        finally:
+            await storage.close()
+
+    url, downloaded, exists, missing = asyncio.run(run())
+
+    # asyncio.run drives the loop in this thread; every blocking read ran elsewhere.
+    assert reader.threads and threading.get_ident() not in reader.threads
+
+    assert url == f"{endpoint_url}/{BUCKET}/u@example.com/clip.mp4"
+    assert downloaded == data
+    assert (exists, missing) == (True, False)
+    assert s3.head_object(Bucket=BUCKET, Key="u@example.com/clip.mp4")["ETag"].endswith('-3"')
+
+
+def test_failed_stream_aborts_the_multipart_upload(s3, endpoint_url):
+    async def chunks():
+        yield payload(PART_SIZE + 1)
+        raise ConnectionResetError("client went away")
+
+    async def run():
+        storage = make_storage(endpoint_url)
+        try:
+            await storage.upload_stream(chunks(), "u@example.com/broken.mp4")
+        finally:
+            await storage.close()
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(run())
+
+    assert s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+    assert "Contents" not in s3.list_objects_v2(Bucket=BUCKET)
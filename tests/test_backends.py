@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+import torch
+from worker.backends import TorchBackend, exported_path, load_exported, model_name
+from worker.classifier import TransformerClassifier
+from worker.export_models import check_parity, export_onnx, export_torchscript
+
+
+def small_classifier() -> TransformerClassifier:
+    torch.manual_seed(0)
+    model = TransformerClassifier(input_dim=16, seq_len=8, d_model=16, nhead=2, num_layers=1, dim_feedforward=32)
+    model.eval()
+    return model
+
+
+def inputs(batch: int, frames: int, padded: int = 0):
+    features = np.random.default_rng(batch * frames).standard_normal((batch, frames, 16)).astype(np.float32)
+    mask = np.zeros((batch, frames), dtype=bool)
+    if padded:
+        mask[-1, frames - padded:] = True
+    return features, mask
+
+
+def test_torch_backend_takes_and_returns_numpy():
+    model = small_classifier()
+    features, mask = inputs(2, 8, padded=3)
+
+    output = TorchBackend(model)(features, mask)
+
+    assert isinstance(output, np.ndarray)
+    assert output.shape == (2,)
+    with torch.no_grad():
+        expected = model(torch.from_numpy(features), torch.from_numpy(mask)).numpy()
+    np.testing.assert_allclose(output, expected, atol=1e-6)
+
+
+def test_exported_paths():
+    assert model_name("models/best_model.pt") == "best_model"
+    assert exported_path("models/exported", "best_model", "onnx") == "models/exported/best_model.onnx"
+    assert exported_path("models/exported", "best_model", "torchscript") == "models/exported/best_model.ts"
+    with pytest.raises(ValueError):
+        load_exported("model.bin", "tensorrt")
+
+
+def export(backend: str, model, path: str) -> None:
+    tensors = tuple(torch.from_numpy(x) for x in inputs(2, 8, padded=3))
+    if backend == "torchscript":
+        export_torchscript(model, tensors, path)
+    else:
+        export_onnx(model, tensors, path, ["features", "padding_mask"],
+                    {"features": {0: "batch", 1: "frames"}, "padding_mask": {0: "batch", 1: "frames"}})
+
+
+@pytest.mark.parametrize("backend", ["torchscript", "onnx"])
+def test_exported_classifier_matches_eager_for_other_shapes(tmp_path, backend):
+    if backend == "onnx":
+        pytest.importorskip("onnxruntime")
+        pytest.importorskip("onnxscript")
+    model = small_classifier()
+    path = exported_path(str(tmp_path), "classifier", backend)
+
+    export(backend, model, path)
+
+    for batch, frames, padded in [(2, 8, 3), (1, 8, 0), (3, 5, 2)]:
+        assert check_parity(model, path, backend, inputs(batch, frames, padded)) < 1e-4
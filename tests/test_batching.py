@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from worker.batching import PredictBatcher, pad_features
+
+
+def test_pad_features_masks_padded_frames():
+    batch, mask = pad_features([np.ones((3, 4)), np.full((1, 4), 2.0)])
+
+    assert batch.shape == (2, 3, 4)
+    assert batch.dtype == np.float32
+    np.testing.assert_array_equal(batch[1, 0], 2.0)
+    np.testing.assert_array_equal(batch[1, 1:], 0.0)
+    np.testing.assert_array_equal(mask, [[False, False, False], [False, True, True]])
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, model_path, features):
+        self.calls.append((model_path, len(features)))
+        return [(model_path, float(f.sum())) for f in features]
+
+
+def test_concurrent_requests_share_one_call():
+    handler = RecordingHandler()
+    batcher = PredictBatcher(handler, max_batch_size=4, max_wait_ms=1000)
+
+    futures = [batcher.submit("a.pt", np.full((2, 2), i, dtype=np.float32)) for i in range(4)]
+
+    assert [future.result(5) for future in futures] == [("a.pt", 4.0 * i) for i in range(4)]
+    assert handler.calls == [("a.pt", 4)]
+
+
+def test_batches_are_split_by_checkpoint():
+    handler = RecordingHandler()
+    batcher = PredictBatcher(handler, max_batch_size=8, max_wait_ms=100)
+
+    futures = [batcher.submit(path, np.zeros((1, 2))) for path in ("a.pt", "b.pt", "a.pt")]
+
+    assert [future.result(5)[0] for future in futures] == ["a.pt", "b.pt", "a.pt"]
+    assert sorted(handler.calls) == [("a.pt", 2), ("b.pt", 1)]
+
+
+def test_single_request_is_flushed_after_max_wait():
+    handler = RecordingHandler()
+    batcher = PredictBatcher(handler, max_batch_size=16, max_wait_ms=10)
+
+    assert batcher.submit("a.pt", np.ones((1, 1))).result(5) == ("a.pt", 1.0)
+
+
+def test_handler_errors_reach_every_caller():
+    def failing(model_path, features):
+        raise RuntimeError("boom")
+
+    batcher = PredictBatcher(failing, max_batch_size=2, max_wait_ms=1000)
+    futures = [batcher.submit("a.pt", np.zeros((1, 1))) for _ in range(2)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="boom"):
+            future.result(5)
@@ -0,0 +1,28 @@
+from src.core.config import settings
+from worker.celery_app import app
+
+
+def test_long_tasks_are_reserved_one_at_a_time_and_acked_late():
+    assert app.conf.worker_prefetch_multiplier == 1
+    assert app.conf.task_acks_late is True
+    assert app.conf.task_reject_on_worker_lost is True
+
+
+def test_time_limits_fit_inside_the_visibility_timeout():
+    soft, hard = app.conf.task_soft_time_limit, app.conf.task_time_limit
+    assert soft < hard < app.conf.broker_transport_options["visibility_timeout"]
+
+
+def test_pool_children_are_recycled():
+    assert app.conf.worker_max_tasks_per_child == settings.celery_max_tasks_per_child > 0
+    assert app.conf.worker_max_memory_per_child == settings.celery_max_memory_per_child > 0
+
+
+def test_zero_concurrency_means_one_process_per_core():
+    assert settings.celery_concurrency == 0
+    assert app.conf.worker_concurrency is None
+
+
+def test_priority_queues_use_the_weighted_cycle():
+    assert settings.priority_scheduling
+    assert app.conf.broker_transport_options["queue_order_strategy"] == "worker.scheduling:WeightedCycle"
@@ -0,0 +1,67 @@
+import fakeredis
+import pytest
+from kombu import Connection
+from src.inference.celery_model_inference import ModelInferenceImpl, app
+
+
+PROGRESS = {"stage": "extracting", "frames_decoded": 3, "features_extracted": 1, "timings": {}}
+
+
+class CountingRedis(fakeredis.FakeRedis):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    def get(self, name):
+        self.calls.append("get")
+        return super().get(name)
+
+    def mget(self, keys, *args):
+        self.calls.append("mget")
+        return super().mget(keys, *args)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    monkeypatch.setattr(app.backend, "client", CountingRedis())
+    return app.backend
+
+
+@pytest.fixture
+def inference():
+    return ModelInferenceImpl("models/best_model.pt")
+
+
+def test_get_results_reads_all_tasks_at_once(backend, inference):
+    backend.store_result("done", ("FAKE", 0.9), "SUCCESS")
+    backend.store_result("broken", ValueError("bad video"), "FAILURE")
+    backend.store_result("running", PROGRESS, "PROGRESS")
+    backend.client.calls.clear()
+
+    results = inference.get_results(["done", "broken", "running", "queued"])
+
+    assert backend.client.calls == ["mget"]
+    assert [(r.task_id, r.status) for r in results] == [
+        ("done", "success"), ("broken", "failed"), ("running", "processing"), ("queued", "pending"),
+    ]
+    assert results[0].result.prediction == "FAKE" and results[1].result == "bad video"
+    assert results[2].progress.frames_decoded == 3
+    assert inference.get_results([]) == []
+
+
+def test_batches_are_only_visible_to_their_owner(backend, inference):
+    batch_id = inference.save_batch(["a", "b"], owner_id=7)
+
+    assert inference.get_batch_task_ids(batch_id, 7) == ["a", "b"]
+    assert inference.get_batch_task_ids(batch_id, 8) is None
+    assert inference.get_batch_task_ids("unknown", 7) is None
+
+
+def test_queue_depths_count_missing_queues_as_empty(monkeypatch, inference):
+    connection = Connection("memory://")
+    with connection.SimpleQueue("paid_short") as queue:
+        queue.put({"n": 1})
+        queue.put({"n": 2})
+    monkeypatch.setattr(app, "connection_for_read", lambda: Connection("memory://"))
+
+    assert inference.queue_depths(["paid_short", "free_long"]) == {"paid_short": 2, "free_long": 0}
@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+import pytest
+from celery.concurrency.prefork import TaskPool as PreforkPool
+from celery.concurrency.solo import TaskPool as SoloPool
+from celery.concurrency.thread import TaskPool as ThreadPool
+from src.core.config import settings
+from src.utils import cpu_budget
+from src.utils.cpu_budget import CpuBudget, budget_cores, inference_threads
+
+
+CORES = [0, 1, 2, 3, 4, 5, 6, 7]
+
+
+def test_threads_are_an_even_share_of_the_cores():
+    assert CpuBudget(CORES, processes=4).intra_op_threads() == 2
+    assert CpuBudget(CORES, processes=3).intra_op_threads() == 2
+    assert CpuBudget(CORES, processes=16).intra_op_threads() == 1
+    assert CpuBudget(CORES, processes=0).intra_op_threads() == 8
+    assert CpuBudget(CORES, processes=4, intra_op_threads=3).intra_op_threads() == 3
+
+
+def test_pinned_processes_get_disjoint_slices():
+    budget = CpuBudget(CORES, processes=4, pin=True)
+
+    assert [budget.cores_for(index) for index in range(4)] == [[0, 1], [2, 3], [4, 5], [6, 7]]
+
+
+def test_index_past_the_process_count_wraps_around():
+    budget = CpuBudget(CORES, processes=4, pin=True)
+
+    assert budget.cores_for(4) == [0, 1]
+    assert budget.cores_for(5) == [2, 3]
+
+
+def test_oversubscribed_processes_share_cores():
+    budget = CpuBudget([0, 1, 2], processes=5, pin=True)
+
+    assert budget.intra_op_threads() == 1
+    assert [budget.cores_for(index) for index in range(5)] == [[0], [1], [2], [0], [1]]
+
+
+def test_explicit_threads_beyond_the_cores_are_capped_when_pinning():
+    budget = CpuBudget([0, 1, 2, 3], processes=2, intra_op_threads=6, pin=True)
+
+    assert budget.intra_op_threads() == 6
+    assert budget.cores_for(1) == [0, 1, 2, 3]
+
+
+def test_unpinned_processes_may_use_every_core():
+    budget = CpuBudget(CORES, processes=4)
+
+    assert budget.cores_for(2) == CORES
+    assert CpuBudget(CORES, processes=4, pin=True).cores_for(None) == CORES
+
+
+def test_budget_larger_than_the_machine_uses_what_is_available(monkeypatch):
+    monkeypatch.setattr(cpu_budget, "available_cores", lambda: [0, 1])
+
+    assert budget_cores(settings.model_copy(update={"cpu_budget_cores": 64})) == [0, 1]
+    assert budget_cores(settings.model_copy(update={"cpu_budget_cores": 1})) == [0]
+    assert budget_cores(settings.model_copy(update={"cpu_budget_cores": 0})) == [0, 1]
+
+
+def test_apply_sets_thread_environment(monkeypatch):
+    for name in cpu_budget.THREAD_ENV_VARS:
+        monkeypatch.setenv(name, "99")
+    monkeypatch.delitem(cpu_budget.sys.modules, "torch", raising=False)
+    monkeypatch.delitem(cpu_budget.sys.modules, "cv2", raising=False)
+
+    config = CpuBudget(CORES, processes=4, pin=False).apply("test", index=1)
+
+    assert [cpu_budget.os.environ[name] for name in cpu_budget.THREAD_ENV_VARS] == ["2", "2", "2"]
+    assert (config["cores"], config["pinned"], config["intra_op_threads"]) == (8, False, 2)
+
+
+@pytest.mark.parametrize("pool, processes", [(PreforkPool, 4), (ThreadPool, 4), (SoloPool, 1)])
+def test_worker_pools_split_the_budget(monkeypatch, pool, processes):
+    from worker import celery_tasks
+    applied = []
+    monkeypatch.setattr(cpu_budget, "_budget", None)
+    monkeypatch.setattr(cpu_budget, "available_cores", lambda: CORES)
+    monkeypatch.setattr(CpuBudget, "apply", lambda self, role, index=None: applied.append(role))
+
+    celery_tasks.configure_cpu_budget(sender=SimpleNamespace(pool_cls=pool, concurrency=4))
+
+    assert cpu_budget.get_cpu_budget().processes == processes
+    assert inference_threads(settings) == 8 // processes
+    assert applied == ([] if pool is PreforkPool else ["worker"])
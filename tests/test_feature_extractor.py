@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from worker.feature_extractor import FeatureExtractor
+from worker.frame_sampler import FirstSecondsSampler
+from worker.preprocessing import FramePreprocessor
+
+
+class RecordingBackbone:
+    """
+    Stands in for the backbone: one feature per frame, its mean pixel value.
+    """
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        self.batch_sizes.append(len(batch))
+        return batch.mean(axis=(1, 2, 3)).reshape(-1, 1)
+
+
+def make_extractor(max_frames: int = 5, chunk_size: int = 16) -> FeatureExtractor:
+    return FeatureExtractor(
+        FirstSecondsSampler(max_frames=max_frames),
+        FramePreprocessor(size=32, normalize=False),
+        RecordingBackbone(),
+        chunk_size=chunk_size,
+    )
+
+
+def test_extracts_one_feature_per_sampled_frame(sample_video):
+    extractor = make_extractor(max_frames=5)
+
+    features = extractor.extract_features_from_video(sample_video)
+
+    # One frame per second at 10 fps: frames 0, 10, 20, 30 and 40.
+    assert features.shape == (5, 1)
+    levels = features[:, 0] * 255 / 5
+    np.testing.assert_allclose(levels, [0, 10, 20, 30, 40], atol=1)
+
+
+def test_unreadable_video_raises(tmp_path):
+    with pytest.raises(ValueError):
+        make_extractor().extract_features_from_video(str(tmp_path / "missing.mp4"))
+
+
+def test_frames_pass_the_backbone_in_bounded_chunks(sample_video):
+    extractor = make_extractor(max_frames=5, chunk_size=2)
+
+    features = extractor.extract_features_from_video(sample_video)
+
+    assert extractor.backbone.batch_sizes == [2, 2, 1]
+    levels = features[:, 0] * 255 / 5
+    np.testing.assert_allclose(levels, [0, 10, 20, 30, 40], atol=1)
+
+
+def test_frame_batches_are_chunk_sized_nchw_arrays(sample_video):
+    extractor = make_extractor(max_frames=5, chunk_size=2)
+
+    batches = list(extractor.frame_batches(sample_video))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert all(batch.shape[1:] == (3, 32, 32) for batch in batches)
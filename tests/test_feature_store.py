@@ -0,0 +1,71 @@
+import os
+import numpy as np
+from src.core.config import settings
+from worker.feature_store import FeatureStore
+
+
+def features(value: float) -> np.ndarray:
+    return np.full((4, 8), value, dtype=np.float32)
+
+
+def stored_size(tmp_path) -> int:
+    store = FeatureStore(str(tmp_path / "probe"), "b", "s", max_bytes=1 << 30)
+    store.put("00", features(0))
+    return os.path.getsize(store.path("00"))
+
+
+def age(store: FeatureStore, content_hash: str, seconds: int) -> None:
+    os.utime(store.path(content_hash), (1_000_000 - seconds, 1_000_000 - seconds))
+
+
+def test_put_get_roundtrip_and_hashes(tmp_path):
+    store = FeatureStore(str(tmp_path), "efficientnet_b4:torch", "first60", max_bytes=1 << 30)
+    store.put("ab12", features(1))
+    store.put("cd34", features(2))
+
+    np.testing.assert_array_equal(store.get("ab12"), features(1))
+    assert store.get("ef56") is None
+    assert list(store.hashes()) == ["ab12", "cd34"]
+    assert ":" not in os.path.relpath(store.directory, tmp_path)
+
+
+def test_evicts_least_recently_used_past_budget(tmp_path):
+    size = stored_size(tmp_path)
+    store = FeatureStore(str(tmp_path / "store"), "b", "s", max_bytes=2 * size)
+    store.put("aa", features(1))
+    store.put("bb", features(2))
+    age(store, "aa", 20)
+    age(store, "bb", 10)
+    store.get("aa")
+
+    store.put("cc", features(3))
+
+    assert sorted(store.hashes()) == ["aa", "cc"]
+
+
+def test_budget_covers_older_backbones(tmp_path):
+    size = stored_size(tmp_path)
+    old = FeatureStore(str(tmp_path / "store"), "old", "s", max_bytes=size)
+    old.put("aa", features(1))
+    age(old, "aa", 10)
+
+    new = FeatureStore(str(tmp_path / "store"), "new", "s", max_bytes=size)
+    new.put("bb", features(2))
+
+    assert list(old.hashes()) == []
+    assert list(new.hashes()) == ["bb"]
+
+
+def test_backbone_id_follows_settings():
+    base = settings.model_copy(update={"inference_backend": "torch", "inference_quantized": False})
+    ids = {
+        base.backbone_id(),
+        base.model_copy(update={"inference_backend": "onnx"}).backbone_id(),
+        base.model_copy(update={"inference_quantized": True}).backbone_id(),
+        base.model_copy(update={"backbone_imagenet_normalize": True}).backbone_id(),
+        base.model_copy(update={"backbone_weights": "OTHER"}).backbone_id(),
+    }
+    assert len(ids) == 5
+    # Quantization is a torch-only option and does not change exported backends.
+    onnx = base.model_copy(update={"inference_backend": "onnx"})
+    assert onnx.model_copy(update={"inference_quantized": True}).backbone_id() == onnx.backbone_id()
@@ -0,0 +1,67 @@
+import cv2
+import numpy as np
+import pytest
+from tests.conftest import frame_index, write_video
+from worker.frame_sampler import (
+    FirstSecondsSampler,
+    SceneChangeSampler,
+    UniformSampler,
+    get_frame_sampler,
+    read_frames,
+)
+
+
+def test_first_seconds_takes_one_frame_per_second(sample_video):
+    cap = cv2.VideoCapture(sample_video)
+
+    assert FirstSecondsSampler(max_frames=3).select_indices(cap) == [0, 10, 20]
+    # Only 50 frames: indices past the end are dropped.
+    assert FirstSecondsSampler(max_frames=10).select_indices(cap) == [0, 10, 20, 30, 40]
+
+
+def test_uniform_spreads_frames_over_the_whole_clip(sample_video):
+    cap = cv2.VideoCapture(sample_video)
+
+    assert UniformSampler(max_frames=5).select_indices(cap) == [0, 12, 24, 37, 49]
+    assert UniformSampler(max_frames=100).select_indices(cap) == list(range(50))
+
+
+@pytest.mark.parametrize("seek_threshold", [0, 30])
+def test_read_frames_decodes_the_requested_frames(sample_video, seek_threshold):
+    cap = cv2.VideoCapture(sample_video)
+
+    frames = list(read_frames(cap, [3, 4, 20, 45], seek_threshold))
+
+    assert [frame_index(frame) for frame in frames] == [3, 4, 20, 45]
+
+
+def test_read_frames_stops_at_the_end_of_the_video(sample_video):
+    cap = cv2.VideoCapture(sample_video)
+
+    assert len(list(read_frames(cap, [48, 49, 60], seek_threshold=30))) == 2
+
+
+def test_scene_change_favours_frames_after_cuts(tmp_path):
+    path = str(tmp_path / "cuts.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    # Cuts after frame 36 and frame 76.
+    for level in [0] * 37 + [200] * 40 + [60] * 43:
+        writer.write(np.full((48, 64, 3), level, dtype=np.uint8))
+    writer.release()
+
+    indices = SceneChangeSampler(max_frames=3, oversample=4).select_indices(cv2.VideoCapture(path))
+
+    # Uniform candidates are 0, 11, ..., 119; each segment keeps the first one past its cut.
+    assert indices == [0, 43, 87]
+
+
+def test_short_clips_are_sampled_completely(tmp_path):
+    path = write_video(str(tmp_path / "short.avi"), frames=4)
+
+    assert SceneChangeSampler(max_frames=10).select_indices(cv2.VideoCapture(path)) == [0, 1, 2, 3]
+
+
+def test_unknown_strategy_is_rejected():
+    assert isinstance(get_frame_sampler("uniform", 8), UniformSampler)
+    with pytest.raises(ValueError):
+        get_frame_sampler("random")
@@ -0,0 +1,44 @@
+import threading
+import pytest
+from src.utils.instrumented_executor import InstrumentedExecutor
+
+
+def test_counts_queued_active_and_finished_jobs():
+    executor = InstrumentedExecutor(max_workers=1, thread_name_prefix="test")
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocked():
+        started.set()
+        release.wait()
+
+    def fail():
+        raise ValueError("boom")
+
+    running = executor.submit(blocked)
+    started.wait()
+    waiting = [executor.submit(fail), executor.submit(lambda: 42)]
+
+    assert executor.metrics() == {
+        "max_workers": 1, "queued": 2, "active": 1, "completed": 0, "failed": 0, "peak_queued": 2,
+    }
+
+    release.set()
+    running.result()
+    with pytest.raises(ValueError):
+        waiting[0].result()
+    assert waiting[1].result() == 42
+    executor.shutdown(wait=True)
+
+    assert executor.metrics() == {
+        "max_workers": 1, "queued": 0, "active": 0, "completed": 2, "failed": 1, "peak_queued": 2,
+    }
+
+
+def test_rejected_submit_is_not_counted_as_queued():
+    executor = InstrumentedExecutor(max_workers=1)
+    executor.shutdown()
+
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+    assert executor.metrics()["queued"] == 0
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys
+import src.main
+print(sorted(m for m in ("torch", "torchvision", "cv2", "celery", "worker.celery_app") if m in sys.modules))
+from src.inference.model_inference import get_model_inference
+inference = get_model_inference()
+signature = inference._signature("https://example.com/a.mp4", 1, None)
+print(inference is get_model_inference(), signature.task)
+print(sorted(m for m in ("torch", "torchvision", "cv2", "worker.celery_tasks") if m in sys.modules))
+"""
+
+
+def test_api_imports_neither_torch_nor_celery_until_inference_is_used():
+    env = dict(os.environ, API_PRELOAD_INFERENCE="false")
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout.splitlines()
+
+    assert output == ["[]", "True worker.celery_tasks.analyze_video", "[]"]
@@ -0,0 +1,63 @@
+import os
+from worker.model_registry import ModelRegistry
+
+
+class CountingLoader:
+    def __init__(self):
+        self.loads = []
+
+    def __call__(self, path: str):
+        self.loads.append(path)
+        with open(path) as f:
+            return f.read()
+
+
+def write(path, content: str, mtime: int) -> str:
+    with open(path, "w") as f:
+        f.write(content)
+    os.utime(path, ns=(mtime, mtime))
+    return str(path)
+
+
+def test_loads_each_checkpoint_once(tmp_path):
+    path = write(tmp_path / "model.pt", "v1", 1_000_000_000)
+    loader = CountingLoader()
+    registry = ModelRegistry(loader)
+
+    assert registry.get(path) == "v1"
+    assert registry.get(path) == "v1"
+    assert len(loader.loads) == 1
+
+
+def test_reloads_replaced_checkpoint(tmp_path):
+    path = write(tmp_path / "model.pt", "v1", 1_000_000_000)
+    loader = CountingLoader()
+    registry = ModelRegistry(loader)
+    registry.get(path)
+
+    write(tmp_path / "model.pt", "v2", 2_000_000_000)
+
+    assert registry.get(path) == "v2"
+    assert len(loader.loads) == 2
+
+
+def test_resolve_maps_checkpoint_to_loaded_file(tmp_path):
+    exported = write(tmp_path / "model.onnx", "graph", 1_000_000_000)
+    loader = CountingLoader()
+    registry = ModelRegistry(loader, resolve=lambda path: exported)
+
+    assert registry.get("models/model.pt") == "graph"
+    assert loader.loads == [os.path.abspath(exported)]
+
+
+def test_preload_skips_missing_checkpoints(tmp_path):
+    path = write(tmp_path / "model.pt", "v1", 1_000_000_000)
+    loader = CountingLoader()
+    registry = ModelRegistry(loader)
+
+    registry.preload(str(tmp_path / "missing.pt"), path)
+
+    assert loader.loads == [os.path.abspath(path)]
+    registry.clear()
+    registry.get(path)
+    assert len(loader.loads) == 2
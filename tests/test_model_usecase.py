@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import io
+import fakeredis.aioredis
+import pytest
+from types import SimpleNamespace
+from src.core.admission.admission_controller import AdmissionTooLarge, RedisAdmissionController
+from src.core.cache.keys import in_flight_key
+from src.core.config import settings
+from src.core.storage.local_storage import LocalStorage
+from src.schemas.model_schema import ModelResultSchema
+from src.usecases.model_usecase import ModelUseCaseImpl
+from src.utils.hashing_stream import hash_file
+from tests.fakes import FakeInference, FakeRepository, FakeResultCache, make_user
+
+
+CACHED = b"seen before"
+FRESH = b"never seen"
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def use_case(tmp_path):
+    admission = RedisAdmissionController(
+        fakeredis.aioredis.FakeRedis(), settings.model_copy(update={"admission_control": False})
+    )
+    result_cache = FakeResultCache({sha256(CACHED): ModelResultSchema(prediction="real", confidence=0.9)})
+    return ModelUseCaseImpl(
+        LocalStorage(str(tmp_path / "bucket")), FakeRepository(), FakeRepository(),
+        FakeInference(), result_cache, None, None, admission,
+    )
+
+
+def test_hash_file_rewinds_to_the_start_position():
+    file = io.BytesIO(b"xx" + FRESH)
+    file.seek(2)
+    assert hash_file(file, chunk_size=3) == (sha256(FRESH), len(FRESH))
+    assert file.tell() == 2
+
+
+def test_cache_hit_skips_upload_but_stores_rows(use_case, tmp_path):
+    result = asyncio.run(use_case.analyze_video(make_user(), io.BytesIO(CACHED), "user1@example.com/a.mp4"))
+
+    assert result.status == "success" and result.result.prediction == "real"
+    assert not (tmp_path / "bucket").exists()
+    assert use_case.model_inference.dispatched == []
+    [video] = use_case.video_repository.rows
+    assert (video.user_id, video.file_url) == (1, use_case.storage.object_url("user1@example.com/a.mp4"))
+    [row] = use_case.analysis_result_repository.rows
+    assert (row.video_id, row.task_id, row.prediction, row.confidence) == (video.id, result.task_id, "real", 0.9)
+    assert asyncio.run(use_case.get_result(result.task_id)) == result
+
+
+def test_cache_miss_uploads_whole_file_and_dispatches_with_hash(use_case, tmp_path):
+    result = asyncio.run(use_case.analyze_video(make_user(), io.BytesIO(FRESH), "user1@example.com/b.mp4"))
+
+    assert result.status == "pending"
+    assert (tmp_path / "bucket" / "user1@example.com" / "b.mp4").read_bytes() == FRESH
+    [video] = use_case.video_repository.rows
+    [(url, video_id, content_hash, _, user_id, task_id)] = use_case.model_inference.dispatched
+    assert (url, video_id, content_hash, user_id) == (video.file_url, video.id, sha256(FRESH), 1)
+    assert result.task_id == task_id
+
+
+def test_batch_uploads_only_misses_and_keeps_order(use_case, tmp_path):
+    files = [(io.BytesIO(CACHED), "user1@example.com/a.mp4"), (io.BytesIO(FRESH), "user1@example.com/b.mp4")]
+    url = use_case.storage.object_url("user1@example.com/c.mp4")
+    batch = asyncio.run(use_case.analyze_batch(make_user(), files, [url]))
+
+    assert [item.status for item in batch.items] == ["success", "pending", "pending"]
+    assert sorted(p.name for p in (tmp_path / "bucket" / "user1@example.com").iterdir()) == ["b.mp4"]
+    assert [entry[2] for entry in use_case.model_inference.dispatched] == [sha256(FRESH), None]
+    assert len(use_case.video_repository.rows) == 3
+    [row] = use_case.analysis_result_repository.rows
+    assert (row.task_id, row.prediction) == (batch.items[0].task_id, "real")
+    assert use_case.model_inference.batches[batch.batch_id] == (1, [item.task_id for item in batch.items])
+
+
+def test_analysis_version_covers_backend_and_transport_dtype():
+    version = settings.analysis_version()
+    other = settings.model_copy(update={"inference_backend": "onnx", "feature_transport_dtype": "float16"})
+    assert settings.inference_backend in version and settings.feature_transport_dtype in version
+    assert other.analysis_version() != version
+
+
+@pytest.mark.parametrize("url", [
+    "/etc/passwd",
+    "file:///etc/passwd",
+    "http://169.254.169.254/latest/meta-data/",
+    "https://videos.example.com/c.mp4",
+])
+def test_urls_outside_storage_need_an_allowed_host(use_case, url):
+    with pytest.raises(ValueError):
+        asyncio.run(use_case.analyze_url(make_user(), url))
+    assert use_case.model_inference.dispatched == []
+
+
+def test_allowed_host_url_is_dispatched(use_case, monkeypatch):
+    monkeypatch.setattr(settings, "analysis_url_allowed_hosts", ["videos.example.com"])
+    result = asyncio.run(use_case.analyze_url(make_user(), "https://videos.example.com/c.mp4"))
+
+    assert result.status == "pending"
+    assert use_case.model_inference.dispatched[0][0] == "https://videos.example.com/c.mp4"
+
+
+@pytest.mark.parametrize("key", ["user2@example.com/c.mp4", "user1@example.com/../user2@example.com/c.mp4"])
+def test_other_users_videos_are_rejected(use_case, key):
+    url = use_case.storage.root + "/" + key
+    with pytest.raises(ValueError):
+        asyncio.run(use_case.analyze_url(make_user(), url))
+
+
+def test_batch_with_bad_url_uploads_nothing(use_case, tmp_path):
+    files = [(io.BytesIO(FRESH), "user1@example.com/b.mp4")]
+    with pytest.raises(ValueError):
+        asyncio.run(use_case.analyze_batch(make_user(), files, ["file:///etc/passwd"]))
+
+    assert not (tmp_path / "bucket").exists()
+    assert use_case.video_repository.rows == []
+
+
+def test_get_batch_checks_owner_and_fetches_unfinished_at_once(use_case):
+    inference = use_case.model_inference
+    files = [(io.BytesIO(FRESH), "user1@example.com/b.mp4"), (io.BytesIO(b"other"), "user1@example.com/d.mp4")]
+    batch = asyncio.run(use_case.analyze_batch(make_user(), files, []))
+    finished = batch.items[0].task_id
+    use_case.analysis_result_repository.rows.append(SimpleNamespace(task_id=finished, prediction="FAKE", confidence=0.8))
+
+    with pytest.raises(ValueError):
+        asyncio.run(use_case.get_batch(make_user(2), batch.batch_id))
+    summary = asyncio.run(use_case.get_batch(make_user(), batch.batch_id))
+
+    assert [item.status for item in summary.items] == ["success", "pending"]
+    assert summary.status == "processing"
+    assert inference.result_lookups == [[batch.items[1].task_id]]
+
+
+def test_task_holds_its_slot_before_it_is_dispatched(tmp_path):
+    server = fakeredis.FakeServer()
+    sync_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    admission = RedisAdmissionController(
+        fakeredis.aioredis.FakeRedis(server=server, decode_responses=True),
+        settings.model_copy(update={"admission_control": True}),
+        queue_depth=lambda: 0,
+    )
+    seen = []
+
+    class CheckingInference(FakeInference):
+        def analyze_videos(self, videos):
+            seen.extend(sync_client.zrange(in_flight_key(1), 0, -1))
+            return super().analyze_videos(videos)
+
+    use_case = ModelUseCaseImpl(
+        LocalStorage(str(tmp_path / "bucket")), FakeRepository(), FakeRepository(),
+        CheckingInference(), FakeResultCache(), None, None, admission,
+    )
+    result = asyncio.run(use_case.analyze_video(make_user(), io.BytesIO(FRESH), "user1@example.com/b.mp4"))
+
+    assert seen == [result.task_id]
+    assert sync_client.zrange(in_flight_key(1), 0, -1) == [result.task_id]
+
+
+def test_batch_larger_than_the_in_flight_limit_is_rejected_before_upload(tmp_path):
+    admission = RedisAdmissionController(
+        fakeredis.aioredis.FakeRedis(),
+        settings.model_copy(update={"admission_control": True, "admission_max_in_flight_free": 2}),
+        queue_depth=lambda: 0,
+    )
+    result_cache = FakeResultCache({sha256(CACHED): ModelResultSchema(prediction="real", confidence=0.9)})
+    use_case = ModelUseCaseImpl(
+        LocalStorage(str(tmp_path / "bucket")), FakeRepository(), FakeRepository(),
+        FakeInference(), result_cache, None, None, admission,
+    )
+    files = [(io.BytesIO(data), f"user1@example.com/{i}.mp4") for i, data in enumerate([FRESH, b"two", b"three"])]
+    with pytest.raises(AdmissionTooLarge):
+        asyncio.run(use_case.analyze_batch(make_user(), files, []))
+    assert not (tmp_path / "bucket").exists()
+    assert use_case.model_inference.dispatched == []
+
+    # Cache hits take no slot, so the same limit fits a batch with fewer misses.
+    files = [(io.BytesIO(data), f"user1@example.com/{i}.mp4") for i, data in enumerate([CACHED, FRESH, b"two"])]
+    batch = asyncio.run(use_case.analyze_batch(make_user(), files, []))
+    assert [item.status for item in batch.items] == ["success", "pending", "pending"]
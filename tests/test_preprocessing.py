@@ -0,0 +1,45 @@
+import cv2
+import numpy as np
+from worker.preprocessing import IMAGENET_MEAN, IMAGENET_STD, FramePreprocessor
+
+
+def reference(frame: np.ndarray, size: int, normalize: bool) -> np.ndarray:
+    """
+    The per-frame chain the batched preprocessor replaces.
+    """
+    rgb = cv2.cvtColor(cv2.resize(frame, (size, size), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+    x = rgb.astype(np.float32).transpose(2, 0, 1) / 255
+    if normalize:
+        x = (x - np.array(IMAGENET_MEAN, dtype=np.float32)[:, None, None]) / np.array(IMAGENET_STD, dtype=np.float32)[:, None, None]
+    return x
+
+
+def frames(count: int):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (48, 64, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def fill(preprocessor: FramePreprocessor, batch):
+    buffer = preprocessor.new_buffer(len(batch))
+    for i, frame in enumerate(batch):
+        preprocessor.write(buffer, i, frame)
+    return preprocessor.to_array(buffer)
+
+
+def test_unnormalized_by_default():
+    batch = frames(3)
+
+    x = fill(FramePreprocessor(size=32), batch)
+
+    assert x.shape == (3, 3, 32, 32)
+    assert x.dtype == np.float32
+    assert x.flags["C_CONTIGUOUS"]
+    np.testing.assert_allclose(x, np.stack([reference(f, 32, False) for f in batch]), atol=1e-6)
+
+
+def test_imagenet_normalization_matches_per_frame_chain():
+    batch = frames(2)
+
+    x = fill(FramePreprocessor(size=32, normalize=True), batch)
+
+    np.testing.assert_allclose(x, np.stack([reference(f, 32, True) for f in batch]), atol=1e-5)
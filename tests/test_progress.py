@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+import pytest
+from worker import progress as progress_module
+from worker.progress import PROGRESS_STATE, ProgressTracker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RecordingTask:
+    def __init__(self, task_id="t1"):
+        self.request = SimpleNamespace(id=task_id)
+        self.states = []
+
+    def update_state(self, state, meta):
+        self.states.append((state, meta))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(progress_module.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def published(monkeypatch):
+    events = []
+    monkeypatch.setattr(progress_module, "publish_task_event", lambda task_id, status, progress=None: events.append(progress))
+    return events
+
+
+def test_stages_are_always_reported_and_timed(clock, published):
+    task = RecordingTask()
+    tracker = ProgressTracker(task, min_interval=0.5)
+
+    tracker.stage("extracting")
+    clock.now += 2.0
+    tracker.stage("classifying")
+    clock.now += 0.25
+    timings = tracker.finish()
+
+    assert timings == {"extracting": 2.0, "classifying": 0.25}
+    assert [meta["stage"] for _, meta in task.states] == ["extracting", "classifying"]
+    assert all(state == PROGRESS_STATE for state, _ in task.states)
+    assert published == [meta for _, meta in task.states]
+
+
+def test_frame_counters_are_throttled(clock, published):
+    task = RecordingTask()
+    tracker = ProgressTracker(task, min_interval=0.5)
+    tracker.stage("extracting")
+
+    tracker.frames(16, 0)
+    clock.now += 0.2
+    tracker.frames(32, 16)
+    clock.now += 0.4
+    tracker.frames(48, 32)
+
+    assert [(meta["frames_decoded"], meta["features_extracted"]) for _, meta in task.states] == [(0, 0), (48, 32)]
+    assert tracker.as_dict()["frames_decoded"] == 48
+
+
+def test_nothing_is_reported_without_a_task_id(clock, published):
+    task = RecordingTask(task_id=None)
+    tracker = ProgressTracker(task)
+    tracker.stage("extracting")
+    tracker.frames(10, 10)
+
+    assert task.states == [] and published == []
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import torch
+import torch.nn as nn
+from worker.batching import pad_features
+from worker.classifier import TransformerClassifier
+from worker.quantization import quantizable_linears, quantize_backbone, quantize_classifier
+
+
+def classifier() -> TransformerClassifier:
+    torch.manual_seed(0)
+    model = TransformerClassifier(num_layers=2)
+    model.eval()
+    return model
+
+
+@pytest.fixture(autouse=True)
+def restore_fastpath():
+    yield
+    torch.backends.mha.set_fastpath_enabled(True)
+
+
+def test_feed_forward_layers_are_quantized_and_attention_is_not():
+    assert quantizable_linears(classifier()) == {
+        "input_proj", "classifier.0", "classifier.4",
+        "transformer_encoder.layers.0.linear1", "transformer_encoder.layers.0.linear2",
+        "transformer_encoder.layers.1.linear1", "transformer_encoder.layers.1.linear2",
+    }
+
+
+def test_quantizing_turns_the_attention_fast_path_off():
+    quantized = quantize_classifier(classifier())
+    assert not torch.backends.mha.get_fastpath_enabled()
+    assert isinstance(quantized.transformer_encoder.layers[0].linear1, torch.ao.nn.quantized.dynamic.Linear)
+
+
+def test_quantized_classifier_runs_with_padding_mask():
+    model = classifier()
+    quantized = quantize_classifier(classifier())
+    rng = np.random.default_rng(0)
+    x, padding_mask = pad_features([
+        rng.random((60, 1792), dtype=np.float32),
+        rng.random((35, 1792), dtype=np.float32),
+    ])
+
+    with torch.no_grad():
+        expected = model(torch.from_numpy(x), torch.from_numpy(padding_mask))
+        actual = quantized(torch.from_numpy(x), torch.from_numpy(padding_mask))
+        unmasked = quantized(torch.from_numpy(x[:1]))
+
+    assert actual.shape == (2,)
+    assert unmasked.shape == (1,)
+    assert torch.allclose(actual, expected, atol=0.05)
+
+
+class TinyBackbone(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.features = nn.Sequential(nn.Conv2d(3, 4, 3, stride=4), nn.BatchNorm2d(4), nn.ReLU())
+        self.pool = nn.AdaptiveAvgPool2d(1)
+
+    def forward(self, x):
+        return torch.flatten(self.pool(self.features(x)), 1)
+
+
+def test_quantized_backbone_tracks_float_backbone():
+    torch.manual_seed(0)
+    model = TinyBackbone().eval()
+    batches = [np.random.default_rng(i).random((2, 3, 224, 224), dtype=np.float32) for i in range(4)]
+
+    quantized = quantize_backbone(model, batches)
+
+    with torch.no_grad():
+        expected = model(torch.from_numpy(batches[0]))
+        actual = quantized(torch.from_numpy(batches[0]))
+    assert actual.shape == expected.shape == (2, 4)
+    assert torch.allclose(actual, expected, atol=0.05)
@@ -0,0 +1,70 @@
+from typing import List
+from worker.result_writer import AnalysisResultWriter
+
+
+class FlakyDatabase:
+    """
+    Session factory whose INSERTs fail a given number of times, or whenever a bad task is in the batch.
+    """
+
+    def __init__(self, failures: int = 0, bad_task: str = None):
+        self.failures = failures
+        self.bad_task = bad_task
+        self.attempts: List[List[str]] = []
+        self.rows: List[dict] = []
+
+    def __call__(self):
+        return lambda: self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, rows):
+        self.attempts.append([row["task_id"] for row in rows])
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("server closed the connection")
+        if any(row["task_id"] == self.bad_task for row in rows):
+            raise ValueError("bad row")
+        self.rows.extend(rows)
+
+    def commit(self):
+        pass
+
+
+def rows(*task_ids):
+    return [{"video_id": 1, "task_id": task_id, "prediction": "REAL", "confidence": 0.1} for task_id in task_ids]
+
+
+def test_transient_failure_is_retried_as_one_batch():
+    database = FlakyDatabase(failures=2)
+    writer = AnalysisResultWriter(database, batch_size=10, flush_interval_ms=10, retries=3, retry_backoff_ms=0)
+
+    writer._write(rows("a", "b"))
+
+    assert database.attempts == [["a", "b"]] * 3
+    assert [row["task_id"] for row in database.rows] == ["a", "b"]
+
+
+def test_persistent_failure_falls_back_to_single_rows():
+    database = FlakyDatabase(bad_task="b")
+    writer = AnalysisResultWriter(database, batch_size=10, flush_interval_ms=10, retries=1, retry_backoff_ms=0)
+
+    writer._write(rows("a", "b", "c"))
+
+    assert database.attempts == [["a", "b", "c"]] * 2 + [["a"], ["b"], ["c"]]
+    assert [row["task_id"] for row in database.rows] == ["a", "c"]
+
+
+def test_close_flushes_buffered_rows():
+    database = FlakyDatabase()
+    writer = AnalysisResultWriter(database, batch_size=10, flush_interval_ms=60_000)
+    for task_id in ("a", "b", "c"):
+        writer.add(1, task_id, "FAKE", 0.9)
+
+    writer.close()
+
+    assert database.attempts == [["a", "b", "c"]]
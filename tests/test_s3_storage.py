@@ -0,0 +1,102 @@
+import asyncio
+import boto3
+import pytest
+import requests
+from moto import mock_aws
+from src.core.storage.s3_storage import S3Storage
+
+
+PART_SIZE = 5 * 1024 * 1024
+BUCKET = "test-bucket"
+
+
+@pytest.fixture
+def s3():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def storage(s3):
+    storage = S3Storage(BUCKET, access_key="test", secret_key="test", part_size=PART_SIZE, upload_concurrency=2)
+    yield storage
+    asyncio.run(storage.close())
+
+
+async def chunks(data: bytes, size: int = 1024 * 1024, fail_after: int = None):
+    for offset in range(0, len(data), size):
+        if fail_after is not None and offset >= fail_after:
+            raise ConnectionResetError("client went away")
+        yield data[offset:offset + size]
+
+
+def payload(size: int) -> bytes:
+    return bytes(i % 251 for i in range(size))
+
+
+def test_short_stream_is_stored_with_put_object(s3, storage):
+    data = payload(1000)
+    url = asyncio.run(storage.upload_stream(chunks(data, 300), "u@example.com/small.mp4"))
+
+    assert url == storage.object_url("u@example.com/small.mp4")
+    assert s3.get_object(Bucket=BUCKET, Key="u@example.com/small.mp4")["Body"].read() == data
+    assert "-" not in s3.head_object(Bucket=BUCKET, Key="u@example.com/small.mp4")["ETag"]
+
+
+def test_long_stream_is_stored_as_ordered_multipart_upload(s3, storage):
+    data = payload(2 * PART_SIZE + 123)
+    asyncio.run(storage.upload_stream(chunks(data), "u@example.com/large.mp4"))
+
+    assert s3.get_object(Bucket=BUCKET, Key="u@example.com/large.mp4")["Body"].read() == data
+    assert s3.head_object(Bucket=BUCKET, Key="u@example.com/large.mp4")["ETag"].endswith('-3"')
+
+
+def test_failed_stream_aborts_the_multipart_upload(s3, storage):
+    data = payload(3 * PART_SIZE)
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(storage.upload_stream(chunks(data, fail_after=PART_SIZE + 1), "u@example.com/broken.mp4"))
+
+    assert s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+    assert "Contents" not in s3.list_objects_v2(Bucket=BUCKET)
+
+
+def test_presigned_single_put_upload(storage):
+    presigned = asyncio.run(storage.presign_upload("u@example.com/direct.mp4", 1000))
+    assert "upload_id" not in presigned
+
+    requests.put(presigned["url"], data=payload(1000)).raise_for_status()
+
+    assert asyncio.run(storage.complete_upload("u@example.com/direct.mp4")) == storage.object_url("u@example.com/direct.mp4")
+
+
+def test_presigned_multipart_upload(s3, storage):
+    storage.presign_multipart_threshold = PART_SIZE
+    data = payload(PART_SIZE + 10)
+    presigned = asyncio.run(storage.presign_upload("u@example.com/direct.mp4", len(data)))
+    assert presigned["part_size"] == PART_SIZE and len(presigned["parts"]) == 2
+
+    etags = []
+    for part in presigned["parts"]:
+        start = (part["part_number"] - 1) * presigned["part_size"]
+        response = requests.put(part["url"], data=data[start:start + presigned["part_size"]])
+        response.raise_for_status()
+        etags.append((part["part_number"], response.headers["ETag"]))
+
+    asyncio.run(storage.complete_upload("u@example.com/direct.mp4", presigned["upload_id"], etags[::-1]))
+
+    assert s3.get_object(Bucket=BUCKET, Key="u@example.com/direct.mp4")["Body"].read() == data
+
+
+def test_completing_a_missing_upload_fails(storage):
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(storage.complete_upload("u@example.com/never-uploaded.mp4"))
+
+
+def test_s3_calls_run_on_the_storage_executor(storage):
+    asyncio.run(storage.upload_stream(chunks(payload(10)), "u@example.com/small.mp4"))
+    assert asyncio.run(storage.exists("u@example.com/small.mp4"))
+
+    assert storage.metrics()["completed"] == 2
+    assert storage.s3_client.meta.config.max_pool_connections == storage.max_pool_connections
@@ -0,0 +1,73 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from src.core.config import settings
+from src.inference.scheduling import priority_class, queue_weights
+from worker.scheduling import WeightedCycle
+
+
+WEIGHTS = {"paid_short": 8, "paid_long": 4, "free_short": 2, "free_long": 1}
+
+
+def deliver(cycle: WeightedCycle, backlogged, rounds: int) -> list:
+    """
+    Simulate BRPOP: take from the first non-empty queue in consume() order, then rotate.
+    """
+    served = []
+    for _ in range(rounds):
+        queue = next(q for q in cycle.consume(len(cycle.items)) if q in backlogged)
+        cycle.rotate(queue)
+        served.append(queue)
+    return served
+
+
+def test_backlogged_queues_are_served_in_proportion_to_weight():
+    cycle = WeightedCycle(list(WEIGHTS), weights=WEIGHTS)
+
+    served = Counter(deliver(cycle, set(WEIGHTS), 15 * 10))
+
+    assert served == {"paid_short": 80, "paid_long": 40, "free_short": 20, "free_long": 10}
+
+
+def test_heavier_queue_goes_first_on_ties():
+    cycle = WeightedCycle(list(WEIGHTS)[::-1], weights=WEIGHTS)
+
+    assert cycle.consume(4) == ["paid_short", "paid_long", "free_short", "free_long"]
+
+
+def test_empty_queue_never_blocks_the_others():
+    cycle = WeightedCycle(list(WEIGHTS), weights=WEIGHTS)
+
+    assert set(deliver(cycle, {"free_long"}, 5)) == {"free_long"}
+
+
+def test_idle_queue_cannot_bank_credit():
+    cycle = WeightedCycle(["paid_short", "free_short"], weights=WEIGHTS)
+    deliver(cycle, {"free_short"}, 100)
+
+    # paid_short was idle for 100 deliveries; once busy it gets its 4:1 share, not a burst.
+    served = deliver(cycle, {"paid_short", "free_short"}, 50)
+
+    assert "free_short" in served[:6]
+    assert abs(Counter(served)["paid_short"] - 40) <= 1
+
+
+def test_priority_class_from_plan_and_size():
+    now = datetime.now(timezone.utc)
+    short, long = settings.priority_long_video_bytes, settings.priority_long_video_bytes + 1
+
+    assert priority_class("pro", None, short, settings) == "paid_short"
+    assert priority_class("pro", now + timedelta(days=1), long, settings) == "paid_long"
+    assert priority_class("pro", now - timedelta(days=1), short, settings) == "free_short"
+    assert priority_class("free", None, None, settings) == "free_long"
+
+
+def test_queue_weights_cover_every_queue():
+    weights = queue_weights(settings.model_copy(update={"priority_queue_weights": {"paid_short": 0}}))
+
+    assert weights == {
+        "video_analysis.paid_short": 1,
+        "video_analysis.paid_long": 1,
+        "video_analysis.free_short": 1,
+        "video_analysis.free_long": 1,
+        "video_analysis": 1,
+    }
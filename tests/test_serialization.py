@@ -0,0 +1,57 @@
+import numpy as np
+from kombu.serialization import dumps, loads
+from worker.serialization import CONTENT_TYPE, SERIALIZER_NAME, NdarraySerializer, register_ndarray_serializer
+
+
+def test_round_trips_arrays_inside_task_arguments():
+    serializer = NdarraySerializer()
+    features = np.random.default_rng(0).random((60, 1792), dtype=np.float32)
+    labels = np.arange(5, dtype=np.int64)
+
+    args, kwargs, embed = serializer.loads(serializer.dumps(
+        [["models/best_model.pt", features], {"labels": labels, "count": np.int64(3)}, {"callbacks": None}]
+    ))
+
+    assert args[0] == "models/best_model.pt"
+    np.testing.assert_array_equal(args[1], features)
+    assert args[1].dtype == np.float32
+    np.testing.assert_array_equal(kwargs["labels"], labels)
+    assert kwargs["count"] == 3
+    assert embed == {"callbacks": None}
+
+
+def test_payload_is_raw_bytes_not_json_numbers():
+    features = np.ones((60, 1792), dtype=np.float32)
+
+    payload = NdarraySerializer().dumps([features])
+
+    assert len(payload) < features.nbytes + 200
+
+
+def test_float_arrays_are_cast_to_the_transport_dtype():
+    serializer = NdarraySerializer("float16")
+    features = np.array([[0.1, 0.2]], dtype=np.float32)
+
+    restored = serializer.loads(serializer.dumps(features))
+
+    assert restored.dtype == np.float16
+    np.testing.assert_allclose(restored, features, rtol=1e-3)
+
+
+def test_default_transport_is_lossless():
+    features = np.random.default_rng(1).random((3, 4)).astype(np.float32)
+
+    restored = NdarraySerializer().loads(NdarraySerializer().dumps(features))
+
+    np.testing.assert_array_equal(restored, features)
+
+
+def test_registered_with_kombu():
+    register_ndarray_serializer()
+    features = np.eye(3, dtype=np.float32)
+
+    content_type, encoding, payload = dumps([features], serializer=SERIALIZER_NAME)
+
+    assert content_type == CONTENT_TYPE
+    assert encoding == "binary"
+    np.testing.assert_array_equal(loads(payload, content_type, encoding)[0], features)
@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from fastapi import HTTPException
+from src.api.http.storage_keys import user_file_name
+from src.api.http.v1.endpoints.model import complete_upload
+from src.api.http.v1.endpoints.video import upload_video_stream
+from src.core.storage.local_storage import LocalStorage
+from src.schemas.model_schema import ModelSchema
+from src.schemas.upload_schema import CompleteUploadRequest
+from src.usecases.video_usecase import VideoUseCaseImpl
+from src.utils.storage_keys import is_user_key, user_key
+from tests.fakes import FakeRepository, make_user
+
+
+@pytest.mark.parametrize("name, key", [
+    ("clip.mp4", "u@example.com/clip.mp4"),
+    ("../../other@example.com/clip.mp4", "u@example.com/clip.mp4"),
+    ("/etc/clip.mp4", "u@example.com/clip.mp4"),
+    ("nested/dir/clip.mp4", "u@example.com/clip.mp4"),
+])
+def test_client_file_names_stay_in_the_user_prefix(name, key):
+    assert user_key("u@example.com", name) == key
+    assert user_file_name(make_user(email="u@example.com"), name) == key
+
+
+@pytest.mark.parametrize("name", ["", "..", "a/..", None])
+def test_file_names_without_a_base_name_are_rejected(name):
+    with pytest.raises(ValueError):
+        user_key("u@example.com", name)
+    with pytest.raises(HTTPException) as rejected:
+        user_file_name(make_user(), name)
+    assert rejected.value.status_code == 400
+
+
+class FakeUserUseCase:
+    def __init__(self, user):
+        self.user = user
+
+    async def get_user_by_fields(self, **fields):
+        return self.user
+
+
+class StreamRequest:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def stream(self):
+        yield self.body
+
+
+@pytest.mark.parametrize("file_name", ["../other@example.com/v.mp4", "sub/dir/v.mp4"])
+def test_streamed_upload_cannot_leave_the_user_prefix(tmp_path, file_name):
+    user = make_user(email="me@example.com")
+    storage = LocalStorage(str(tmp_path))
+    video_use_case = VideoUseCaseImpl(FakeRepository(), storage)
+
+    response = asyncio.run(upload_video_stream(
+        StreamRequest(b"video"), file_name, SimpleNamespace(sub=user.email), video_use_case, FakeUserUseCase(user),
+    ))
+
+    assert response.data.file_url == storage.object_url("me@example.com/v.mp4")
+    assert [p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*") if p.is_file()] == ["me@example.com/v.mp4"]
+
+
+def test_streamed_upload_rejects_names_without_a_base_name(tmp_path):
+    user = make_user(email="me@example.com")
+    video_use_case = VideoUseCaseImpl(FakeRepository(), LocalStorage(str(tmp_path)))
+
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(upload_video_stream(
+            StreamRequest(b"video"), "..", SimpleNamespace(sub=user.email), video_use_case, FakeUserUseCase(user),
+        ))
+
+    assert rejected.value.status_code == 400
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("key, owned", [
+    ("me@example.com/v.mp4", True),
+    ("me@example.com/../other@example.com/v.mp4", False),
+    ("me@example.com/sub/v.mp4", False),
+    ("me@example.com/..", False),
+    ("me@example.com/", False),
+    ("other@example.com/v.mp4", False),
+    ("me@example.com.evil/v.mp4", False),
+])
+def test_is_user_key(key, owned):
+    assert is_user_key("me@example.com", key) is owned
+
+
+class RecordingModelUseCase:
+    def __init__(self):
+        self.completed = []
+
+    async def complete_upload(self, user, upload):
+        self.completed.append(upload.key)
+        return ModelSchema(status="pending", task_id="task-1")
+
+
+@pytest.mark.parametrize("key", ["me@example.com/../other@example.com/v.mp4", "me@example.com/sub/v.mp4"])
+def test_complete_upload_rejects_keys_outside_the_user_prefix(key):
+    user = make_user(email="me@example.com")
+    model_use_case = RecordingModelUseCase()
+
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(complete_upload(
+            CompleteUploadRequest(key=key), model_use_case, FakeUserUseCase(user), SimpleNamespace(sub=user.email),
+        ))
+
+    assert rejected.value.status_code == 403
+    assert model_use_case.completed == []
+
+
+def test_complete_upload_accepts_the_users_own_key():
+    user = make_user(email="me@example.com")
+    model_use_case = RecordingModelUseCase()
+
+    response = asyncio.run(complete_upload(
+        CompleteUploadRequest(key="me@example.com/v.mp4"), model_use_case, FakeUserUseCase(user), SimpleNamespace(sub=user.email),
+    ))
+
+    assert response.data.task_id == "task-1"
+    assert model_use_case.completed == ["me@example.com/v.mp4"]
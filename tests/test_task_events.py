@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+import pytest
+from worker import task_events
+
+
+@pytest.fixture
+def published(monkeypatch):
+    events = []
+
+    def publish(task_id, status, result=None, progress=None):
+        events.append((task_id, status, result))
+
+    monkeypatch.setattr(task_events, "publish_task_event", publish)
+    return events
+
+
+def task(name: str, task_id: str = "t1") -> SimpleNamespace:
+    return SimpleNamespace(name=name, request=SimpleNamespace(id=task_id))
+
+
+def test_analysis_events_are_published(published):
+    sender = task("worker.celery_tasks.analyze_video")
+    task_events.on_task_prerun(sender=sender, task_id="t1")
+    task_events.on_task_success(sender=sender, result=("FAKE", 0.93))
+    task_events.on_task_failure(sender=sender, task_id="t1", exception=RuntimeError("boom"))
+
+    assert published == [
+        ("t1", "processing", None),
+        ("t1", "success", {"prediction": "FAKE", "confidence": 0.93}),
+        ("t1", "failed", "boom"),
+    ]
+
+
+def test_other_tasks_are_ignored_whatever_they_return(published):
+    sender = task("worker.celery_tasks.predict")
+    task_events.on_task_prerun(sender=sender, task_id="t1")
+    task_events.on_task_success(sender=sender, result=[("REAL", 0.1), ("FAKE", 0.8), ("REAL", 0.2)])
+    task_events.on_task_success(sender=task("celery.chord_unlock"), result=None)
+
+    assert published == []
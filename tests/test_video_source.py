@@ -0,0 +1,116 @@
+import os
+import boto3
+import pytest
+from moto import mock_aws
+from src.core.storage.local_storage import LocalStorage
+from src.core.storage.s3_storage import S3Storage
+from worker import video_source as video_source_module
+from worker.video_source import VideoCache, VideoSource
+
+
+BUCKET = "test-bucket"
+KEY = "u@example.com/clip.mp4"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        downloads = []
+        download_file = client.download_file
+
+        def counting_download(bucket, key, path, **kwargs):
+            downloads.append(key)
+            return download_file(bucket, key, path, **kwargs)
+
+        monkeypatch.setattr(client, "download_file", counting_download)
+        monkeypatch.setattr(video_source_module, "get_s3_client", lambda: client)
+        client.downloads = downloads
+        yield client
+
+
+@pytest.fixture
+def source(s3, tmp_path):
+    storage = S3Storage(BUCKET, access_key="test", secret_key="test")
+    yield VideoSource(storage, VideoCache(str(tmp_path / "cache"), max_bytes=1 << 20), allowed_hosts=["videos.example.com"])
+    storage.executor.shutdown()
+
+
+def read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_cache_hit_skips_download(s3, source):
+    s3.put_object(Bucket=BUCKET, Key=KEY, Body=b"first")
+    url = source.storage.object_url(KEY)
+
+    first = source.open(url)
+    second = source.open(url)
+
+    assert first == second and first.endswith(".mp4")
+    assert read(second) == b"first"
+    assert s3.downloads == [KEY]
+
+
+def test_reupload_under_same_key_is_downloaded_again(s3, source):
+    url = source.storage.object_url(KEY)
+    s3.put_object(Bucket=BUCKET, Key=KEY, Body=b"first")
+    stale = source.open(url)
+    s3.put_object(Bucket=BUCKET, Key=KEY, Body=b"second")
+
+    fresh = source.open(url)
+
+    assert fresh != stale
+    assert read(fresh) == b"second"
+    assert s3.downloads == [KEY, KEY]
+
+
+def test_object_replaced_during_download_is_not_cached(s3, source, monkeypatch):
+    s3.put_object(Bucket=BUCKET, Key=KEY, Body=b"first")
+    download = source._download
+
+    def racing_download(key, etag, path):
+        s3.put_object(Bucket=BUCKET, Key=KEY, Body=b"second")
+        download(key, etag, path)
+
+    monkeypatch.setattr(source, "_download", racing_download)
+    with pytest.raises(RuntimeError):
+        source.open(source.storage.object_url(KEY))
+    assert os.listdir(source.cache.root) == []
+
+
+def test_urls_outside_storage_need_an_allowed_host(source):
+    assert source.open("https://videos.example.com/a.mp4") == "https://videos.example.com/a.mp4"
+    for url in ("/etc/passwd", "file:///etc/passwd", "http://127.0.0.1:6379/"):
+        with pytest.raises(ValueError):
+            source.open(url)
+
+
+def test_local_storage_files_are_opened_in_place(tmp_path):
+    storage = LocalStorage(str(tmp_path / "storage"))
+    source = VideoSource(storage, VideoCache(str(tmp_path / "cache"), max_bytes=1 << 20))
+
+    assert source.open(storage.object_url(KEY)) == storage.path(KEY)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = VideoCache(str(tmp_path), max_bytes=10)
+
+    def write(data):
+        def download(path):
+            with open(path, "wb") as f:
+                f.write(data)
+        return download
+
+    old = cache.put("a.mp4", "1", write(b"aaaa"))
+    os.utime(old, (1, 1))
+    kept = cache.put("b.mp4", "1", write(b"bbbb"))
+    os.utime(kept, (2, 2))
+    assert cache.get("a.mp4", "1") == old
+    cache.put("c.mp4", "1", write(b"cccc"))
+
+    assert cache.get("a.mp4", "1") == old
+    assert cache.get("b.mp4", "1") is None
+    assert cache.get("a.mp4", "2") is None
@@ -0,0 +1,30 @@
+import pytest
+from src.utils.video_url import is_allowed_video_url
+
+
+ALLOWED = ["videos.example.com"]
+
+
+@pytest.mark.parametrize("url", [
+    "https://videos.example.com/clip.mp4",
+    "http://VIDEOS.example.com:8080/a/b.mp4?x=1",
+])
+def test_allowed_urls(url):
+    assert is_allowed_video_url(url, ALLOWED)
+
+
+@pytest.mark.parametrize("url", [
+    "file:///etc/passwd",
+    "/etc/passwd",
+    "ftp://videos.example.com/clip.mp4",
+    "http://169.254.169.254/latest/meta-data/",
+    "https://videos.example.com.evil.test/clip.mp4",
+    "https://videos.example.com@evil.test/clip.mp4",
+    "http://[::1/clip.mp4",
+])
+def test_rejected_urls(url):
+    assert not is_allowed_video_url(url, ALLOWED)
+
+
+def test_nothing_is_allowed_by_default():
+    assert not is_allowed_video_url("https://videos.example.com/clip.mp4", [])
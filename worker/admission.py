@@ -0,0 +1,18 @@
+from celery.signals import task_postrun
+from src.core.cache.keys import in_flight_key
+from src.core.logger.logger import logger
+from .database import get_redis
+
+
+@task_postrun.connect
+def release_in_flight(task_id=None, kwargs=None, **extra):
+    """
+    Free the user's admission slot once an analysis finishes, whatever its outcome.
+    """
+    user_id = (kwargs or {}).get("user_id")
+    if user_id is None:
+        return
+    try:
+        get_redis().zrem(in_flight_key(user_id), task_id)
+    except Exception as e:
+        logger.warning(f"Failed to release in-flight slot of task {task_id}: {e}")
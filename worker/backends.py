@@ -0,0 +1,91 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Optional
+import numpy as np
+import torch
+import torch.nn as nn
+
+
+BACKENDS = ("torch", "torchscript", "onnx")
+EXPORT_SUFFIXES = {"torchscript": ".ts", "onnx": ".onnx"}
+BACKBONE_NAME = "efficientnet_b4"
+
+
+class InferenceBackend(ABC):
+    """
+    Abstract base class for model execution backends.
+
+    Inputs and outputs are numpy arrays, so callers do not depend on the runtime.
+    """
+
+    @abstractmethod
+    def __call__(self, *inputs: np.ndarray) -> np.ndarray:
+        pass
+
+
+class TorchBackend(InferenceBackend):
+    """
+    Eager PyTorch execution of an nn.Module.
+    """
+
+    def __init__(self, module: nn.Module):
+        self.module = module
+
+    def __call__(self, *inputs: np.ndarray) -> np.ndarray:
+        with torch.no_grad():
+            return self.module(*[torch.from_numpy(x) for x in inputs]).numpy()
+
+
+class TorchScriptBackend(TorchBackend):
+    """
+    Frozen, inference-optimized TorchScript graph.
+    """
+
+    def __init__(self, path: str, optimize: bool = True):
+        module = torch.jit.load(path, map_location="cpu")
+        module.eval()
+        super().__init__(torch.jit.optimize_for_inference(module) if optimize else module)
+
+
+class OnnxBackend(InferenceBackend):
+    """
+    ONNX Runtime CPU session with full graph optimizations.
+
+    onnxruntime is only needed when this backend is selected.
+    """
+
+    def __init__(self, path: str, threads: int = 0):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError("onnxruntime is required for the onnx inference backend") from e
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def __call__(self, *inputs: np.ndarray) -> np.ndarray:
+        return self.session.run(None, dict(zip(self.input_names, inputs)))[0]
+
+
+def exported_path(export_dir: str, name: str, backend: str) -> str:
+    """
+    Location of an exported graph, e.g. models/exported/best_model.onnx.
+    """
+    return os.path.join(export_dir, name + EXPORT_SUFFIXES[backend])
+
+
+def model_name(model_path: str) -> str:
+    return os.path.splitext(os.path.basename(model_path))[0]
+
+
+def load_exported(path: str, backend: str, threads: int = 0) -> InferenceBackend:
+    if backend == "torchscript":
+        return TorchScriptBackend(path)
+    if backend == "onnx":
+        return OnnxBackend(path, threads)
+    raise ValueError(f"Unknown inference backend: {backend}")
@@ -0,0 +1,89 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+
+def pad_features(features: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack [T_i, D] feature matrices into a [B, T_max, D] float32 batch.
+
+    Returns the batch and a [B, T_max] padding mask, True for padded frames.
+    """
+    lengths = np.array([len(f) for f in features])
+    max_len = lengths.max()
+    dim = features[0].shape[1]
+    batch = np.zeros((len(features), max_len, dim), dtype=np.float32)
+    for i, f in enumerate(features):
+        batch[i, :len(f)] = f
+    mask = np.arange(max_len)[None, :] >= lengths[:, None]
+    return batch, mask
+
+
+class PredictBatcher:
+    """
+    Gathers concurrent predict requests inside one worker process and runs them
+    as a single forward pass.
+
+    A batch is flushed once it holds max_batch_size items or max_wait_ms have
+    passed since its first item arrived. Requests for different checkpoints are
+    batched separately. Only useful with a threaded pool (-P threads), where
+    several tasks execute in the same process at once.
+    """
+
+    def __init__(self, handler: Callable[[str, List[np.ndarray]], list], max_batch_size: int, max_wait_ms: int):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[Tuple[str, np.ndarray, Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+
+    def submit(self, model_path: str, features: np.ndarray) -> Future:
+        self._ensure_started()
+        future = Future()
+        self._queue.put((model_path, features, future))
+        return future
+
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="predict-batcher", daemon=True)
+                self._thread.start()
+
+
+    def _collect(self) -> List[Tuple[str, np.ndarray, Future]]:
+        items = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(items) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return items
+
+
+    def _run(self) -> None:
+        while True:
+            groups: Dict[str, List[Tuple[np.ndarray, Future]]] = {}
+            for model_path, features, future in self._collect():
+                groups.setdefault(model_path, []).append((features, future))
+
+            for model_path, group in groups.items():
+                try:
+                    results = self.handler(model_path, [features for features, _ in group])
+                except Exception as e:
+                    for _, future in group:
+                        future.set_exception(e)
+                    continue
+                for (_, future), result in zip(group, results):
+                    future.set_result(result)
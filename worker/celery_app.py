@@ -1,5 +1,9 @@
 from celery import Celery
 from src.core.config import settings
+from .serialization import SERIALIZER_NAME, register_ndarray_serializer
+
+
+register_ndarray_serializer(settings.feature_transport_dtype)
 
 
 app = Celery(
@@ -13,12 +17,47 @@ app = Celery(
 app.conf.update(
     task_routes={
         'worker.celery_tasks.predict': {'queue': 'video_analysis'},
+        'worker.celery_tasks.analyze_video': {'queue': 'video_analysis'},
+        'worker.celery_tasks.rescore': {'queue': 'video_analysis'},
     },
     task_default_queue='video_analysis',
     task_default_exchange='video_analysis',
     task_default_routing_key='video_analysis',
+    task_serializer=SERIALIZER_NAME,
+    accept_content=['json', SERIALIZER_NAME],
+    result_serializer='json',
     task_always_eager=False,
     task_eager_propagates=False,
+
+    # Analyses take seconds to minutes of CPU each: reserve one task per
+    # process at a time so queued work goes to whichever process frees up
+    # first instead of piling up behind a busy one.
+    worker_concurrency=settings.celery_concurrency or None,
+    worker_prefetch_multiplier=settings.celery_prefetch_multiplier,
+
+    # Ack after the task finishes, and put it back on the queue if the process
+    # running it dies (OOM kill, recycling, crash), so no accepted video is lost.
+    # Failures and time-outs are still acked to keep bad videos from looping.
+    task_acks_late=settings.celery_acks_late,
+    task_reject_on_worker_lost=settings.celery_reject_on_worker_lost,
+    task_soft_time_limit=settings.celery_task_soft_time_limit or None,
+    task_time_limit=settings.celery_task_time_limit or None,
+
+    # Recycle pool children to bound memory growth across many videos.
+    worker_max_tasks_per_child=settings.celery_max_tasks_per_child or None,
+    worker_max_memory_per_child=settings.celery_max_memory_per_child or None,
+
+    # Finished results are persisted to Postgres; the backend copy only
+    # needs to outlive clients polling or streaming the task.
+    result_expires=settings.celery_result_expires,
+
+    # Unacked messages are redelivered after this long, so it must exceed
+    # the hard time limit.
+    broker_transport_options={
+        'visibility_timeout': settings.celery_visibility_timeout,
+        # Serve the per-plan queues in proportion to PRIORITY_QUEUE_WEIGHTS.
+        **({'queue_order_strategy': 'worker.scheduling:WeightedCycle'} if settings.priority_scheduling else {}),
+    },
 )
 
 
@@ -1,52 +1,165 @@
+import gc
+from typing import List
 import numpy as np
-import torch
+from billiard.process import current_process
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
+from src.core.config import settings
+from src.core.logger.logger import logger
+from src.utils.cpu_budget import CpuBudget, get_cpu_budget, set_cpu_budget
+from src.inference.scheduling import DEFAULT_CLASS
 from .celery_app  import app
-import torch.nn as nn
-import numpy as np
+from .batching import PredictBatcher, pad_features
+from .classifier import TransformerClassifier, load_model
+from .feature_extractor import get_feature_extractor
+from .feature_store import FeatureStore
+from .model_registry import model_registry
+from .database import get_session_factory
+from .result_cache import store_cached_result
+from .progress import ProgressTracker
+from .result_writer import AnalysisResultWriter
+from .video_source import video_source
+from .queue_metrics import record_queue_wait
+from . import task_events
+from . import admission
 
 
-class TransformerClassifier(nn.Module):
-    def __init__(self, input_dim=1792, seq_len=60, d_model=512, nhead=8,
-                 num_layers=4, dim_feedforward=1024, dropout=0.5):
-        super().__init__()
-        self.input_proj = nn.Linear(input_dim, d_model)
-        encoder_layer = nn.TransformerEncoderLayer(
-            d_model=d_model, nhead=nhead,
-            dim_feedforward=dim_feedforward, dropout=dropout, batch_first=True)
-        self.transformer_encoder = nn.TransformerEncoder(encoder_layer, num_layers=num_layers)
-        self.classifier = nn.Sequential(
-            nn.Linear(d_model, 512),
-            nn.BatchNorm1d(512),
-            nn.ReLU(),
-            nn.Dropout(dropout),
-            nn.Linear(512, 1),
-            nn.Sigmoid()
-        )
+result_writer = AnalysisResultWriter(
+    get_session_factory,
+    batch_size=settings.result_write_batch_size,
+    flush_interval_ms=settings.result_write_interval_ms,
+    retries=settings.result_write_retries,
+    retry_backoff_ms=settings.result_write_retry_backoff_ms,
+)
 
-    def forward(self, x):
-        x = self.input_proj(x)
-        x = self.transformer_encoder(x)
-        x = x.mean(dim=1)
-        return self.classifier(x).squeeze(1)
 
+@worker_init.connect
+def configure_cpu_budget(sender=None, **kwargs):
+    """
+    Split the CPU budget between the pool's processes.
 
+    A prefork pool runs `concurrency` children that each get a share. A
+    thread pool runs `concurrency` tasks at once in this process, so its
+    torch and ONNX Runtime pools get the same share (there is nothing to pin);
+    solo and green pools run one task at a time and get the whole budget.
+    Both are configured right away.
+    """
+    pool = getattr(sender.pool_cls, "__module__", str(sender.pool_cls))
+    prefork = "prefork" in pool
+    processes = sender.concurrency if prefork or pool.endswith(".thread") else 1
+    set_cpu_budget(CpuBudget.for_worker(settings, processes))
+    if not prefork:
+        get_cpu_budget().apply("worker")
 
-def load_model(model_path: str):
-    model = TransformerClassifier()
-    model.load_state_dict(torch.load(model_path, map_location=torch.device("cpu")))
-    model.eval()
-    return model
 
+@worker_init.connect
+def preload_models_in_parent(**kwargs):
+    """
+    Load the backbone and classifier once in the main process before the pool forks.
 
-@app.task
-def predict(model_path: str, features: list):
-    with torch.no_grad():
-        features = np.array(features)
-        model = load_model(model_path)
-        x = torch.tensor(features, dtype=torch.float32).unsqueeze(0)  # [1, 60, 1792]
-        output = model(x)
-        prob = output.item()
+    Children inherit the loaded weights and share their pages copy-on-write,
+    instead of each loading its own copy.
+    """
+    if not settings.worker_preload_parent:
+        return
+    get_feature_extractor()
+    model_registry.preload(settings.model_path)
+    gc.freeze()
+
+
+@worker_process_init.connect
+def preload_models(**kwargs):
+    budget = get_cpu_budget()
+    if budget is not None:
+        budget.apply("worker", getattr(current_process(), "index", None))
+    model_registry.preload(settings.model_path)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def flush_results(**kwargs):
+    result_writer.close()
+
+
+def classify_batch(model_path: str, features: List[np.ndarray]):
+    model = model_registry.get(model_path)
+    x, padding_mask = pad_features(features)  # [B, 60, 1792]
+    output = model(x, padding_mask)
+    results = []
+    for prob in output.tolist():
         label = "FAKE" if prob > 0.5 else "REAL"
-        return label, round(prob, 4)
-        
-    
+        results.append((label, round(prob, 4)))
+    return results
+
+
+feature_store = FeatureStore(
+    settings.feature_store_dir, settings.backbone_id(), settings.sampling_id(), settings.feature_store_max_bytes
+)
+
+
+def extract_features(video_url: str, content_hash: str = None, progress=None) -> np.ndarray:
+    """
+    Return the video's backbone features, reusing the feature store when the content hash is known.
+    """
+    use_store = settings.feature_store_enabled and content_hash
+    if use_store:
+        features = feature_store.get(content_hash)
+        if features is not None:
+            return features
+
+    features = get_feature_extractor().extract_features_from_video(video_source.open(video_url), progress)
+    if use_store:
+        try:
+            feature_store.put(content_hash, features)
+        except OSError as e:
+            logger.warning(f"Failed to store features for {content_hash}: {e}")
+    return features
+
+
+predict_batcher = PredictBatcher(
+    handler=classify_batch,
+    max_batch_size=settings.predict_batch_size,
+    max_wait_ms=settings.predict_batch_wait_ms,
+)
+
+
+def classify(model_path: str, features: np.ndarray):
+    if settings.predict_batching:
+        return predict_batcher.submit(model_path, features).result()
+    return classify_batch(model_path, [features])[0]
+
+
+@app.task
+def predict(model_path: str, features: np.ndarray):
+    return classify(model_path, np.asarray(features))
+
+
+@app.task
+def rescore(model_path: str, content_hash: str):
+    """
+    Score stored features with the given checkpoint, without decoding or the backbone.
+    """
+    features = feature_store.get(content_hash)
+    if features is None:
+        raise ValueError(f"No stored features for {content_hash}")
+    return classify(model_path, features)
+
+
+@app.task(bind=True)
+def analyze_video(self, model_path: str, video_url: str, content_hash: str = None, model_version: str = None, video_id: int = None,
+                  priority_class: str = DEFAULT_CLASS, enqueued_at: float = None, user_id: int = None):
+    if enqueued_at is not None:
+        record_queue_wait(priority_class, enqueued_at)
+    tracker = ProgressTracker(self)
+    tracker.stage("extracting")
+    features = extract_features(video_url, content_hash, tracker.frames)
+    tracker.stage("classifying")
+    label, prob = classify(model_path, features)
+    tracker.finish()
+    if video_id is not None:
+        result_writer.add(video_id, self.request.id, label, prob)
+    if content_hash and model_version:
+        try:
+            store_cached_result(content_hash, model_version, label, prob)
+        except Exception as e:
+            logger.warning(f"Failed to cache result for {content_hash}: {e}")
+    return label, prob
@@ -0,0 +1,42 @@
+import torch
+import torch.nn as nn
+
+
+class TransformerClassifier(nn.Module):
+    def __init__(self, input_dim=1792, seq_len=60, d_model=512, nhead=8,
+                 num_layers=4, dim_feedforward=1024, dropout=0.5):
+        super().__init__()
+        self.input_proj = nn.Linear(input_dim, d_model)
+        encoder_layer = nn.TransformerEncoderLayer(
+            d_model=d_model, nhead=nhead,
+            dim_feedforward=dim_feedforward, dropout=dropout, batch_first=True)
+        self.transformer_encoder = nn.TransformerEncoder(encoder_layer, num_layers=num_layers)
+        self.classifier = nn.Sequential(
+            nn.Linear(d_model, 512),
+            nn.BatchNorm1d(512),
+            nn.ReLU(),
+            nn.Dropout(dropout),
+            nn.Linear(512, 1),
+            nn.Sigmoid()
+        )
+
+    def forward(self, x, padding_mask=None):
+        """
+        x: [B, T, input_dim]; padding_mask: optional [B, T] bool, True marks padded frames.
+        """
+        x = self.input_proj(x)
+        x = self.transformer_encoder(x, src_key_padding_mask=padding_mask)
+        if padding_mask is None:
+            x = x.mean(dim=1)
+        else:
+            keep = (~padding_mask).unsqueeze(-1).to(x.dtype)
+            x = (x * keep).sum(dim=1) / keep.sum(dim=1).clamp(min=1)
+        return self.classifier(x).squeeze(1)
+
+
+
+def load_model(model_path: str):
+    model = TransformerClassifier()
+    model.load_state_dict(torch.load(model_path, map_location=torch.device("cpu")))
+    model.eval()
+    return model
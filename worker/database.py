@@ -0,0 +1,56 @@
+import boto3
+from botocore.config import Config
+from redis import Redis
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from src.core.config import settings
+
+
+_session_factory = None
+
+
+def get_session_factory() -> sessionmaker:
+    """
+    Return the per-process sync session factory.
+
+    The engine is created on first use so that forked pool children never
+    share a connection pool with their parent.
+    """
+    global _session_factory
+    if _session_factory is None:
+        engine = create_engine(settings.db_sync_url(), pool_pre_ping=True, pool_size=2)
+        _session_factory = sessionmaker(engine, class_=Session, expire_on_commit=False)
+    return _session_factory
+
+
+_redis = None
+
+
+def get_redis() -> Redis:
+    """
+    Return the per-process Redis client for the app's cache database.
+    """
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(settings.redis_url(1))
+    return _redis
+
+
+_s3_client = None
+
+
+def get_s3_client():
+    """
+    Return the per-process blocking S3 client used to read stored videos.
+    """
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client(
+            's3',
+            region_name=settings.s3_region_name,
+            aws_access_key_id=settings.s3_access_key,
+            aws_secret_access_key=settings.s3_secret_key,
+            endpoint_url=settings.s3_endpoint_url,
+            config=Config(retries={"max_attempts": 5, "mode": "adaptive"}),
+        )
+    return _s3_client
@@ -0,0 +1,95 @@
+"""
+Export the backbone and classifier to TorchScript and ONNX and check parity.
+
+    python -m worker.export_models --checkpoint models/best_model.pt
+
+Writes <name>.ts / <name>.onnx for the classifier checkpoint and
+efficientnet_b4.ts / efficientnet_b4.onnx for the backbone into
+EXPORTED_MODELS_DIR, then compares every exported graph against the eager
+model on random inputs and exits non-zero if any difference exceeds --atol.
+"""
+import argparse
+import os
+import sys
+from typing import Dict, List, Tuple
+import numpy as np
+import torch
+import torch.nn as nn
+from src.core.config import settings
+from .backends import BACKBONE_NAME, EXPORT_SUFFIXES, TorchBackend, exported_path, load_exported, model_name
+from .classifier import load_model
+from .feature_extractor import load_backbone
+
+
+def export_torchscript(module: nn.Module, inputs: Tuple[torch.Tensor, ...], path: str) -> None:
+    # The trace self-check reruns the module under no_grad, where
+    # nn.TransformerEncoder switches to its fused path and the graphs differ;
+    # check_parity compares the saved graph against the eager model instead.
+    torch.jit.trace(module, inputs, check_trace=False).save(path)
+
+
+def export_onnx(module: nn.Module, inputs: Tuple[torch.Tensor, ...], path: str,
+                input_names: List[str], dynamic_axes: Dict[str, Dict[int, str]]) -> None:
+    torch.onnx.export(
+        module,
+        inputs,
+        path,
+        input_names=input_names,
+        output_names=["output"],
+        dynamic_axes={**dynamic_axes, "output": {0: "batch"}},
+        opset_version=18,
+        # The TorchScript-based exporter bakes the traced sequence length into
+        # the attention reshapes, so only the export shape would run.
+        dynamo=True,
+    )
+
+
+def check_parity(module: nn.Module, path: str, backend: str, inputs: Tuple[np.ndarray, ...]) -> float:
+    expected = TorchBackend(module)(*inputs)
+    actual = load_exported(path, backend, settings.inference_threads)(*inputs)
+    return float(np.abs(expected - actual).max())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--checkpoint", default=settings.model_path)
+    parser.add_argument("--output-dir", default=settings.exported_models_dir)
+    parser.add_argument("--formats", nargs="+", choices=list(EXPORT_SUFFIXES), default=list(EXPORT_SUFFIXES))
+    parser.add_argument("--atol", type=float, default=1e-3)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    frames = np.random.rand(2, 3, 224, 224).astype(np.float32)
+    features = np.random.randn(2, 60, 1792).astype(np.float32)
+    mask = np.zeros((2, 60), dtype=bool)
+    mask[1, 45:] = True
+
+    models = [
+        (BACKBONE_NAME, load_backbone(), (frames,), ["frames"], {"frames": {0: "batch"}}),
+        (model_name(args.checkpoint), load_model(args.checkpoint), (features, mask),
+         ["features", "padding_mask"], {"features": {0: "batch", 1: "frames"}, "padding_mask": {0: "batch", 1: "frames"}}),
+    ]
+
+    failed = False
+    for name, module, inputs, input_names, dynamic_axes in models:
+        # Tracing with autograd enabled keeps nn.TransformerEncoder off its fused
+        # fast path, which neither TorchScript tracing nor ONNX can represent.
+        tensors = tuple(torch.from_numpy(x) for x in inputs)
+        for backend in args.formats:
+            path = exported_path(args.output_dir, name, backend)
+            if backend == "torchscript":
+                export_torchscript(module, tensors, path)
+            else:
+                export_onnx(module, tensors, path, input_names, dynamic_axes)
+
+            diff = check_parity(module, path, backend, inputs)
+            status = "ok" if diff <= args.atol else "MISMATCH"
+            print(f"{path}: max abs diff {diff:.2e} ({status})")
+            failed = failed or diff > args.atol
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
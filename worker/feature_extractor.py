@@ -0,0 +1,106 @@
+from typing import Callable, Iterator, Optional
+import cv2
+import numpy as np
+import torch
+from torchvision.models import efficientnet_b4, EfficientNet_B4_Weights
+from src.core.config import settings
+from src.utils.cpu_budget import inference_threads
+from .backends import BACKBONE_NAME, InferenceBackend, TorchBackend, TorchScriptBackend, exported_path, load_exported
+from .frame_sampler import FrameSampler, get_frame_sampler
+from .preprocessing import FramePreprocessor
+from .quantization import QUANTIZED_BACKBONE_NAME
+
+
+def load_backbone() -> torch.nn.Module:
+    weights = EfficientNet_B4_Weights[settings.backbone_weights]
+    model = efficientnet_b4(weights=weights)
+    model.classifier = torch.nn.Identity()
+    model.eval()
+    return model
+
+
+def load_backbone_backend(backend: str) -> InferenceBackend:
+    if backend == "torch" and settings.inference_quantized:
+        path = exported_path(settings.exported_models_dir, QUANTIZED_BACKBONE_NAME, "torchscript")
+        return TorchScriptBackend(path, optimize=False)
+    if backend == "torch":
+        return TorchBackend(load_backbone())
+    path = exported_path(settings.exported_models_dir, BACKBONE_NAME, backend)
+    return load_exported(path, backend, inference_threads(settings))
+
+
+class FeatureExtractor:
+    """
+    EfficientNet-B4 frame feature extractor used by the worker pipeline.
+    """
+
+    def __init__(self, sampler: FrameSampler, preprocessor: FramePreprocessor, backbone: InferenceBackend, chunk_size: int = 16):
+        self.sampler = sampler
+        self.preprocessor = preprocessor
+        self.backbone = backbone
+        self.chunk_size = chunk_size
+
+
+    def frame_batches(self, video_url: str) -> Iterator[np.ndarray]:
+        """
+        Yield preprocessed [N, 3, 224, 224] batches of at most chunk_size sampled frames.
+
+        Frames are resized into a single reusable buffer as they are decoded and
+        the decoded frame is dropped right away, so peak memory is bounded by
+        chunk_size rather than by the number of sampled frames.
+        """
+        cap = cv2.VideoCapture(video_url)
+        buffer = self.preprocessor.new_buffer(self.chunk_size)
+        count = 0
+        try:
+            for frame in self.sampler.sample(cap):
+                self.preprocessor.write(buffer, count, frame)
+                count += 1
+                if count == self.chunk_size:
+                    yield self.preprocessor.to_array(buffer)
+                    count = 0
+            if count:
+                yield self.preprocessor.to_array(buffer[:count])
+        finally:
+            cap.release()
+
+
+    def extract_features_from_video(self, video_url: str, progress: Optional[Callable[[int, int], None]] = None) -> np.ndarray:
+        """
+        Stream sampled frames through the backbone chunk by chunk and return [N, 1792] features.
+
+        progress, if given, is called with (frames_decoded, features_extracted)
+        after each chunk is decoded and after it passes the backbone.
+        """
+        features = []
+        extracted = 0
+        for batch in self.frame_batches(video_url):
+            if progress:
+                progress(extracted + len(batch), extracted)
+            features.append(self.backbone(batch))
+            extracted += len(batch)
+            if progress:
+                progress(extracted, extracted)
+
+        if len(features) == 0:
+            raise ValueError("⚠️ Не удалось извлечь кадры из видео")
+
+        return np.concatenate(features)
+
+
+_feature_extractor = None
+
+
+def get_feature_extractor() -> FeatureExtractor:
+    """
+    Return the per-process feature extractor, loading the backbone on first use.
+    """
+    global _feature_extractor
+    if _feature_extractor is None:
+        _feature_extractor = FeatureExtractor(
+            get_frame_sampler(settings.frame_sampling_strategy, settings.frame_sample_count),
+            FramePreprocessor(normalize=settings.backbone_imagenet_normalize),
+            load_backbone_backend(settings.inference_backend),
+            chunk_size=settings.backbone_chunk_size,
+        )
+    return _feature_extractor
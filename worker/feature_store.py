@@ -0,0 +1,97 @@
+import os
+import tempfile
+from typing import Iterator, Optional
+import numpy as np
+
+
+class FeatureStore:
+    """
+    Content-addressed on-disk store of backbone feature matrices.
+
+    Each [N, 1792] matrix is saved as an .npy file under
+
+        <root>/<backbone_id>/<sampling_id>/<hash[:2]>/<hash>.npy
+
+    so that a new classifier checkpoint can be scored against every stored
+    video without decoding or running the backbone again. Reads are
+    memory-mapped; writes go through a temporary file and an atomic rename.
+
+    The whole root, including matrices of older backbones, is kept under
+    max_bytes: reads bump a file's mtime and every write removes the least
+    recently used files past the budget.
+    """
+
+    def __init__(self, root: str, backbone_id: str, sampling_id: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.directory = os.path.join(root, self._safe(backbone_id), self._safe(sampling_id))
+
+
+    @staticmethod
+    def _safe(value: str) -> str:
+        return value.replace(os.sep, "_").replace(":", "-")
+
+
+    def path(self, content_hash: str) -> str:
+        return os.path.join(self.directory, content_hash[:2], f"{content_hash}.npy")
+
+
+    def get(self, content_hash: str) -> Optional[np.ndarray]:
+        path = self.path(content_hash)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return np.load(path, mmap_mode="r")
+
+
+    def put(self, content_hash: str, features: np.ndarray) -> None:
+        path = self.path(content_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(features, dtype=np.float32))
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        self.evict(keep=path)
+
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        entries = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if not name.endswith(".npy"):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+    def hashes(self) -> Iterator[str]:
+        """
+        Yield the content hashes of every stored matrix.
+        """
+        if not os.path.isdir(self.directory):
+            return
+        for prefix in sorted(os.listdir(self.directory)):
+            for name in sorted(os.listdir(os.path.join(self.directory, prefix))):
+                if name.endswith(".npy"):
+                    yield name[:-len(".npy")]
@@ -0,0 +1,142 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Type
+import cv2
+import numpy as np
+
+
+def read_frames(cap: cv2.VideoCapture, indices: List[int], seek_threshold: int) -> Iterator[np.ndarray]:
+    """
+    Decode only the requested frames, in ascending order.
+
+    Short gaps are skipped with cap.grab(), which demuxes and decodes without
+    the colour conversion and copy of cap.read(); gaps longer than
+    seek_threshold frames seek instead.
+    """
+    position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+    for index in indices:
+        gap = index - position
+        if gap < 0 or gap > seek_threshold:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+            position = index
+        while position < index:
+            if not cap.grab():
+                return
+            position += 1
+        ret, frame = cap.read()
+        if not ret:
+            return
+        position += 1
+        yield frame
+
+
+class FrameSampler(ABC):
+    """
+    Abstract base class for frame sampling strategies.
+    """
+
+    def __init__(self, max_frames: int = 60, seek_threshold: int = 30):
+        self.max_frames = max_frames
+        self.seek_threshold = seek_threshold
+
+
+    @abstractmethod
+    def select_indices(self, cap: cv2.VideoCapture) -> List[int]:
+        """
+        Return the ascending frame indices to decode.
+        """
+        pass
+
+
+    def sample(self, cap: cv2.VideoCapture) -> Iterator[np.ndarray]:
+        """
+        Yield the sampled BGR frames.
+        """
+        yield from read_frames(cap, self.select_indices(cap), self.seek_threshold)
+
+
+    @staticmethod
+    def frame_count(cap: cv2.VideoCapture) -> int:
+        return max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+
+
+class FirstSecondsSampler(FrameSampler):
+    """
+    One frame per second from the start of the video, up to max_frames.
+    """
+
+    def select_indices(self, cap: cv2.VideoCapture) -> List[int]:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        interval = int(fps) if fps > 0 else 1
+        indices = [i * interval for i in range(self.max_frames)]
+        total = self.frame_count(cap)
+        if total:
+            indices = [i for i in indices if i < total]
+        return indices
+
+
+class UniformSampler(FrameSampler):
+    """
+    max_frames frames spread evenly across the whole duration.
+
+    Falls back to FirstSecondsSampler when the container does not report a frame count.
+    """
+
+    def select_indices(self, cap: cv2.VideoCapture) -> List[int]:
+        total = self.frame_count(cap)
+        if not total:
+            return FirstSecondsSampler(self.max_frames, self.seek_threshold).select_indices(cap)
+        if total <= self.max_frames:
+            return list(range(total))
+        return np.unique(np.linspace(0, total - 1, self.max_frames).round().astype(int)).tolist()
+
+
+class SceneChangeSampler(FrameSampler):
+    """
+    Scene-change-aware sampling.
+
+    Scores oversample * max_frames uniformly spaced candidates by how much a
+    small grayscale thumbnail differs from the previous candidate, then keeps
+    the highest-scoring candidate in each of max_frames equal segments, so
+    cuts are favoured without losing coverage of the whole clip.
+    """
+
+    def __init__(self, max_frames: int = 60, seek_threshold: int = 30, oversample: int = 4):
+        super().__init__(max_frames, seek_threshold)
+        self.oversample = oversample
+
+
+    def select_indices(self, cap: cv2.VideoCapture) -> List[int]:
+        candidates = UniformSampler(self.max_frames * self.oversample, self.seek_threshold).select_indices(cap)
+        if len(candidates) <= self.max_frames:
+            return candidates
+
+        scores = []
+        previous = None
+        for frame in read_frames(cap, candidates, self.seek_threshold):
+            thumb = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (64, 36), interpolation=cv2.INTER_AREA)
+            thumb = thumb.astype(np.float32)
+            scores.append(np.inf if previous is None else float(np.abs(thumb - previous).mean()))
+            previous = thumb
+        candidates = candidates[:len(scores)]
+        if len(candidates) <= self.max_frames:
+            return candidates
+
+        indices = []
+        for segment in np.array_split(np.arange(len(candidates)), self.max_frames):
+            best = max(segment, key=lambda i: scores[i])
+            indices.append(candidates[best])
+        return indices
+
+
+FRAME_SAMPLERS: Dict[str, Type[FrameSampler]] = {
+    "first": FirstSecondsSampler,
+    "uniform": UniformSampler,
+    "scene": SceneChangeSampler,
+}
+
+
+def get_frame_sampler(strategy: str, max_frames: int = 60) -> FrameSampler:
+    try:
+        return FRAME_SAMPLERS[strategy](max_frames=max_frames)
+    except KeyError:
+        raise ValueError(f"Unknown frame sampling strategy: {strategy}")
@@ -0,0 +1,83 @@
+import os
+import threading
+from typing import Callable, Dict, Tuple
+from src.core.config import settings
+from src.utils.cpu_budget import inference_threads
+from src.core.logger.logger import logger
+from .backends import InferenceBackend, TorchBackend, exported_path, load_exported, model_name
+from .classifier import load_model
+from .quantization import quantize_classifier
+
+
+class ModelRegistry:
+    """
+    Per-process cache of loaded classifiers.
+
+    Entries are keyed by the file actually loaded (the checkpoint, or its
+    exported graph for non-eager backends) and validated against that file's
+    mtime and size, so a replaced file is reloaded on the next lookup.
+    """
+
+    def __init__(self, loader: Callable[[str], InferenceBackend], resolve: Callable[[str], str] = lambda path: path):
+        self.loader = loader
+        self.resolve = resolve
+        self._models: Dict[str, Tuple[Tuple[int, int], InferenceBackend]] = {}
+        self._lock = threading.Lock()
+
+
+    def _version(self, model_path: str) -> Tuple[int, int]:
+        stat = os.stat(model_path)
+        return stat.st_mtime_ns, stat.st_size
+
+
+    def get(self, model_path: str) -> InferenceBackend:
+        """
+        Return the model for the given checkpoint, loading or reloading it if needed.
+        """
+        path = os.path.abspath(self.resolve(model_path))
+        version = self._version(path)
+        cached = self._models.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        with self._lock:
+            cached = self._models.get(path)
+            if cached and cached[0] == version:
+                return cached[1]
+            model = self.loader(path)
+            self._models[path] = (version, model)
+            return model
+
+
+    def preload(self, *model_paths: str) -> None:
+        """
+        Load the given checkpoints ahead of the first task.
+        """
+        for model_path in model_paths:
+            if not os.path.exists(self.resolve(model_path)):
+                logger.warning(f"Model checkpoint not found, skipping preload: {model_path}")
+                continue
+            self.get(model_path)
+
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+def resolve_classifier(model_path: str) -> str:
+    if settings.inference_backend == "torch":
+        return model_path
+    return exported_path(settings.exported_models_dir, model_name(model_path), settings.inference_backend)
+
+
+def load_classifier(path: str) -> InferenceBackend:
+    if settings.inference_backend == "torch":
+        model = load_model(path)
+        if settings.inference_quantized:
+            model = quantize_classifier(model)
+        return TorchBackend(model)
+    return load_exported(path, settings.inference_backend, inference_threads(settings))
+
+
+model_registry = ModelRegistry(load_classifier, resolve_classifier)
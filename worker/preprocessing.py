@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+
+
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+
+class FramePreprocessor:
+    """
+    Batched frame preprocessing for the backbone.
+
+    Frames are resized with cv2 straight into a preallocated uint8 buffer
+    [N, size, size, 3] (BGR, as decoded); the whole buffer is then converted
+    to a float32 array [N, 3, size, size] in [0, 1] in one vectorised pass.
+    ImageNet mean/std normalization is off by default because the shipped
+    classifier was trained on unnormalized backbone features.
+    """
+
+    def __init__(self, size: int = 224, normalize: bool = False):
+        self.size = size
+        self.normalize = normalize
+        self.mean = np.array(IMAGENET_MEAN, dtype=np.float32).reshape(1, 3, 1, 1)
+        self.std = np.array(IMAGENET_STD, dtype=np.float32).reshape(1, 3, 1, 1)
+
+
+    def new_buffer(self, count: int) -> np.ndarray:
+        return np.empty((count, self.size, self.size, 3), dtype=np.uint8)
+
+
+    def write(self, buffer: np.ndarray, index: int, frame: np.ndarray) -> None:
+        """
+        Resize a BGR frame into slot index of the buffer.
+        """
+        cv2.resize(frame, (self.size, self.size), dst=buffer[index], interpolation=cv2.INTER_AREA)
+
+
+    def to_array(self, buffer: np.ndarray) -> np.ndarray:
+        """
+        Convert a filled BGR uint8 buffer into an RGB float32 array in NCHW layout.
+        """
+        x = np.ascontiguousarray(buffer[..., ::-1].transpose(0, 3, 1, 2), dtype=np.float32)
+        x *= 1 / 255
+        if self.normalize:
+            x -= self.mean
+            x /= self.std
+        return x
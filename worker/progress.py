@@ -0,0 +1,74 @@
+import time
+from typing import Dict, Optional
+from celery import Task
+from src.core.logger.logger import logger
+from .task_events import publish_task_event
+
+
+PROGRESS_STATE = "PROGRESS"
+
+
+class ProgressTracker:
+    """
+    Reports pipeline stages, frame counters and per-stage timings for a running task.
+
+    Every report is stored with update_state (custom PROGRESS state) and published
+    as a task event. Counter updates are throttled to one per min_interval seconds;
+    stage changes are always reported.
+    """
+
+    def __init__(self, task: Task, min_interval: float = 0.5):
+        self.task = task
+        self.min_interval = min_interval
+        self.stage_name: Optional[str] = None
+        self.stage_started = time.monotonic()
+        self.timings: Dict[str, float] = {}
+        self.frames_decoded = 0
+        self.features_extracted = 0
+        self._last_report = 0.0
+
+
+    def stage(self, name: str) -> None:
+        self._close_stage()
+        self.stage_name = name
+        self._report()
+
+
+    def frames(self, decoded: int, extracted: int) -> None:
+        self.frames_decoded = decoded
+        self.features_extracted = extracted
+        if time.monotonic() - self._last_report >= self.min_interval:
+            self._report()
+
+
+    def finish(self) -> Dict[str, float]:
+        self._close_stage()
+        self.stage_name = None
+        logger.info(f"Task {self.task.request.id} stage timings: {self.timings}")
+        return self.timings
+
+
+    def as_dict(self) -> dict:
+        return {
+            "stage": self.stage_name,
+            "frames_decoded": self.frames_decoded,
+            "features_extracted": self.features_extracted,
+            "timings": dict(self.timings),
+        }
+
+
+    def _close_stage(self) -> None:
+        now = time.monotonic()
+        if self.stage_name is not None:
+            self.timings[self.stage_name] = round(now - self.stage_started, 3)
+        self.stage_started = now
+
+
+    def _report(self) -> None:
+        self._last_report = time.monotonic()
+        progress = self.as_dict()
+        task_id = self.task.request.id
+        if task_id is None:
+            return
+        self.task.update_state(state=PROGRESS_STATE, meta=progress)
+        publish_task_event(task_id, "processing", progress=progress)
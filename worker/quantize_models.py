@@ -0,0 +1,139 @@
+"""
+Calibrate the int8 backbone on sample videos and report int8 vs float results.
+
+    python -m worker.quantize_models --videos samples/ --labels samples/labels.csv
+
+Quantizes the EfficientNet-B4 backbone statically using frames from the first
+--calibration-videos clips and saves it to EXPORTED_MODELS_DIR as
+efficientnet_b4.int8.ts. The classifier is quantized dynamically at load time
+and needs no artifact. Every clip is then scored by the float and the int8
+pipelines. The report covers label agreement, probability drift, latency and,
+when a labels CSV (video,label) is given, accuracy for both.
+"""
+import argparse
+import copy
+import csv
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+import numpy as np
+import torch
+from src.core.config import settings
+from .backends import InferenceBackend, TorchBackend, TorchScriptBackend, exported_path
+from .batching import pad_features
+from .classifier import load_model
+from .feature_extractor import FeatureExtractor, load_backbone
+from .frame_sampler import get_frame_sampler
+from .preprocessing import FramePreprocessor
+from .quantization import QUANTIZED_BACKBONE_NAME, quantize_backbone, quantize_classifier
+
+
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv", ".webm")
+
+
+def list_videos(directory: str) -> List[str]:
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.lower().endswith(VIDEO_EXTENSIONS)
+    )
+
+
+def read_labels(path: Optional[str]) -> Dict[str, str]:
+    if not path:
+        return {}
+    with open(path, newline="") as f:
+        return {row["video"]: row["label"].upper() for row in csv.DictReader(f)}
+
+
+def score(extractor: FeatureExtractor, classifier: InferenceBackend, video: str) -> Dict[str, float]:
+    start = time.perf_counter()
+    features = extractor.extract_features_from_video(video)
+    x, padding_mask = pad_features([features])
+    prob = float(classifier(x, padding_mask)[0])
+    return {"prob": round(prob, 4), "seconds": round(time.perf_counter() - start, 3)}
+
+
+def summarize(rows: List[dict], labels: Dict[str, str]) -> dict:
+    float_probs = np.array([row["float"]["prob"] for row in rows])
+    int8_probs = np.array([row["int8"]["prob"] for row in rows])
+    float_seconds = np.mean([row["float"]["seconds"] for row in rows])
+    int8_seconds = np.mean([row["int8"]["seconds"] for row in rows])
+    summary = {
+        "videos": len(rows),
+        "label_agreement": float(np.mean((float_probs > 0.5) == (int8_probs > 0.5))),
+        "mean_abs_prob_diff": float(np.abs(float_probs - int8_probs).mean()),
+        "max_abs_prob_diff": float(np.abs(float_probs - int8_probs).max()),
+        "float_seconds_per_video": float(float_seconds),
+        "int8_seconds_per_video": float(int8_seconds),
+        "speedup": float(float_seconds / int8_seconds) if int8_seconds else None,
+    }
+
+    labelled = [row for row in rows if os.path.basename(row["video"]) in labels]
+    if labelled:
+        for mode in ("float", "int8"):
+            correct = [
+                ("FAKE" if row[mode]["prob"] > 0.5 else "REAL") == labels[os.path.basename(row["video"])]
+                for row in labelled
+            ]
+            summary[f"{mode}_accuracy"] = float(np.mean(correct))
+        summary["labelled_videos"] = len(labelled)
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", required=True, help="Directory with sample videos")
+    parser.add_argument("--labels", help="CSV with video,label columns (REAL/FAKE)")
+    parser.add_argument("--checkpoint", default=settings.model_path)
+    parser.add_argument("--output-dir", default=settings.exported_models_dir)
+    parser.add_argument("--calibration-videos", type=int, default=20)
+    parser.add_argument("--report", default="quantization_report.json")
+    args = parser.parse_args(argv)
+
+    videos = list_videos(args.videos)
+    if not videos:
+        print(f"No videos found in {args.videos}")
+        return 1
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    sampler = get_frame_sampler(settings.frame_sampling_strategy, settings.frame_sample_count)
+    preprocessor = FramePreprocessor(normalize=settings.backbone_imagenet_normalize)
+    float_backbone = load_backbone()
+    float_extractor = FeatureExtractor(sampler, preprocessor, TorchBackend(float_backbone), settings.backbone_chunk_size)
+
+    calibration = (
+        batch
+        for video in videos[:args.calibration_videos]
+        for batch in float_extractor.frame_batches(video)
+    )
+    quantized = quantize_backbone(copy.deepcopy(float_backbone), calibration)
+    path = exported_path(args.output_dir, QUANTIZED_BACKBONE_NAME, "torchscript")
+    with torch.no_grad():
+        torch.jit.trace(quantized, torch.zeros(1, 3, 224, 224)).save(path)
+    print(f"Saved quantized backbone to {path}")
+
+    int8_extractor = FeatureExtractor(sampler, preprocessor, TorchScriptBackend(path, optimize=False), settings.backbone_chunk_size)
+    float_classifier = TorchBackend(load_model(args.checkpoint))
+    int8_classifier = TorchBackend(quantize_classifier(load_model(args.checkpoint)))
+
+    rows = []
+    for video in videos:
+        rows.append({
+            "video": video,
+            "float": score(float_extractor, float_classifier, video),
+            "int8": score(int8_extractor, int8_classifier, video),
+        })
+
+    report = {"summary": summarize(rows, read_labels(args.labels)), "videos": rows}
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["summary"], indent=2))
+    print(f"Report written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
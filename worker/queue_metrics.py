@@ -0,0 +1,20 @@
+import time
+from src.core.cache.keys import queue_wait_key
+from src.core.config import settings
+from src.core.logger.logger import logger
+from .database import get_redis
+
+
+def record_queue_wait(priority_class: str, enqueued_at: float) -> None:
+    """
+    Keep the latest queue-wait samples (in seconds) of a scheduling class in Redis.
+    """
+    wait = max(0.0, time.time() - enqueued_at)
+    key = queue_wait_key(priority_class)
+    try:
+        pipe = get_redis().pipeline()
+        pipe.lpush(key, round(wait, 3))
+        pipe.ltrim(key, 0, settings.queue_wait_samples - 1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to record queue wait for {priority_class}: {e}")
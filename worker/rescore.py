@@ -0,0 +1,48 @@
+"""
+Score every video in the feature store with a classifier checkpoint.
+
+    python -m worker.rescore --checkpoint models/new_model.pt --model-version 2
+
+Reads stored backbone features for the current sampling and backbone
+settings, so no video is decoded and the backbone never runs. Results are
+written to the content-hash result cache under the given model version,
+which the API starts serving once MODEL_VERSION is switched to it.
+"""
+import argparse
+import sys
+from itertools import islice
+from src.core.config import settings
+from .celery_tasks import classify_batch, feature_store
+from .result_cache import store_cached_result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--checkpoint", required=True)
+    parser.add_argument("--model-version", required=True)
+    parser.add_argument("--batch-size", type=int, default=settings.predict_batch_size)
+    args = parser.parse_args(argv)
+
+    model_version = settings.analysis_version(args.model_version)
+    hashes = feature_store.hashes()
+    scored = 0
+    while True:
+        batch = list(islice(hashes, args.batch_size))
+        if not batch:
+            break
+        # Matrices evicted since they were listed are skipped.
+        stored = [(h, features) for h in batch if (features := feature_store.get(h)) is not None]
+        if not stored:
+            continue
+        results = classify_batch(args.checkpoint, [features for _, features in stored])
+        for (content_hash, _), (label, prob) in zip(stored, results):
+            store_cached_result(content_hash, model_version, label, prob)
+        scored += len(stored)
+        print(f"Scored {scored} videos")
+
+    print(f"Done: {scored} videos scored as {model_version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
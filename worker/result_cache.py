@@ -0,0 +1,24 @@
+import json
+from sqlalchemy.dialects.postgresql import insert
+from src.core.cache.keys import result_cache_key
+from src.core.config import settings
+from src.models.analysis_cache_model import AnalysisCacheModel
+from .database import get_redis, get_session_factory
+
+
+def store_cached_result(content_hash: str, model_version: str, prediction: str, confidence: float) -> None:
+    """
+    Write a finished prediction to the content-hash result cache (Postgres and Redis).
+    """
+    with get_session_factory()() as session:
+        query = insert(AnalysisCacheModel).values(
+            content_hash=content_hash,
+            model_version=model_version,
+            prediction=prediction,
+            confidence=confidence,
+        ).on_conflict_do_nothing(index_elements=["content_hash", "model_version"])
+        session.execute(query)
+        session.commit()
+
+    value = json.dumps({"prediction": prediction, "confidence": confidence})
+    get_redis().set(result_cache_key(content_hash, model_version), value, ex=settings.result_cache_ttl)
@@ -0,0 +1,110 @@
+import queue
+import threading
+import time
+from typing import Callable, List, Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from src.core.logger.logger import logger
+from src.models.analysis_result_model import AnalysisResultModel
+
+
+class AnalysisResultWriter:
+    """
+    Buffers finished predictions and inserts them into analysis_results in batches.
+
+    Rows from consecutive tasks of the same worker process are collected for
+    up to flush_interval_ms or batch_size rows and written with one
+    multi-row INSERT by a background thread. A failed INSERT is retried
+    with exponential backoff; if it keeps failing the rows are inserted one
+    by one, so a single bad row only loses itself.
+    """
+
+    def __init__(self, session_factory: Callable[[], Callable[[], Session]], batch_size: int, flush_interval_ms: int,
+                 retries: int = 3, retry_backoff_ms: int = 200):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.retries = retries
+        self.retry_backoff = retry_backoff_ms / 1000
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+
+    def add(self, video_id: int, task_id: str, prediction: str, confidence: float) -> None:
+        self._ensure_started()
+        self._queue.put({
+            "video_id": video_id,
+            "task_id": task_id,
+            "prediction": prediction,
+            "confidence": confidence,
+        })
+
+
+    def close(self) -> None:
+        """
+        Flush pending rows and stop the writer thread.
+        """
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="analysis-result-writer", daemon=True)
+                self._thread.start()
+
+
+    def _insert(self, rows: List[dict]) -> None:
+        with self.session_factory()() as session:
+            # Late acks can run a task twice; keep the first row per task.
+            session.execute(insert(AnalysisResultModel).on_conflict_do_nothing(index_elements=["task_id"]), rows)
+            session.commit()
+
+
+    def _write(self, rows: List[dict]) -> None:
+        for attempt in range(self.retries + 1):
+            try:
+                self._insert(rows)
+                return
+            except Exception as e:
+                logger.warning(f"Failed to persist {len(rows)} analysis results (attempt {attempt + 1}): {e}")
+                if attempt < self.retries:
+                    time.sleep(self.retry_backoff * 2 ** attempt)
+
+        for row in rows:
+            try:
+                self._insert([row])
+            except Exception as e:
+                logger.error(f"Failed to persist analysis result of task {row['task_id']}: {e}")
+
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            rows = []
+            first = self._queue.get()
+            if first is None:
+                break
+            rows.append(first)
+            deadline = time.monotonic() + self.flush_interval
+            while len(rows) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    row = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                rows.append(row)
+            self._write(rows)
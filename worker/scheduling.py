@@ -0,0 +1,42 @@
+from typing import Dict, List
+from kombu.utils.scheduling import round_robin_cycle
+from src.core.config import settings
+from src.inference.scheduling import queue_weights
+
+
+class WeightedCycle(round_robin_cycle):
+    """
+    Queue order for the Redis transport that serves queues in proportion to their weights.
+
+    Each BRPOP lists the consumed queues in the order given by consume() and
+    takes from the first non-empty one. Ordering uses stride scheduling: a
+    delivery from a queue moves its pass forward by 1 / weight and queues are
+    listed by pass, lowest first. With every queue backlogged, deliveries
+    split by weight; an empty queue never keeps a worker from the others,
+    and is caught up to the current virtual time so it can't bank a burst
+    while idle.
+
+    Enabled with broker_transport_options={'queue_order_strategy': 'worker.scheduling:WeightedCycle'}.
+    """
+
+    def __init__(self, it=None, weights: Dict[str, int] = None):
+        super().__init__(it)
+        self.weights = weights if weights is not None else queue_weights(settings)
+        self.passes: Dict[str, float] = {}
+        self.virtual_time = 0.0
+
+
+    def _pass(self, queue: str) -> float:
+        return max(self.passes.get(queue, 0.0), self.virtual_time)
+
+
+    def consume(self, n: int) -> List[str]:
+        items = self.items[:n]
+        return sorted(items, key=lambda queue: (self._pass(queue), -self.weights.get(queue, 1)))
+
+
+    def rotate(self, last_used: str) -> str:
+        if last_used in self.items:
+            self.virtual_time = self._pass(last_used)
+            self.passes[last_used] = self.virtual_time + 1 / self.weights.get(last_used, 1)
+        return last_used
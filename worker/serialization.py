@@ -0,0 +1,93 @@
+import json
+import struct
+from typing import List
+import numpy as np
+from kombu.serialization import register
+
+
+SERIALIZER_NAME = "ndarray"
+CONTENT_TYPE = "application/x-lookout-ndarray"
+
+_HEADER = struct.Struct("!I")
+
+
+class NdarraySerializer:
+    """
+    Celery/kombu serializer that ships numpy arrays as raw bytes.
+
+    The payload is a JSON header followed by the concatenated array buffers:
+
+        [4-byte header length][JSON header][buffer 0][buffer 1]...
+
+    In the header each array is replaced by {"__ndarray__": index, "dtype", "shape"}.
+    Floating-point arrays are cast to float_dtype on the way out. A 60x1792
+    float32 feature matrix is ~430KB, ~575KB once the Redis transport
+    base64-encodes the message body, against ~2MB as a JSON list. float16
+    halves that but is lossy, so predictions may shift slightly.
+    """
+
+    def __init__(self, float_dtype: str = "float32"):
+        self.float_dtype = np.dtype(float_dtype)
+
+
+    def dumps(self, obj) -> bytes:
+        buffers: List[bytes] = []
+
+        def default(value):
+            if isinstance(value, np.ndarray):
+                if np.issubdtype(value.dtype, np.floating):
+                    value = value.astype(self.float_dtype, copy=False)
+                value = np.ascontiguousarray(value)
+                buffers.append(value.tobytes())
+                return {"__ndarray__": len(buffers) - 1, "dtype": value.dtype.str, "shape": list(value.shape)}
+            if isinstance(value, np.generic):
+                return value.item()
+            raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+        header = json.dumps(obj, default=default).encode("utf-8")
+        return b"".join([_HEADER.pack(len(header)), header, *buffers])
+
+
+    def loads(self, data: bytes):
+        data = bytearray(data)
+        (header_len,) = _HEADER.unpack_from(data)
+        view = memoryview(data)
+        offset = _HEADER.size + header_len
+        specs = []
+
+        def object_hook(value):
+            if "__ndarray__" in value:
+                specs.append(value)
+            return value
+
+        obj = json.loads(bytes(view[_HEADER.size:offset]), object_hook=object_hook)
+
+        arrays = {}
+        for spec in sorted(specs, key=lambda s: s["__ndarray__"]):
+            dtype = np.dtype(spec["dtype"])
+            size = int(np.prod(spec["shape"])) * dtype.itemsize
+            arrays[spec["__ndarray__"]] = np.frombuffer(view[offset:offset + size], dtype=dtype).reshape(spec["shape"])
+            offset += size
+
+        return self._restore(obj, arrays)
+
+
+    def _restore(self, obj, arrays):
+        if isinstance(obj, dict):
+            if "__ndarray__" in obj:
+                return arrays[obj["__ndarray__"]]
+            return {key: self._restore(value, arrays) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [self._restore(value, arrays) for value in obj]
+        return obj
+
+
+def register_ndarray_serializer(float_dtype: str = "float32") -> None:
+    serializer = NdarraySerializer(float_dtype)
+    register(
+        SERIALIZER_NAME,
+        serializer.dumps,
+        serializer.loads,
+        content_type=CONTENT_TYPE,
+        content_encoding="binary",
+    )
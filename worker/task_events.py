@@ -0,0 +1,40 @@
+import json
+from celery.signals import task_failure, task_prerun, task_success
+from src.core.events.channels import task_events_channel
+from src.core.logger.logger import logger
+from .database import get_redis
+
+
+# Only analyses are streamed to clients; predict and rescore return bare results.
+STREAMED_TASKS = {"worker.celery_tasks.analyze_video"}
+
+
+def publish_task_event(task_id: str, status: str, result=None, progress: dict = None) -> None:
+    """
+    Publish a ModelSchema-shaped state change for API result streams.
+    """
+    payload = json.dumps({"status": status, "result": result, "task_id": task_id, "progress": progress})
+    try:
+        get_redis().publish(task_events_channel(task_id), payload)
+    except Exception as e:
+        logger.warning(f"Failed to publish event for task {task_id}: {e}")
+
+
+@task_prerun.connect
+def on_task_prerun(sender=None, task_id=None, **kwargs):
+    if sender.name in STREAMED_TASKS:
+        publish_task_event(task_id, "processing")
+
+
+@task_success.connect
+def on_task_success(sender=None, result=None, **kwargs):
+    if sender.name not in STREAMED_TASKS:
+        return
+    label, prob = result
+    publish_task_event(sender.request.id, "success", {"prediction": label, "confidence": prob})
+
+
+@task_failure.connect
+def on_task_failure(sender=None, task_id=None, exception=None, **kwargs):
+    if sender.name in STREAMED_TASKS:
+        publish_task_event(task_id, "failed", str(exception))
@@ -0,0 +1,170 @@
+import hashlib
+import os
+import tempfile
+from typing import Callable, List, Optional
+from boto3.s3.transfer import TransferConfig
+from src.core.config import settings
+from src.core.logger.logger import logger
+from src.core.storage.local_storage import LocalStorage
+from src.core.storage.s3_storage import BaseS3Storage
+from src.core.storage.storage import Storage
+from src.core.storage.storage_factory import create_storage
+from src.utils.video_url import is_allowed_video_url
+from .database import get_s3_client
+
+
+VIDEO_READ_MODES = ("cache", "stream")
+
+
+class VideoCache:
+    """
+    LRU scratch-disk cache of downloaded videos, shared by all pool processes.
+
+    Files are named by a hash of their storage key and version (the object's
+    ETag), so a re-uploaded object is never served from its old file, and
+    their mtime is bumped on every hit; once the directory grows past max_bytes the least recently used
+    files are removed. Downloads land in a temporary file and are renamed into
+    place, so readers never see a partial video. A file evicted while a reader
+    still has it open stays readable until it is closed.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+
+
+    def path(self, key: str, version: str) -> str:
+        digest = hashlib.sha256(f"{key}\0{version}".encode()).hexdigest()
+        return os.path.join(self.root, digest + os.path.splitext(key)[1].lower())
+
+
+    def get(self, key: str, version: str) -> Optional[str]:
+        path = self.path(key, version)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+
+    def put(self, key: str, version: str, download: Callable[[str], None]) -> str:
+        """
+        Fill the entry for key and version by calling download with a temporary path.
+        """
+        path = self.path(key, version)
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        os.close(fd)
+        try:
+            download(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.evict(keep=path)
+        return path
+
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class VideoSource:
+    """
+    Turns a stored video's URL into something cv2.VideoCapture can open.
+
+    Videos in our own bucket are read with the worker's credentials instead of
+    through their public URL: in "cache" mode they are downloaded once with
+    concurrent ranged GETs into the VideoCache, so retries of the same video
+    read from local disk; in "stream" mode OpenCV gets a presigned GET URL and
+    FFmpeg fetches only the byte ranges it seeks to. Local storage files are
+    opened in place. Other URLs are passed through unchanged only if they are
+    http(s) URLs of an allowed host, so OpenCV never reads local files or
+    internal services on a client's behalf.
+    """
+
+    def __init__(self, storage: Storage, cache: VideoCache, mode: str = "cache", presign_expires: int = 3600,
+                 allowed_hosts: List[str] = ()):
+        if mode not in VIDEO_READ_MODES:
+            raise ValueError(f"Unknown video read mode {mode!r}, expected one of {VIDEO_READ_MODES}")
+        self.storage = storage
+        self.cache = cache
+        self.mode = mode
+        self.presign_expires = presign_expires
+        self.allowed_hosts = allowed_hosts
+
+
+    def open(self, video_url: str) -> str:
+        key = self.storage.key_for(video_url)
+        if key is None:
+            if not is_allowed_video_url(video_url, self.allowed_hosts):
+                raise ValueError("Video URL is not allowed")
+            return video_url
+        if isinstance(self.storage, LocalStorage):
+            return self.storage.path(key)
+        if not isinstance(self.storage, BaseS3Storage):
+            return video_url
+
+        if self.mode == "stream":
+            return get_s3_client().generate_presigned_url(
+                "get_object",
+                Params={"Bucket": self.storage.bucket_name, "Key": key},
+                ExpiresIn=self.presign_expires,
+            )
+
+        etag = self._etag(key)
+        path = self.cache.get(key, etag)
+        if path is None:
+            logger.info(f"Downloading {key} into the video cache")
+            path = self.cache.put(key, etag, lambda tmp_path: self._download(key, etag, tmp_path))
+        return path
+
+
+    def _etag(self, key: str) -> str:
+        return get_s3_client().head_object(Bucket=self.storage.bucket_name, Key=key)["ETag"].strip('"')
+
+
+    def _download(self, key: str, etag: str, path: str) -> None:
+        get_s3_client().download_file(
+            self.storage.bucket_name,
+            key,
+            path,
+            Config=TransferConfig(
+                multipart_threshold=self.storage.part_size,
+                multipart_chunksize=self.storage.part_size,
+                max_concurrency=self.storage.upload_concurrency,
+            ),
+        )
+        # Don't cache a re-upload that landed between the HEAD and the download under the old ETag.
+        if self._etag(key) != etag:
+            raise RuntimeError(f"{key} was replaced while it was being downloaded")
+
+
+video_source = VideoSource(
+    storage=create_storage(settings),
+    cache=VideoCache(settings.video_cache_dir, settings.video_cache_max_bytes),
+    mode=settings.video_read_mode,
+    presign_expires=settings.s3_presign_expires,
+    allowed_hosts=settings.analysis_url_allowed_hosts,
+)